@@ -0,0 +1,129 @@
+"""Per-request latency of a fresh `httpx.AsyncClient` per call vs the pooled client.
+
+Runs against a local stand-in for the Brewfather API, so no credentials or
+quota are needed. Every new TCP connection is delayed by `--connect-delay-ms`
+to emulate the TCP + TLS handshake round trips paid against the real API.
+
+    uv run python benchmarks/bench_connection_pool.py --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from brewfather_mcp.api import BrewfatherInventoryClient
+from brewfather_mcp.config import ClientConfig
+
+HOP_DETAIL = json.dumps(
+    {
+        "_id": "default-8e9450d5",
+        "_rev": "rev",
+        "_version": "2.11.6",
+        "_timestamp_ms": 1700000000000,
+        "_timestamp": {"_seconds": 1700000000, "_nanoseconds": 0},
+        "_created": {"_seconds": 1600000000, "_nanoseconds": 0},
+        "alpha": 12,
+        "inventory": 70,
+        "name": "Citra",
+        "type": "Pellet",
+        "use": "Boil",
+    }
+).encode()
+
+
+async def serve_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    connect_delay: float,
+) -> None:
+    await asyncio.sleep(connect_delay)
+    try:
+        while True:
+            request_head = await reader.readuntil(b"\r\n\r\n")
+            if not request_head:
+                break
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                + f"Content-Length: {len(HOP_DETAIL)}\r\n".encode()
+                + b"Connection: keep-alive\r\n\r\n"
+                + HOP_DETAIL
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def cold_request(client: BrewfatherInventoryClient, url: str) -> str:
+    """What `_make_request` used to do: one client, and one connection, per call."""
+    async with httpx.AsyncClient(auth=client.auth) as http_client:
+        response = await http_client.get(url)
+        return response.text
+
+
+async def measure(
+    fn: Callable[[], Awaitable[object]], requests: int, concurrency: int
+) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            _ = await fn()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    _ = await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def report(label: str, latencies: list[float], elapsed: float) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<8} mean={statistics.fmean(latencies):7.2f}ms "
+        + f"p50={quantiles[49]:7.2f}ms p95={quantiles[94]:7.2f}ms "
+        + f"total={elapsed:6.2f}s"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = await asyncio.start_server(
+        lambda r, w: serve_connection(r, w, args.connect_delay_ms / 1000),
+        "127.0.0.1",
+        0,
+    )
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}/v2"
+    url = f"{base_url}/inventory/hops/default-8e9450d5"
+
+    os.environ.setdefault("BREWFATHER_API_USER_ID", "bench")
+    os.environ.setdefault("BREWFATHER_API_KEY", "bench")
+    client = BrewfatherInventoryClient(
+        ClientConfig(base_url=base_url, max_connections=args.concurrency)
+    )
+
+    async with server, client:
+        for label, fn in (
+            ("before", lambda: cold_request(client, url)),
+            ("after", lambda: client._make_request(url)),
+        ):
+            started = time.perf_counter()
+            latencies = await measure(fn, args.requests, args.concurrency)
+            report(label, latencies, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("--requests", type=int, default=200)
+    _ = parser.add_argument("--concurrency", type=int, default=3)
+    _ = parser.add_argument("--connect-delay-ms", type=float, default=30.0)
+    asyncio.run(main(parser.parse_args()))
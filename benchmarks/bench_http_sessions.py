@@ -0,0 +1,143 @@
+"""Tool call throughput of the HTTP (SSE) server as concurrent sessions grow.
+
+Serves MCP over SSE on a local port, backed by a stand-in for the Brewfather
+API answering after `--api-latency-ms`. For each session count, that many
+clients connect at once and call `query_inventory` and `resolve_ingredient`
+in a loop for `--duration` seconds. All sessions share one API client, so the
+API requests made stay flat however many sessions there are. The clients run
+in the same process as the server and compete with it for the CPU, so the
+calls per second are a lower bound.
+
+    uv run python benchmarks/bench_http_sessions.py --sessions 1 2 4 8 16 32
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+import httpx
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from brewfather_mcp import server
+from brewfather_mcp.api import BrewfatherInventoryClient
+from brewfather_mcp.config import ClientConfig
+
+HOP_NAMES = ("Citra", "Mosaic", "Simcoe", "Amarillo", "Saaz", "Cascade", "Galaxy")
+
+
+def hop(i: int) -> dict[str, object]:
+    return {
+        "_id": f"hop-{i:04}",
+        "_rev": "rev-1",
+        "_version": "2.11.6",
+        "_timestamp_ms": 1700000000000 + i,
+        "_timestamp": {"_seconds": 1700000000, "_nanoseconds": 0},
+        "_created": {"_seconds": 1600000000, "_nanoseconds": 0},
+        "alpha": 2 + i % 15,
+        "inventory": i % 7 * 50,
+        "name": f"{HOP_NAMES[i % len(HOP_NAMES)]} {i // len(HOP_NAMES)}",
+        "type": "Pellet",
+        "use": "Boil",
+    }
+
+
+def stand_in_api(items: int, latency: float) -> httpx.MockTransport:
+    hops = [hop(i) for i in range(items)]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        params = request.url.params
+        if not request.url.path.endswith("/inventory/hops"):
+            return httpx.Response(200, json=[])
+
+        docs = hops
+        if (start_after := params.get("start_after")) is not None:
+            docs = [doc for doc in docs if str(doc["_id"]) > start_after]
+        return httpx.Response(200, json=docs[: int(params.get("limit", 10))])
+
+    return httpx.MockTransport(handler)
+
+
+async def run_session(url: str, deadline: float, latencies: list[float]) -> None:
+    async with (
+        sse_client(url) as (read, write),
+        ClientSession(read, write) as session,
+    ):
+        _ = await session.initialize()
+        calls = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            if calls % 2:
+                _ = await session.call_tool(
+                    "resolve_ingredient",
+                    {"name": HOP_NAMES[calls % len(HOP_NAMES)], "limit": 5},
+                )
+            else:
+                _ = await session.call_tool(
+                    "query_inventory",
+                    {"category": "hops", "min_alpha": 10, "limit": 10},
+                )
+            latencies.append((time.perf_counter() - started) * 1000)
+            calls += 1
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Keep per-request logging of the server and the clients out of the table.
+    logging.getLogger().setLevel(logging.ERROR)
+    os.environ.setdefault("BREWFATHER_API_USER_ID", "bench")
+    os.environ.setdefault("BREWFATHER_API_KEY", "bench")
+    client = BrewfatherInventoryClient(ClientConfig(base_url="http://test/v2"))
+    client._http_client = httpx.AsyncClient(
+        auth=client.auth, transport=stand_in_api(args.items, args.api_latency_ms / 1000)
+    )
+    server.brewfather_client = client
+
+    http_server = uvicorn.Server(
+        uvicorn.Config(
+            server.http_app("sse"), host="127.0.0.1", port=0, log_level="critical"
+        )
+    )
+
+    async with server.lifespan(server.mcp):
+        serving = asyncio.create_task(http_server.serve())
+        while not http_server.started:
+            await asyncio.sleep(0.01)
+        port = http_server.servers[0].sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/sse"
+
+        print(f"{args.items} hops, {args.duration:g}s per run, milliseconds")
+        print(f"{'sessions':>8}{'calls/s':>10}{'p50':>8}{'p95':>8}{'API requests':>14}")
+        for sessions in args.sessions:
+            latencies: list[float] = []
+            requests_before = client.requests_made
+            started = time.perf_counter()
+            deadline = started + args.duration
+            _ = await asyncio.gather(
+                *(run_session(url, deadline, latencies) for _ in range(sessions))
+            )
+            elapsed = time.perf_counter() - started
+            quantiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"{sessions:>8}{len(latencies) / elapsed:>10.0f}"
+                f"{quantiles[49]:>8.1f}{quantiles[94]:>8.1f}"
+                f"{client.requests_made - requests_before:>14}"
+            )
+
+        http_server.should_exit = http_server.force_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument(
+        "--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32]
+    )
+    _ = parser.add_argument("--duration", type=float, default=3.0)
+    _ = parser.add_argument("--items", type=int, default=500)
+    _ = parser.add_argument("--api-latency-ms", type=float, default=80.0)
+    asyncio.run(main(parser.parse_args()))
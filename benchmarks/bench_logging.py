@@ -0,0 +1,89 @@
+"""Latency a log call adds to the calling thread.
+
+Logs `--records` records through a plain file handler, as the server did
+before, and through the queue pipeline of `brewfather_mcp.logs`, timing each
+`logger.info` call. Disks stall now and then (a flush, a rotation, a busy
+device); `--stall-ms` adds such a stall to every `--stall-every`th write so
+the difference shows up in the tail.
+
+    uv run python benchmarks/bench_logging.py --records 20000 --stall-ms 20
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from brewfather_mcp.logs import configure_queue_logging, request_scope
+
+
+class StallingFileHandler(logging.FileHandler):
+    def __init__(self, path: Path, stall_every: int, stall: float):
+        super().__init__(path)
+        self.stall_every = stall_every
+        self.stall = stall
+        self.writes = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.writes += 1
+        if self.stall and self.writes % self.stall_every == 0:
+            time.sleep(self.stall)
+        super().emit(record)
+
+
+def run(logger: logging.Logger, records: int) -> list[float]:
+    timings: list[float] = []
+    with request_scope():
+        for i in range(records):
+            start = time.perf_counter()
+            logger.info("Fetched %d items of %s", i, "hops")
+            timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument("--records", type=int, default=20000)
+    _ = parser.add_argument("--stall-every", type=int, default=1000)
+    _ = parser.add_argument("--stall-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    stall = args.stall_ms / 1000
+    directory = Path(tempfile.mkdtemp())
+
+    results: dict[str, list[float]] = {}
+    handler = StallingFileHandler(directory / "direct.log", args.stall_every, stall)
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    root.addHandler(handler)
+    results["file handler"] = run(logger, args.records)
+    root.removeHandler(handler)
+    handler.close()
+
+    listener = configure_queue_logging(
+        StallingFileHandler(directory / "queued.log", args.stall_every, stall),
+        queue_size=args.records,
+    )
+    results["queue + json"] = run(logger, args.records)
+    started = time.perf_counter()
+    listener.stop()
+    drained = time.perf_counter() - started
+
+    print(f"{'pipeline':<14}{'median (us)':>12}{'p99 (us)':>10}{'max (us)':>11}")
+    for name, timings in results.items():
+        print(
+            f"{name:<14}{statistics.median(timings):>12.1f}"
+            f"{timings[int(len(timings) * 0.99)]:>10.1f}{timings[-1]:>11.1f}"
+        )
+    print(f"background writer drained the queue {drained * 1000:.0f} ms after")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Build time and lookup latency of the trigram name index.
+
+Indexes `--items` synthetic items spread over every category, then times
+`NameIndex.search` for exact, misspelled and partial queries. Names are drawn
+from a catalogue of `--names` distinct names, like inventories built from
+Brewfather's ingredient library; lookups get slower as the number of distinct
+values sharing trigrams with the query grows.
+
+    uv run python benchmarks/bench_name_index.py --items 40000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from brewfather_mcp.search import NameIndex
+from brewfather_mcp.types import InventoryCategory
+
+WORDS = [
+    "pale",
+    "ale",
+    "pilsner",
+    "munich",
+    "vienna",
+    "crystal",
+    "caramel",
+    "chocolate",
+    "roasted",
+    "wheat",
+    "rye",
+    "oat",
+    "citra",
+    "mosaic",
+    "simcoe",
+    "galaxy",
+    "nelson",
+    "saaz",
+    "hallertau",
+    "cascade",
+    "centennial",
+    "magnum",
+    "amarillo",
+    "safale",
+    "saflager",
+    "verdant",
+    "kveik",
+    "voss",
+    "lallemand",
+    "irish",
+    "moss",
+    "gypsum",
+    "lactic",
+    "whirlfloc",
+    "yeast",
+    "nutrient",
+    "dextrose",
+    "lactose",
+    "honey",
+]
+SUPPLIERS = (
+    "Weyermann",
+    "Fermentis",
+    "Lallemand",
+    "Crisp",
+    "Yakima Chief",
+    "Dingemans",
+)
+QUERIES = ("Citra", "citrra", "mosaik", "US-05", "weyerman", "pale", "xyzzy")
+
+
+def items(
+    count: int, names: int, seed: int = 7
+) -> dict[InventoryCategory, list[SimpleNamespace]]:
+    rng = random.Random(seed)
+    catalogue = [" ".join(rng.sample(WORDS, 2)).title() for _ in range(names)]
+    by_category: dict[InventoryCategory, list[SimpleNamespace]] = {
+        category: [] for category in InventoryCategory
+    }
+    categories = list(InventoryCategory)
+    for i in range(count):
+        category = categories[i % len(categories)]
+        by_category[category].append(
+            SimpleNamespace(
+                id=f"{category}-{i}",
+                name=rng.choice(catalogue),
+                supplier=rng.choice(SUPPLIERS),
+                product_id=f"US-{i % 100:02}",
+            )
+        )
+    return by_category
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument("--items", type=int, default=40000)
+    _ = parser.add_argument("--names", type=int, default=2000)
+    _ = parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    data = items(args.items, args.names)
+    index = NameIndex()
+    start = time.perf_counter()
+    for category, category_items in data.items():
+        index.update(category, category_items)  # type: ignore[arg-type]
+    print(f"indexed {len(index)} items in {time.perf_counter() - start:.2f}s")
+
+    print(f"{'query':<12}{'median (ms)':>12}{'p95 (ms)':>10}  best match")
+    for query in QUERIES:
+        timings: list[float] = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            matches = index.search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        best = matches[0].value if matches else "-"
+        print(
+            f"{query:<12}{statistics.median(timings):>12.3f}"
+            f"{timings[int(len(timings) * 0.95)]:>10.3f}  {best}"
+        )
+
+
+if __name__ == "__main__":
+    main()
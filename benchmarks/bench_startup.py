@@ -0,0 +1,76 @@
+"""Cold start latency of the server: module import and MCP handshake.
+
+Each round starts a fresh interpreter. `import` times
+`import brewfather_mcp.server`, `handshake` launches the server over stdio
+like a host would and times spawn to `initialize` completing, and
+`list_tools` the first request after it. No credentials are needed, the
+API client is only created on first use.
+
+    uv run python benchmarks/bench_startup.py --rounds 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+
+def time_import() -> float:
+    start = time.perf_counter()
+    _ = subprocess.run(
+        [sys.executable, "-c", "import brewfather_mcp.server"],
+        check=True,
+        env=os.environ.copy(),
+    )
+    return time.perf_counter() - start
+
+
+async def time_handshake() -> tuple[float, float]:
+    server = StdioServerParameters(
+        command=sys.executable,
+        args=["-c", "from brewfather_mcp.server import main; main()"],
+        env=os.environ.copy(),
+    )
+    start = time.perf_counter()
+    async with (
+        stdio_client(server) as (read, write),
+        ClientSession(read, write) as session,
+    ):
+        _ = await session.initialize()
+        initialized = time.perf_counter()
+        _ = await session.list_tools()
+        listed = time.perf_counter()
+
+    return initialized - start, listed - initialized
+
+
+def report(name: str, timings: list[float]) -> None:
+    print(
+        f"{name:<12}{statistics.median(timings) * 1000:>10.0f}"
+        f"{min(timings) * 1000:>10.0f}{max(timings) * 1000:>10.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    imports = [time_import() for _ in range(args.rounds)]
+    handshakes = [asyncio.run(time_handshake()) for _ in range(args.rounds)]
+
+    print(f"{args.rounds} rounds, milliseconds")
+    print(f"{'':<12}{'median':>10}{'min':>10}{'max':>10}")
+    report("import", imports)
+    report("handshake", [initialize for initialize, _ in handshakes])
+    report("list_tools", [list_tools for _, list_tools in handshakes])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,126 @@
+import asyncio
+import importlib.util
+import json
+import logging
 import os
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from dataclasses import replace
+from functools import partial
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self, cast
 
 import httpx
+from pydantic import BaseModel, RootModel, ValidationError
 
+from brewfather_mcp.cache import EndpointKind, ResponseCache
+from brewfather_mcp.categories import (
+    FERMENTABLES,
+    HOPS,
+    MISCS,
+    YEASTS,
+    CategorySpec,
+)
+from brewfather_mcp.config import ClientConfig
+from brewfather_mcp.expiry import ExpiryIndex
+from brewfather_mcp.metrics import API_REQUEST_SECONDS, API_REQUESTS
+from brewfather_mcp.ratelimit import (
+    RateLimitExceeded,
+    RateLimitPolicy,
+    TokenBucket,
+    current_policy,
+    parse_retry_after,
+    record_request,
+)
+from brewfather_mcp.search import NameIndex
+from brewfather_mcp.singleflight import SingleFlight
+from brewfather_mcp.store import InventoryStore
+from brewfather_mcp.sync import (
+    DetailGetter,
+    InventorySync,
+    ProgressCallback,
+    SyncResult,
+)
+from brewfather_mcp.tracing import span
 from brewfather_mcp.types import (
+    Fermentable,
     FermentableDetail,
     FermentableList,
+    Hop,
     HopDetail,
     HopList,
     InventoryCategory,
+    InventoryDetail,
+    InventoryItem,
     ListQueryParams,
+    Misc,
+    MiscDetail,
+    MiscList,
+    Yeast,
     YeastDetail,
     YeastList,
 )
+from brewfather_mcp.utils import gather_bounded
+
+if TYPE_CHECKING:
+    from brewfather_mcp.query import InventoryIndex
+    from brewfather_mcp.stats import ColumnarSnapshot
 
-BASE_URL: str = "https://api.brewfather.app/v2"
+logger = logging.getLogger(__name__)
+
+# Largest page the list endpoints accept.
+MAX_PAGE_SIZE: int = 50
 
 
 class BrewfatherInventoryClient:
-    __prefix: str = "/inventory"
-    __base_url: str = f"{BASE_URL}{__prefix}"
-    __inventory_summary_url: str = f"{__base_url}/{{category}}"
-    __inventory_detail_url: str = f"{__base_url}/{{category}}/{{id}}"
+    """Async client for the inventory endpoints of the Brewfather API.
+
+    A single `httpx.AsyncClient` is shared by every call so connections are
+    kept alive and reused. It is created on first use; call `aclose` (or use
+    the client as an async context manager) to release the pool.
+
+    Every request takes a token from `rate_limiter`, sized to the hourly API
+    quota. Whether callers wait for a token or fail fast with
+    `RateLimitExceeded` is decided by `ratelimit.rate_limit_policy`, falling
+    back to `config.rate_limit_policy`.
+
+    Parsed responses are kept in `cache`; bulk list fetches also fill the
+    detail entries of the items they return. The bulk detail lists are kept
+    up to date incrementally by `sync`, and persisted to an `InventoryStore`
+    when `config.store_path` is set so they survive a restart. Concurrent
+    identical reads are coalesced by `single_flight`. `names` indexes item
+    names, suppliers and product IDs for fuzzy lookups and `expiry` sorts the
+    items in stock by best before date; both follow the changes `sync`
+    applies.
+    """
 
     auth: httpx.BasicAuth
+    config: ClientConfig
+    rate_limiter: TokenBucket
+    cache: ResponseCache
+    store: InventoryStore | None
+    sync: InventorySync
+    single_flight: SingleFlight
+    names: NameIndex
+    expiry: ExpiryIndex
+    # Columns of the last detail list seen per category, for the statistics.
+    snapshots: dict[InventoryCategory, "ColumnarSnapshot"]
+    # Index of the last detail list seen per category, for the queries.
+    indexes: dict[InventoryCategory, "InventoryIndex[Any]"]
+    # HTTP requests sent to the API, retries included.
+    requests_made: int
+    # Requests waiting on the rate limiter or the API right now.
+    requests_in_flight: int
 
-    def __init__(self):
-        user_id = os.getenv("BREWFATHER_API_USER_ID")
-        api_key = os.getenv("BREWFATHER_API_KEY")
+    def __init__(
+        self,
+        config: ClientConfig | None = None,
+        user_id: str | None = None,
+        api_key: str | None = None,
+    ):
+        """Credentials default to the environment variables."""
+        user_id = user_id or os.getenv("BREWFATHER_API_USER_ID")
+        api_key = api_key or os.getenv("BREWFATHER_API_KEY")
 
         if not user_id or not api_key:
             raise ValueError(
@@ -34,62 +128,482 @@ class BrewfatherInventoryClient:
             )
 
         self.auth = httpx.BasicAuth(user_id, api_key)
+        self.config = config or ClientConfig.from_env()
+
+        base_url = f"{self.config.base_url}/inventory"
+        self.__inventory_summary_url = f"{base_url}/{{category}}"
+        self.__inventory_detail_url = f"{base_url}/{{category}}/{{id}}"
+
+        self._http_client: httpx.AsyncClient | None = None
+        self.rate_limiter = TokenBucket(self.config.requests_per_hour)
+        self.cache = ResponseCache(
+            max_entries=self.config.cache_max_entries,
+            max_bytes=self.config.cache_max_bytes,
+            ttls={
+                EndpointKind.LIST: self.config.cache_list_ttl,
+                EndpointKind.DETAIL: self.config.cache_detail_ttl,
+            },
+            ttl_overrides=self.config.cache_ttl_overrides,
+        )
+        self.store = (
+            InventoryStore(self.config.store_path) if self.config.store_path else None
+        )
+        self.sync = InventorySync(
+            self,
+            reconcile_interval=self.config.sync_reconcile_interval,
+            max_delta_pages=self.config.sync_max_delta_pages,
+        )
+        self.single_flight = SingleFlight()
+        self.names = NameIndex()
+        self.sync.subscribe(self.names.apply_changes, on_refresh=self.names.update)
+        self.expiry = ExpiryIndex()
+        self.sync.subscribe(self.expiry.apply_changes)
+        self.snapshots = {}
+        self.indexes = {}
+        self.requests_made = 0
+        self.requests_in_flight = 0
+        self._revalidations: dict[InventoryCategory, asyncio.Task[object]] = {}
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared connection pool, created lazily on first access."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self._build_http_client()
+
+        return self._http_client
+
+    def _build_http_client(self) -> httpx.AsyncClient:
+        http2 = self.config.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1"
+            )
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+        return httpx.AsyncClient(
+            auth=self.auth,
+            http2=http2,
+            limits=limits,
+            timeout=self.config.timeout,
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled connections. The pool is rebuilt on next use."""
+        for task in self._revalidations.values():
+            _ = task.cancel()
+        _ = await asyncio.gather(*self._revalidations.values(), return_exceptions=True)
+        await self.single_flight.aclose()
+
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def __aenter__(self) -> Self:
+        _ = self.http_client
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    def _endpoint(self, url: str) -> str:
+        """Metrics label of a URL, `category.list` or `category.detail`."""
+        path = url.partition("?")[0].removeprefix(self.config.base_url)
+        category, _, id = path.removeprefix("/inventory/").partition("/")
+        kind = EndpointKind.DETAIL if id else EndpointKind.LIST
+        return f"{category}.{kind.value}"
 
     async def _make_request(self, url: str) -> str:
-        async with httpx.AsyncClient(auth=self.auth) as client:
-            response = await client.get(url)
-            return response.text
+        endpoint = self._endpoint(url)
+
+        self.requests_in_flight += 1
+        try:
+            for attempt in range(self.config.max_retries + 1):
+                with span(f"GET {endpoint}", url=url, attempt=attempt) as current:
+                    await self.rate_limiter.acquire(
+                        self._policy(), self.config.rate_limit_max_wait
+                    )
+                    self.requests_made += 1
+                    record_request()
+                    status = "error"
+                    try:
+                        with API_REQUEST_SECONDS.time(endpoint):
+                            response = await self.http_client.get(url)
+                        status = str(response.status_code)
+                    finally:
+                        API_REQUESTS.inc(endpoint, status)
+                        current.set(status=status)
+
+                if response.status_code != httpx.codes.TOO_MANY_REQUESTS:
+                    _ = response.raise_for_status()
+                    return response.text
+
+                retry_after = parse_retry_after(
+                    response.headers.get("Retry-After"), default=60.0
+                )
+                self.rate_limiter.pause(retry_after)
+                logger.warning(
+                    "Brewfather API quota exceeded (attempt %d), pausing requests for %.1fs",
+                    attempt + 1,
+                    retry_after,
+                )
+
+                if self._policy() is RateLimitPolicy.FAIL_FAST:
+                    break
+        finally:
+            self.requests_in_flight -= 1
+
+        raise RateLimitExceeded(self.rate_limiter.time_until_available())
+
+    def _policy(self) -> RateLimitPolicy:
+        # Resolved anew each time, the callers of a shared call come and go.
+        return current_policy() or self.config.rate_limit_policy
+
+    async def _get_model[TModel: BaseModel](
+        self,
+        category: InventoryCategory,
+        kind: EndpointKind,
+        cache_key: str,
+        url: str,
+        model: type[TModel],
+    ) -> TModel:
+        cached: TModel | None = self.cache.get(category, kind, cache_key)
+        if cached is not None:
+            return cached
+
+        async def fetch() -> TModel:
+            json_response = await self._make_request(url)
+            result = model.model_validate_json(json_response)
+            self.cache.set(category, kind, cache_key, result, len(json_response))
+            return result
+
+        # Concurrent reads of the same URL share one request and parsed model.
+        return await self.single_flight.do(url, fetch)
+
+    async def iter_raw_pages(
+        self,
+        category: InventoryCategory,
+        query_params: ListQueryParams,
+        next_cursor: Callable[[list[dict[str, Any]]], str] | None = None,
+    ) -> AsyncIterator[tuple[list[dict[str, Any]], int]]:
+        """Follow the `start_after` cursor through every page of a list endpoint.
+
+        Yields each page as raw JSON documents along with its payload size in
+        bytes. `next_cursor` derives the cursor of the next page from a full
+        page and has to match `query_params.order_by`; the default is the `_id`
+        of the last document.
+        """
+        query_params = replace(query_params, limit=query_params.limit or MAX_PAGE_SIZE)
+        while True:
+            url = self.__inventory_summary_url.format(category=category)
+            url += f"?{query_params.as_query_param_str()}"
+
+            json_response = await self._make_request(url)
+            page: list[dict[str, Any]] = json.loads(json_response)
+            yield page, len(json_response)
+
+            if len(page) < query_params.limit:
+                return
+
+            query_params.start_after = (
+                next_cursor(page) if next_cursor else str(page[-1]["_id"])
+            )
+
+    async def get_list[
+        TItem: InventoryItem,
+        TDetail: InventoryDetail,
+    ](
+        self,
+        spec: CategorySpec[TItem, TDetail],
+        query_params: ListQueryParams | None = None,
+    ) -> RootModel[list[TItem]]:
+        """A single page of the list endpoint of `spec.category`."""
+        url = self.__inventory_summary_url.format(category=spec.category)
+
+        if query_params and (query_string := query_params.as_query_param_str()):
+            url += f"?{query_string}"
+
+        return await self._get_model(
+            spec.category, EndpointKind.LIST, url, url, spec.list_model
+        )
+
+    async def iter_items[
+        TItem: InventoryItem,
+        TDetail: InventoryDetail,
+    ](
+        self,
+        spec: CategorySpec[TItem, TDetail],
+        query_params: ListQueryParams | None = None,
+    ) -> AsyncIterator[TItem]:
+        """Yield every item of a list endpoint, one page at a time.
+
+        Pages are requested at `MAX_PAGE_SIZE` unless `query_params.limit`
+        says otherwise, and each one goes through the response cache like a
+        `get_list` call would. The cursor is the `_id` of the last item of a
+        page: only `_id` ordering can be paged through, items tied on any
+        other field would be skipped at page boundaries.
+        """
+        if query_params is not None and query_params.order_by not in (None, "_id"):
+            raise ValueError(
+                f"Can't page through items ordered by {query_params.order_by!r}"
+            )
+
+        query_params = replace(query_params or ListQueryParams())
+        query_params.limit = query_params.limit or MAX_PAGE_SIZE
+        while True:
+            page = await self.get_list(spec, query_params)
+            for item in page.root:
+                yield item
+
+            if len(page.root) < query_params.limit:
+                return
+
+            query_params.start_after = page.root[-1].id
+
+    async def get_detail[
+        TItem: InventoryItem,
+        TDetail: InventoryDetail,
+    ](self, spec: CategorySpec[TItem, TDetail], id: str) -> TDetail:
+        url = self.__inventory_detail_url.format(category=spec.category, id=id)
+        return await self._get_model(
+            spec.category, EndpointKind.DETAIL, id, url, spec.detail_model
+        )
+
+    async def parse_details[TDetail: InventoryDetail](
+        self,
+        category: InventoryCategory,
+        detail_model: type[TDetail],
+        get_detail: DetailGetter[TDetail],
+        raw_items: list[dict[str, Any]],
+        item_size: int,
+    ) -> list[TDetail]:
+        """Validate `complete=true` documents into detail models.
+
+        Documents the bulk payload can't be validated for are fetched one by
+        one from the detail endpoint. Every item is also cached as a detail
+        entry.
+        """
+        details: list[TDetail | None] = []
+        incomplete: list[tuple[int, str]] = []
+        for raw_item in raw_items:
+            try:
+                detail = detail_model.model_validate(raw_item)
+            except ValidationError:
+                incomplete.append((len(details), raw_item["_id"]))
+                details.append(None)
+                continue
+
+            details.append(detail)
+            self.cache.set(category, EndpointKind.DETAIL, detail.id, detail, item_size)
+
+        if incomplete:
+            logger.info(
+                "Fetching %d %s individually, bulk payload was incomplete",
+                len(incomplete),
+                category,
+            )
+
+        with span("detail batch", category=category, items=len(incomplete)):
+            fetched = await gather_bounded(
+                self.config.max_concurrency, get_detail, [id for _, id in incomplete]
+            )
+        for (position, _), detail in zip(incomplete, fetched, strict=True):
+            details[position] = detail
+
+        return [detail for detail in details if detail is not None]
+
+    async def get_detail_list[
+        TItem: InventoryItem,
+        TDetail: InventoryDetail,
+    ](
+        self,
+        spec: CategorySpec[TItem, TDetail],
+        on_progress: ProgressCallback | None = None,
+    ) -> list[TDetail]:
+        """Every item of a category with its details.
+
+        Served from the memory cache, then from the category replica kept by
+        `sync` (seeded from the on-disk store after a restart). A replica
+        younger than `config.store_max_staleness` is returned straight away
+        and, once older than the list TTL, synced in the background. Otherwise
+        the category is synced before returning, reporting to `on_progress`
+        as pages come in.
+        """
+        cached: list[TDetail] | None = self.cache.get(
+            spec.category, EndpointKind.LIST, "complete"
+        )
+        if cached is not None:
+            if on_progress is not None:
+                await on_progress(len(cached), len(cached))
+            return cached
+
+        replica = await self.sync.replica(spec.category, spec.detail_model)
+        if replica.age <= self.config.store_max_staleness:
+            if replica.age > self.cache.ttl(spec.category, EndpointKind.LIST):
+                self._revalidate(spec)
+
+            self.cache.set(
+                spec.category,
+                EndpointKind.LIST,
+                "complete",
+                replica.ordered,
+                replica.item_size * len(replica.ordered),
+            )
+            if on_progress is not None:
+                await on_progress(len(replica.ordered), len(replica.ordered))
+            return replica.ordered
+
+        _ = await self._sync(spec, on_progress)
+        return replica.ordered
+
+    async def refresh[
+        TItem: InventoryItem,
+        TDetail: InventoryDetail,
+    ](self, spec: CategorySpec[TItem, TDetail]) -> SyncResult:
+        """Sync `spec.category` now, whatever the age of its replica."""
+        return await self._sync(spec)
+
+    async def _sync[
+        TItem: InventoryItem,
+        TDetail: InventoryDetail,
+    ](
+        self,
+        spec: CategorySpec[TItem, TDetail],
+        on_progress: ProgressCallback | None = None,
+    ) -> SyncResult:
+        """Sync `spec.category`, coalesced with any sync already running."""
+        return await self.single_flight.do(
+            ("sync", spec.category),
+            lambda: self.sync.sync(
+                spec.category,
+                spec.detail_model,
+                partial(self.get_detail, spec),
+                on_progress,
+            ),
+        )
+
+    async def index_names[
+        TItem: InventoryItem,
+        TDetail: InventoryDetail,
+    ](self, spec: CategorySpec[TItem, TDetail]) -> None:
+        """Add `spec.category` to `names` unless it's indexed already.
+
+        A synced replica is indexed as is, otherwise the category is read from
+        the list endpoint. From then on syncs keep the entries up to date.
+        """
+        if spec.category in self.names:
+            return
+
+        async def index() -> None:
+            replica = await self.sync.replica(spec.category, spec.detail_model)
+            if replica.synced_at is not None:
+                items: list[InventoryItem] = list(replica.ordered)
+            else:
+                async with aclosing(self.iter_items(spec)) as pages:
+                    items = [item async for item in pages]
+            self.names.update(spec.category, items)
+
+        await self.single_flight.do(("names", spec.category), index)
+
+    def _revalidate[
+        TItem: InventoryItem,
+        TDetail: InventoryDetail,
+    ](self, spec: CategorySpec[TItem, TDetail]) -> None:
+        category = spec.category
+        if category in self._revalidations:
+            return
+
+        task = asyncio.create_task(self._sync(spec))
+        self._revalidations[category] = task
+
+        def done(task: asyncio.Task[object]) -> None:
+            del self._revalidations[category]
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(
+                    "Background refresh of %s failed",
+                    category,
+                    exc_info=task.exception(),
+                )
+
+        task.add_done_callback(done)
 
     async def get_fermentables_list(
         self, query_params: ListQueryParams | None = None
     ) -> FermentableList:
-        url = self.__inventory_summary_url.format(
-            category=InventoryCategory.FERMENTABLES
-        )
-
-        if query_params:
-            url += f"?{query_params.as_query_param_str()}"
+        return cast(FermentableList, await self.get_list(FERMENTABLES, query_params))
 
-        json_response = await self._make_request(url)
-        return FermentableList.model_validate_json(json_response)
+    def iter_fermentables(
+        self, query_params: ListQueryParams | None = None
+    ) -> AsyncIterator[Fermentable]:
+        return self.iter_items(FERMENTABLES, query_params)
 
     async def get_fermentable_detail(self, id: str) -> FermentableDetail:
-        url = self.__inventory_detail_url.format(
-            category=InventoryCategory.FERMENTABLES, id=id
-        )
-        json_response = await self._make_request(url)
-        return FermentableDetail.model_validate_json(json_response)
+        return await self.get_detail(FERMENTABLES, id)
+
+    async def get_fermentables_detail_list(
+        self, on_progress: ProgressCallback | None = None
+    ) -> list[FermentableDetail]:
+        return await self.get_detail_list(FERMENTABLES, on_progress)
 
     async def get_hops_list(
         self, query_params: ListQueryParams | None = None
     ) -> HopList:
-        url = self.__inventory_summary_url.format(category=InventoryCategory.HOPS)
+        return cast(HopList, await self.get_list(HOPS, query_params))
 
-        if query_params:
-            url += f"?{query_params.as_query_param_str()}"
-
-        json_response = await self._make_request(url)
-        return HopList.model_validate_json(json_response)
+    def iter_hops(
+        self, query_params: ListQueryParams | None = None
+    ) -> AsyncIterator[Hop]:
+        return self.iter_items(HOPS, query_params)
 
     async def get_hop_detail(self, id: str) -> HopDetail:
-        url = self.__inventory_detail_url.format(category=InventoryCategory.HOPS, id=id)
-        json_response = await self._make_request(url)
-        return HopDetail.model_validate_json(json_response)
+        return await self.get_detail(HOPS, id)
+
+    async def get_hops_detail_list(
+        self, on_progress: ProgressCallback | None = None
+    ) -> list[HopDetail]:
+        return await self.get_detail_list(HOPS, on_progress)
+
+    async def get_miscs_list(
+        self, query_params: ListQueryParams | None = None
+    ) -> MiscList:
+        return cast(MiscList, await self.get_list(MISCS, query_params))
+
+    def iter_miscs(
+        self, query_params: ListQueryParams | None = None
+    ) -> AsyncIterator[Misc]:
+        return self.iter_items(MISCS, query_params)
+
+    async def get_misc_detail(self, id: str) -> MiscDetail:
+        return await self.get_detail(MISCS, id)
+
+    async def get_miscs_detail_list(
+        self, on_progress: ProgressCallback | None = None
+    ) -> list[MiscDetail]:
+        return await self.get_detail_list(MISCS, on_progress)
 
     async def get_yeasts_list(
         self, query_params: ListQueryParams | None = None
     ) -> YeastList:
-        url = self.__inventory_summary_url.format(category=InventoryCategory.YEASTS)
-
-        if query_params:
-            url += f"?{query_params.as_query_param_str()}"
+        return cast(YeastList, await self.get_list(YEASTS, query_params))
 
-        json_response = await self._make_request(url)
-        return YeastList.model_validate_json(json_response)
+    def iter_yeasts(
+        self, query_params: ListQueryParams | None = None
+    ) -> AsyncIterator[Yeast]:
+        return self.iter_items(YEASTS, query_params)
 
     async def get_yeast_detail(self, id: str) -> YeastDetail:
-        url = self.__inventory_detail_url.format(
-            category=InventoryCategory.YEASTS, id=id
-        )
-        json_response = await self._make_request(url)
-        return YeastDetail.model_validate_json(json_response)
+        return await self.get_detail(YEASTS, id)
+
+    async def get_yeasts_detail_list(
+        self, on_progress: ProgressCallback | None = None
+    ) -> list[YeastDetail]:
+        return await self.get_detail_list(YEASTS, on_progress)
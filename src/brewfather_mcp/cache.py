@@ -0,0 +1,141 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from enum import StrEnum, auto
+from typing import Any
+
+from brewfather_mcp.types import InventoryCategory
+
+
+class EndpointKind(StrEnum):
+    LIST = auto()
+    DETAIL = auto()
+
+
+type CacheKey = tuple[InventoryCategory, EndpointKind, Hashable]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class ResponseCache:
+    """Bounded in-memory cache of parsed API responses.
+
+    Entries expire after a TTL chosen per category and endpoint kind, and the
+    least recently used entries are evicted once either `max_entries` or
+    `max_bytes` is exceeded. Sizes are the byte length of the JSON payload the
+    value was parsed from.
+    """
+
+    max_entries: int
+    max_bytes: int
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttls: Mapping[EndpointKind, float],
+        ttl_overrides: Mapping[tuple[InventoryCategory, EndpointKind], float]
+        | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._ttls = dict(ttls)
+        self._ttl_overrides = dict(ttl_overrides or {})
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def ttl(self, category: InventoryCategory, kind: EndpointKind) -> float:
+        return self._ttl_overrides.get((category, kind), self._ttls.get(kind, 0.0))
+
+    def get(
+        self, category: InventoryCategory, kind: EndpointKind, key: Hashable
+    ) -> Any | None:
+        cache_key = (category, kind, key)
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if entry.expires_at <= self._clock():
+            self._remove(cache_key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(cache_key)
+        self._hits += 1
+        return entry.value
+
+    def set(
+        self,
+        category: InventoryCategory,
+        kind: EndpointKind,
+        key: Hashable,
+        value: Any,
+        size: int,
+    ) -> None:
+        ttl = self.ttl(category, kind)
+        if ttl <= 0 or self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        cache_key = (category, kind, key)
+        if cache_key in self._entries:
+            self._remove(cache_key)
+
+        self._entries[cache_key] = _Entry(value, size, self._clock() + ttl)
+        self._size_bytes += size
+
+        while (
+            len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def delete(
+        self, category: InventoryCategory, kind: EndpointKind, key: Hashable
+    ) -> None:
+        if (category, kind, key) in self._entries:
+            self._remove((category, kind, key))
+
+    def invalidate(self, category: InventoryCategory | None = None) -> None:
+        """Drop every entry, or only the entries of `category`."""
+        for cache_key in list(self._entries):
+            if category is None or cache_key[0] == category:
+                self._remove(cache_key)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            size_bytes=self._size_bytes,
+        )
+
+    def _remove(self, cache_key: CacheKey) -> None:
+        entry = self._entries.pop(cache_key)
+        self._size_bytes -= entry.size
@@ -0,0 +1,327 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, get_args
+
+from pydantic import RootModel
+
+from brewfather_mcp.rendering import Renderer
+from brewfather_mcp.types import (
+    Fermentable,
+    FermentableDetail,
+    FermentableList,
+    Hop,
+    HopDetail,
+    HopList,
+    InventoryCategory,
+    InventoryDetail,
+    InventoryItem,
+    Misc,
+    MiscDetail,
+    MiscList,
+    Yeast,
+    YeastDetail,
+    YeastList,
+)
+from brewfather_mcp.utils import empty_if_null
+
+
+@dataclass(frozen=True)
+class CategorySpec[TItem: InventoryItem, TDetail: InventoryDetail]:
+    """Everything needed to fetch, summarise and render one inventory category.
+
+    The client, the summaries and the MCP resources are all driven by these
+    specs, so a category only has to be described once.
+    """
+
+    category: InventoryCategory
+    title: str
+    description: str
+    list_model: type[RootModel[list[TItem]]]
+    detail_model: type[TDetail]
+    render_item: Renderer[TItem]
+    render_detail: Renderer[TDetail]
+    summarize: Callable[[TDetail], dict[str, Any]]
+
+    @property
+    def item_model(self) -> type[TItem]:
+        """Model of the items of `list_model`."""
+        return get_args(self.list_model.model_fields["root"].annotation)[0]
+
+
+_FERMENTABLE_RENDERER = Renderer[Fermentable](
+    (
+        ("Name", "name"),
+        ("Type", "type"),
+        ("Supplier", "supplier"),
+        ("Quantity", "inventory", "kg"),
+        ("Identifier", "id"),
+    )
+)
+
+
+_FERMENTABLE_DETAIL_RENDERER = Renderer[FermentableDetail](
+    (
+        ("Name", "name"),
+        ("Type", "type"),
+        ("Supplier", "supplier"),
+        ("Inventory", "inventory"),
+        ("Origin", "origin"),
+        ("Grain Category", "grain_category"),
+        ("Potential", "potential"),
+        ("Potential Percentage", "potential_percentage"),
+        ("Color", "color"),
+        ("Moisture", "moisture"),
+        ("Protein", "protein"),
+        ("Diastatic Power", "diastatic_power"),
+        ("Friability", "friability"),
+        ("Not Fermentable", "not_fermentable"),
+        ("Max In Batch", "max_in_batch"),
+        ("Coarse Fine Diff", "coarse_fine_diff"),
+        ("Percent Extract Fine-Ground Dry Basis (FGDB)", "fgdb"),
+        ("Hidden", "hidden"),
+        ("Notes", "notes"),
+        ("User Notes", "user_notes"),
+        ("Used In", "used_in"),
+        ("Substitutes", "substitutes"),
+        ("Cost Per Amount", "cost_per_amount"),
+        ("Best Before Date", "best_before_date"),
+        ("Manufacturing Date", "manufacturing_date"),
+        ("Free Amino Nitrogen (FAN)", "fan"),
+        ("Percent Coarse-Ground Dry Basic (CGDB)", "cgdb"),
+        ("Acid", "acid"),
+        ("ID", "id"),
+    )
+)
+
+
+def _summarize_fermentable(
+    item: FermentableDetail,
+) -> dict[str, Any]:
+    return {
+        "Name": item.name,
+        "Type": item.type,
+        "Yield": empty_if_null(item.friability),
+        "Lot #": empty_if_null(item.lot_number),
+        "Best Before Date": empty_if_null(item.best_before_date),
+        "Inventory Amount": f"{item.inventory} kg",
+    }
+
+
+_HOP_RENDERER = Renderer[Hop](
+    (
+        ("Identifier", "id"),
+        ("Alpha Acids (A.A)", "alpha"),
+        ("Quantity", "inventory", "grams"),
+        ("Name", "name"),
+        ("Type", "type"),
+        ("Use", "use"),
+    )
+)
+
+
+_HOP_DETAIL_RENDERER = Renderer[HopDetail](
+    (
+        ("Name", "name"),
+        ("Type", "type"),
+        ("Origin", "origin"),
+        ("Use", "use"),
+        ("Usage", "usage"),
+        ("Alpha Acid (% A.A)", "alpha"),
+        ("Beta", "beta"),
+        ("Inventory", "inventory"),
+        ("Time", "time"),
+        ("IBU", "ibu"),
+        ("Oil", "oil"),
+        ("Myrcene", "myrcene"),
+        ("Caryophyllene", "caryophyllene"),
+        ("Humulene", "humulene"),
+        ("Cohumulone", "cohumulone"),
+        ("Farnesene", "farnesene"),
+        ("HSI", "hsi"),
+        ("Year", "year"),
+        ("Temp", "temp"),
+        ("Amount", "amount"),
+        ("Substitutes", "substitutes"),
+        ("Used In", "used_in"),
+        ("Notes", "notes"),
+        ("User Notes", "user_notes"),
+        ("Hidden", "hidden"),
+        ("Best Before Date", "best_before_date"),
+        ("Manufacturing Date", "manufacturing_date"),
+        ("Version", "version"),
+        ("ID", "id"),
+    )
+)
+
+
+def _summarize_hop(item: HopDetail) -> dict[str, Any]:
+    return {
+        "Name": item.name,
+        "Year": empty_if_null(item.year),
+        "Alpha Acid": item.alpha,
+        "Lot #": empty_if_null(item.lot_number),
+        "Best Before Date": empty_if_null(item.best_before_date),
+        "Inventory Amount": f"{item.inventory} grams",
+    }
+
+
+_MISC_RENDERER = Renderer[Misc](
+    (
+        ("Identifier", "id"),
+        ("Quantity", lambda item: f"{item.inventory} {empty_if_null(item.unit)}"),
+        ("Name", "name"),
+        ("Type", "type"),
+        ("Use", "use"),
+    )
+)
+
+
+_MISC_DETAIL_RENDERER = Renderer[MiscDetail](
+    (
+        ("Name", "name"),
+        ("Type", "type"),
+        ("Use", "use"),
+        ("Inventory", "inventory"),
+        ("Unit", "unit"),
+        ("Amount", "amount"),
+        ("Amount Per Liter", "amount_per_l"),
+        ("Concentration", "concentration"),
+        ("Time", "time"),
+        ("Time Is Days", "time_is_days"),
+        ("Water Adjustment", "water_adjustment"),
+        ("Substitutes", "substitutes"),
+        ("Used In", "used_in"),
+        ("Notes", "notes"),
+        ("User Notes", "user_notes"),
+        ("Hidden", "hidden"),
+        ("Cost Per Amount", "cost_per_amount"),
+        ("Best Before Date", "best_before_date"),
+        ("Manufacturing Date", "manufacturing_date"),
+        ("Version", "version"),
+        ("ID", "id"),
+    )
+)
+
+
+def _summarize_misc(item: MiscDetail) -> dict[str, Any]:
+    return {
+        "Name": item.name,
+        "Type": item.type,
+        "Use": empty_if_null(item.use),
+        "Lot #": empty_if_null(item.lot_number),
+        "Best Before Date": empty_if_null(item.best_before_date),
+        "Inventory Amount": f"{item.inventory} {empty_if_null(item.unit)}".strip(),
+    }
+
+
+_YEAST_RENDERER = Renderer[Yeast](
+    (
+        ("Identifier", "id"),
+        ("Attenuation (%)", "attenuation"),
+        ("Quantity", "inventory", "packets"),
+        ("Name", "name"),
+        ("Type", "type"),
+    )
+)
+
+
+_YEAST_DETAIL_RENDERER = Renderer[YeastDetail](
+    (
+        ("Name", "name"),
+        ("Type", "type"),
+        ("Form", "form"),
+        ("Laboratory", "laboratory"),
+        ("Product ID", "product_id"),
+        ("Inventory", "inventory"),
+        ("Amount", "amount"),
+        ("Unit", "unit"),
+        ("Attenuation", "attenuation"),
+        ("Min Attenuation", "min_attenuation"),
+        ("Max Attenuation", "max_attenuation"),
+        ("Flocculation", "flocculation"),
+        ("Min Temp", "min_temp"),
+        ("Max Temp", "max_temp"),
+        ("Max ABV", "max_abv"),
+        ("Cells Per Package", "cells_per_pkg"),
+        ("Age Rate", "age_rate"),
+        ("Ferments All", "ferments_all"),
+        ("Description", "description"),
+        ("User Notes", "user_notes"),
+        ("Hidden", "hidden"),
+        ("Best Before Date", "best_before_date"),
+        ("Manufacturing Date", "manufacturing_date"),
+        ("Timestamp", "timestamp.seconds"),
+        ("Created", "created.seconds"),
+        ("Version", "version"),
+        ("ID", "id"),
+        ("Rev", "rev"),
+    )
+)
+
+
+def _summarize_yeast(item: YeastDetail) -> dict[str, Any]:
+    return {
+        "Name": item.name,
+        "Form": item.form,
+        "Attenuation": f"{item.attenuation}%",
+        "Lot #": empty_if_null(item.lot_number),
+        "Best Before Date": empty_if_null(item.best_before_date),
+        "Inventory Amount": f"{item.inventory} pkg",
+    }
+
+
+FERMENTABLES = CategorySpec(
+    category=InventoryCategory.FERMENTABLES,
+    title="Fermentables",
+    description="List all the fermentables (malts, adjuncts, grains, etc) inventory.",
+    list_model=FermentableList,
+    detail_model=FermentableDetail,
+    render_item=_FERMENTABLE_RENDERER,
+    render_detail=_FERMENTABLE_DETAIL_RENDERER,
+    summarize=_summarize_fermentable,
+)
+
+HOPS = CategorySpec(
+    category=InventoryCategory.HOPS,
+    title="Hops",
+    description="List all the hops inventory.",
+    list_model=HopList,
+    detail_model=HopDetail,
+    render_item=_HOP_RENDERER,
+    render_detail=_HOP_DETAIL_RENDERER,
+    summarize=_summarize_hop,
+)
+
+MISCS = CategorySpec(
+    category=InventoryCategory.MISCELLANEOUS,
+    title="Miscs",
+    description="List all the miscellaneous (spices, finings, water agents, etc) inventory.",
+    list_model=MiscList,
+    detail_model=MiscDetail,
+    render_item=_MISC_RENDERER,
+    render_detail=_MISC_DETAIL_RENDERER,
+    summarize=_summarize_misc,
+)
+
+YEASTS = CategorySpec(
+    category=InventoryCategory.YEASTS,
+    title="Yeasts",
+    description="List all the yeasts inventory.",
+    list_model=YeastList,
+    detail_model=YeastDetail,
+    render_item=_YEAST_RENDERER,
+    render_detail=_YEAST_DETAIL_RENDERER,
+    summarize=_summarize_yeast,
+)
+
+# In the order categories are listed in summaries.
+CATEGORIES: tuple[CategorySpec[Any, Any], ...] = (
+    FERMENTABLES,
+    HOPS,
+    MISCS,
+    YEASTS,
+)
+
+BY_CATEGORY: dict[InventoryCategory, CategorySpec[Any, Any]] = {
+    spec.category: spec for spec in CATEGORIES
+}
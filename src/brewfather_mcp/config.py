@@ -0,0 +1,210 @@
+import os
+from dataclasses import dataclass, field
+
+from brewfather_mcp.cache import EndpointKind
+from brewfather_mcp.ratelimit import RateLimitPolicy
+from brewfather_mcp.types import InventoryCategory
+
+BASE_URL: str = "https://api.brewfather.app/v2"
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+
+    return int(value)
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+
+    return float(value)
+
+
+def env_cache_ttls(name: str) -> dict[tuple[InventoryCategory, EndpointKind], float]:
+    """Parse per category TTL overrides such as `hops.detail=600,yeasts.list=30`."""
+    overrides: dict[tuple[InventoryCategory, EndpointKind], float] = {}
+    for item in (os.getenv(name) or "").split(","):
+        if not item.strip():
+            continue
+
+        key, _, ttl = item.partition("=")
+        category, _, kind = key.strip().partition(".")
+        overrides[(InventoryCategory(category), EndpointKind(kind))] = float(ttl)
+
+    return overrides
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """Tunables of the HTTP layer of the Brewfather client.
+
+    All values can be set through environment variables, see `from_env`.
+    """
+
+    base_url: str = BASE_URL
+    http2: bool = False
+    max_connections: int = 10
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    timeout: float = 30.0
+    max_concurrency: int = 3
+    # Brewfather allows 500 requests per hour per API key.
+    requests_per_hour: int = 500
+    rate_limit_policy: RateLimitPolicy = RateLimitPolicy.WAIT
+    # Longest a WAIT caller queues for a token before giving up, in seconds.
+    rate_limit_max_wait: float = 60.0
+    max_retries: int = 3
+    cache_max_entries: int = 4096
+    cache_max_bytes: int = 32 * 1024 * 1024
+    cache_list_ttl: float = 60.0
+    cache_detail_ttl: float = 300.0
+    cache_ttl_overrides: dict[tuple[InventoryCategory, EndpointKind], float] = field(
+        default_factory=dict
+    )
+    # On-disk cache of the detail records, disabled when no path is set.
+    store_path: str | None = None
+    # Oldest on-disk data served while a refresh runs in the background.
+    store_max_staleness: float = 24 * 60 * 60
+    # How often a sync also lists every id to detect deleted items.
+    sync_reconcile_interval: float = 60 * 60
+    # A delta sync spanning more pages than this falls back to a full refresh.
+    sync_max_delta_pages: int = 4
+
+    @classmethod
+    def from_env(cls) -> "ClientConfig":
+        return cls(
+            base_url=os.getenv("BREWFATHER_API_BASE_URL") or BASE_URL,
+            http2=env_bool("BREWFATHER_HTTP2", cls.http2),
+            max_connections=env_int("BREWFATHER_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive_connections=env_int(
+                "BREWFATHER_MAX_KEEPALIVE_CONNECTIONS", cls.max_keepalive_connections
+            ),
+            keepalive_expiry=env_float(
+                "BREWFATHER_KEEPALIVE_EXPIRY", cls.keepalive_expiry
+            ),
+            timeout=env_float("BREWFATHER_HTTP_TIMEOUT", cls.timeout),
+            max_concurrency=env_int("BREWFATHER_MAX_CONCURRENCY", cls.max_concurrency),
+            requests_per_hour=env_int(
+                "BREWFATHER_REQUESTS_PER_HOUR", cls.requests_per_hour
+            ),
+            rate_limit_policy=RateLimitPolicy(
+                os.getenv("BREWFATHER_RATE_LIMIT_POLICY") or cls.rate_limit_policy
+            ),
+            rate_limit_max_wait=env_float(
+                "BREWFATHER_RATE_LIMIT_MAX_WAIT", cls.rate_limit_max_wait
+            ),
+            max_retries=env_int("BREWFATHER_MAX_RETRIES", cls.max_retries),
+            cache_max_entries=env_int(
+                "BREWFATHER_CACHE_MAX_ENTRIES", cls.cache_max_entries
+            ),
+            cache_max_bytes=env_int("BREWFATHER_CACHE_MAX_BYTES", cls.cache_max_bytes),
+            cache_list_ttl=env_float("BREWFATHER_CACHE_LIST_TTL", cls.cache_list_ttl),
+            cache_detail_ttl=env_float(
+                "BREWFATHER_CACHE_DETAIL_TTL", cls.cache_detail_ttl
+            ),
+            cache_ttl_overrides=env_cache_ttls("BREWFATHER_CACHE_TTLS"),
+            store_path=os.getenv("BREWFATHER_CACHE_PATH") or None,
+            store_max_staleness=env_float(
+                "BREWFATHER_CACHE_MAX_STALENESS", cls.store_max_staleness
+            ),
+            sync_reconcile_interval=env_float(
+                "BREWFATHER_SYNC_RECONCILE_INTERVAL", cls.sync_reconcile_interval
+            ),
+            sync_max_delta_pages=env_int(
+                "BREWFATHER_SYNC_MAX_DELTA_PAGES", cls.sync_max_delta_pages
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """Settings of the MCP server itself, see `from_env` for their variables."""
+
+    # Leave empty fields out of every resource and tool response.
+    compact_output: bool = False
+    # Size budget of a page of the inventory://{category}/page/{cursor} resources.
+    resource_page_bytes: int = 16 * 1024
+    # Days ahead the inventory://expiring resource looks for expiring items.
+    expiry_window_days: int = 30
+    # Keep every category warm with background refreshes.
+    refresh_scheduler: bool = False
+    refresh_interval: float = 600.0
+    refresh_quota_reserve: float = 0.5
+    refresh_busy_requests_per_minute: float = 20.0
+    # JSON file of per tenant credentials, serving one Brewfather account per
+    # tenant over HTTP. Clients beyond `max_tenants` are closed, least
+    # recently used first.
+    tenants_file: str | None = None
+    max_tenants: int = 8
+    # Path of the Prometheus metrics endpoint when serving over HTTP, empty to
+    # leave it out. Its series are labelled by tenant, so with tenants it's
+    # only served to requests bearing `metrics_token`.
+    metrics_path: str = "/metrics"
+    metrics_token: str | None = None
+    # Tracing is on when spans have somewhere to go: a JSONL file and/or an
+    # OTLP/HTTP collector. `trace_sample_rate` is the share of traces recorded.
+    trace_file: str | None = None
+    trace_otlp_endpoint: str | None = None
+    trace_sample_rate: float = 1.0
+    # Log records are written from a background thread, to `log_file` (stderr
+    # when None) rotated past `log_max_bytes`, or at `log_rotate_when` when set.
+    log_file: str | None = "/tmp/application.log"
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backups: int = 5
+    log_rotate_when: str | None = None
+    log_queue_size: int = 10_000
+
+    @classmethod
+    def from_env(cls) -> "ServerConfig":
+        return cls(
+            compact_output=env_bool("BREWFATHER_COMPACT_OUTPUT", cls.compact_output),
+            resource_page_bytes=env_int(
+                "BREWFATHER_RESOURCE_PAGE_BYTES", cls.resource_page_bytes
+            ),
+            expiry_window_days=env_int(
+                "BREWFATHER_EXPIRY_WINDOW_DAYS", cls.expiry_window_days
+            ),
+            refresh_scheduler=env_bool(
+                "BREWFATHER_REFRESH_SCHEDULER", cls.refresh_scheduler
+            ),
+            refresh_interval=env_float(
+                "BREWFATHER_REFRESH_INTERVAL", cls.refresh_interval
+            ),
+            refresh_quota_reserve=env_float(
+                "BREWFATHER_REFRESH_QUOTA_RESERVE", cls.refresh_quota_reserve
+            ),
+            refresh_busy_requests_per_minute=env_float(
+                "BREWFATHER_REFRESH_BUSY_REQUESTS_PER_MINUTE",
+                cls.refresh_busy_requests_per_minute,
+            ),
+            tenants_file=os.getenv("BREWFATHER_TENANTS_FILE") or None,
+            max_tenants=env_int("BREWFATHER_MAX_TENANTS", cls.max_tenants),
+            metrics_path=os.getenv("BREWFATHER_METRICS_PATH", cls.metrics_path),
+            metrics_token=os.getenv("BREWFATHER_METRICS_TOKEN") or None,
+            trace_file=os.getenv("BREWFATHER_TRACE_FILE") or None,
+            trace_otlp_endpoint=os.getenv("BREWFATHER_TRACE_OTLP_ENDPOINT") or None,
+            trace_sample_rate=env_float(
+                "BREWFATHER_TRACE_SAMPLE_RATE", cls.trace_sample_rate
+            ),
+            log_file=os.getenv("BREWFATHER_LOG_FILE", cls.log_file) or None,
+            log_level=os.getenv("BREWFATHER_LOG_LEVEL", cls.log_level),
+            log_json=os.getenv("BREWFATHER_LOG_FORMAT", "json").lower() != "text",
+            log_max_bytes=env_int("BREWFATHER_LOG_MAX_BYTES", cls.log_max_bytes),
+            log_backups=env_int("BREWFATHER_LOG_BACKUPS", cls.log_backups),
+            log_rotate_when=os.getenv("BREWFATHER_LOG_ROTATE_WHEN") or None,
+            log_queue_size=env_int("BREWFATHER_LOG_QUEUE_SIZE", cls.log_queue_size),
+        )
@@ -0,0 +1,110 @@
+import bisect
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol, cast
+
+from brewfather_mcp.types import InventoryCategory, InventoryItem
+
+type ExpiryKey = tuple[datetime, InventoryCategory, str]
+
+
+class StockedItem(Protocol):
+    """Fields the detail models of every category share with a best before date."""
+
+    @property
+    def id(self) -> str: ...
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def inventory(self) -> float: ...
+
+    @property
+    def lot_number(self) -> str | None: ...
+
+
+@dataclass(frozen=True)
+class ExpiringItem:
+    category: InventoryCategory
+    expires: datetime
+    item: StockedItem
+
+    def days_left(self, now: datetime) -> int:
+        return (self.expires.date() - now.date()).days
+
+
+class ExpiryIndex:
+    """Items in stock with a best before date, sorted by that date.
+
+    Kept up to date one item at a time from the changes applied to the
+    category replicas, so it never needs a category to be fetched again. A
+    lookup is a bisection followed by a slice of the items it returns.
+    """
+
+    def __init__(self):
+        self._entries: list[ExpiryKey] = []
+        self._keys: dict[tuple[InventoryCategory, str], ExpiryKey] = {}
+        self._items: dict[tuple[InventoryCategory, str], StockedItem] = {}
+        self._categories: set[InventoryCategory] = set()
+
+    def __contains__(self, category: InventoryCategory) -> bool:
+        return category in self._categories
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def apply_changes(
+        self,
+        category: InventoryCategory,
+        changed: Iterable[InventoryItem],
+        deleted_ids: Iterable[str],
+    ) -> None:
+        self._categories.add(category)
+        for item in changed:
+            self._remove((category, item.id))
+            expires = _best_before(item)
+            if expires is None or not getattr(item, "inventory", 0) > 0:
+                continue
+
+            key = (expires, category, item.id)
+            bisect.insort(self._entries, key)
+            self._keys[(category, item.id)] = key
+            # Only the detail models carry a best before date.
+            self._items[(category, item.id)] = cast(StockedItem, item)
+
+        for id in deleted_ids:
+            self._remove((category, id))
+
+    def _remove(self, item_key: tuple[InventoryCategory, str]) -> None:
+        key = self._keys.pop(item_key, None)
+        if key is None:
+            return
+
+        del self._entries[bisect.bisect_left(self._entries, key)]
+        del self._items[item_key]
+
+    def expiring(
+        self,
+        within: timedelta,
+        now: datetime | None = None,
+        categories: Iterable[InventoryCategory] | None = None,
+    ) -> list[ExpiringItem]:
+        """Items expiring before `now + within`, including expired ones, soonest first."""
+        horizon = (now or datetime.now()) + within
+        end = bisect.bisect_right(self._entries, (horizon,))
+        wanted = set(categories) if categories is not None else None
+        return [
+            ExpiringItem(category, expires, self._items[(category, id)])
+            for expires, category, id in self._entries[:end]
+            if wanted is None or category in wanted
+        ]
+
+
+def _best_before(item: InventoryItem) -> datetime | None:
+    value = getattr(item, "best_before_date", None)
+    if not value:
+        return None
+
+    return datetime.fromisoformat(value)
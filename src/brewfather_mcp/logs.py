@@ -0,0 +1,211 @@
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from pathlib import Path
+from typing import Any
+
+from brewfather_mcp.metrics import REGISTRY, Counter
+from brewfather_mcp.tenants import current_tenant
+from brewfather_mcp.tracing import current_span
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(request_id)s - %(message)s"
+
+# MCP `logging/setLevel` levels (RFC 5424 names) and Python's own.
+LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "notice": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "alert": logging.CRITICAL,
+    "emergency": logging.CRITICAL,
+}
+
+LOG_RECORDS_DROPPED = REGISTRY.register(
+    Counter(
+        "brewfather_log_records_dropped_total",
+        "Log records dropped because the log queue was full.",
+    )
+)
+
+# Id of the tool call or resource read being served, None outside of one.
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has, anything else came in through `extra`.
+# uvicorn's `color_message` repeats the message with terminal colours.
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {
+    "message",
+    "asctime",
+    "color_message",
+    "request_id",
+    "tenant",
+    "trace_id",
+    "span_id",
+}
+
+
+@contextmanager
+def request_scope() -> Iterator[str]:
+    """Tag the log records of one request with a new id."""
+    rid = f"{random.getrandbits(64):016x}"
+    token = request_id.set(rid)
+    try:
+        yield rid
+    finally:
+        request_id.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the request id, tenant and trace onto records as they are logged.
+
+    Context variables are only visible from the logging thread, so this has
+    to run on the queue handler rather than in the listener.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if (rid := request_id.get()) is not None:
+            record.request_id = rid
+        if (tenant := current_tenant.get()) is not None:
+            record.tenant = tenant
+        if (span := current_span()) is not None and span.sampled:
+            record.trace_id = span.trace_id
+            record.span_id = span.span_id
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, fields passed in `extra` included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("request_id", "tenant", "trace_id", "span_id"):
+            if (value := getattr(record, key, None)) is not None:
+                entry[key] = value
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Hands records to the listener thread, never waiting on it.
+
+    Only the message is rendered on the calling thread. When the queue is
+    full the record is dropped and counted instead of blocking the event
+    loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks hold on to frames, render them while they're valid.
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than losing the sentinel to a full queue.
+        self.queue.put(self._sentinel, timeout=5.0)
+
+
+def output_handler(
+    path: str | None,
+    max_bytes: int = 10 * 1024 * 1024,
+    backups: int = 5,
+    rotate_when: str | None = None,
+) -> logging.Handler:
+    """File handler rotating by size, or at `rotate_when` (e.g. "midnight").
+
+    Without a path records go to stderr.
+    """
+    if path is None:
+        return logging.StreamHandler(sys.stderr)
+
+    file = Path(path).expanduser()
+    file.parent.mkdir(parents=True, exist_ok=True)
+    if rotate_when:
+        return TimedRotatingFileHandler(
+            file, when=rotate_when, backupCount=backups, encoding="utf-8"
+        )
+    return RotatingFileHandler(
+        file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+    )
+
+
+def configure_queue_logging(
+    handler: logging.Handler,
+    level: str = "INFO",
+    json_format: bool = True,
+    queue_size: int = 10_000,
+) -> QueueListener:
+    """Route every record through a queue to `handler` on a background thread.
+
+    Replaces the handlers of the root logger, so libraries logging through
+    it (mcp, httpx, uvicorn) never write from the event loop either. Stop the
+    returned listener to write out what is still queued.
+    """
+    handler.setFormatter(
+        JsonFormatter()
+        if json_format
+        else logging.Formatter(TEXT_FORMAT, defaults={"request_id": "-"})
+    )
+    records: queue.Queue[logging.LogRecord] = queue.Queue(queue_size)
+    queue_handler = DroppingQueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+        existing.close()
+    root.addHandler(queue_handler)
+    set_level(level)
+
+    listener = _Listener(records, handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def set_level(level: str) -> None:
+    """Set the level of the root logger, from a Python or MCP level name."""
+    try:
+        logging.getLogger().setLevel(LEVELS[level.lower()])
+    except KeyError:
+        raise ValueError(f"Unknown log level {level!r}") from None
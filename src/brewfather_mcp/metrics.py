@@ -0,0 +1,241 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+
+type Labels = tuple[str, ...]
+
+# Upper bounds in seconds, from a cached tool call to a slow page walk.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Labels = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    @abstractmethod
+    def samples(self) -> Iterator[tuple[str, Labels, float]]:
+        """(name suffix, label values, value) of every series."""
+
+    def _check(self, values: Labels) -> Labels:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {values}")
+
+        return values
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Labels = ()):
+        super().__init__(name, help, labels)
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._check(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[tuple[str, Labels, float]]:
+        for labels, value in self.values.items():
+            yield "", labels, value
+
+
+class Gauge(Metric):
+    """A value going up and down, or read from `callback` when collected."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Labels = (),
+        callback: Callable[[], Mapping[Labels, float]] | None = None,
+    ):
+        super().__init__(name, help, labels)
+        self.values: dict[Labels, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[self._check(labels)] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._check(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self) -> Iterator[tuple[str, Labels, float]]:
+        values = self.callback() if self.callback is not None else self.values
+        for labels, value in values.items():
+            yield "", labels, value
+
+
+class _Series:
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets, cheap to record and merge."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        self.series: dict[Labels, _Series] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._check(labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = _Series(len(self.buckets))
+
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+        series.count += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def quantile(self, q: float, *labels: str) -> float | None:
+        """Estimate of the `q` quantile, interpolated within its bucket."""
+        series = self.series.get(self._check(labels))
+        if series is None or not series.count:
+            return None
+
+        rank = q * series.count
+        seen = 0
+        for i, count in enumerate(series.counts):
+            if count and seen + count >= rank:
+                low = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    return low
+                return low + (self.buckets[i] - low) * (rank - seen) / count
+            seen += count
+
+        return self.buckets[-1]
+
+    def samples(self) -> Iterator[tuple[str, Labels, float]]:
+        for labels, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series.counts):
+                cumulative += count
+                yield "_bucket", (*labels, _format(bound)), cumulative
+            yield "_sum", labels, series.sum
+            yield "_count", labels, series.count
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+
+    return repr(float(value)) if value != int(value) else f"{value:.1f}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register[TMetric: Metric](self, metric: TMetric) -> TMetric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render_prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, values, value in metric.samples():
+                names = metric.labels
+                if suffix == "_bucket":
+                    names = (*names, "le")
+                labels = ",".join(
+                    f'{name}="{_escape(label)}"' for name, label in zip(names, values)
+                )
+                labels = f"{{{labels}}}" if labels else ""
+                lines.append(f"{metric.name}{suffix}{labels} {_format(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+API_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "brewfather_api_request_seconds",
+        "Latency of Brewfather API requests.",
+        ("endpoint",),
+    )
+)
+API_REQUESTS = REGISTRY.register(
+    Counter(
+        "brewfather_api_requests_total",
+        "Brewfather API requests by response status, 'error' when none came.",
+        ("endpoint", "status"),
+    )
+)
+HANDLER_SECONDS = REGISTRY.register(
+    Histogram(
+        "mcp_handler_seconds",
+        "End to end time of tool calls and resource reads.",
+        ("kind", "name"),
+    )
+)
+HANDLER_CALLS = REGISTRY.register(
+    Counter(
+        "mcp_handler_calls_total",
+        "Tool calls and resource reads by outcome.",
+        ("kind", "name", "status"),
+    )
+)
+HANDLERS_IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        "mcp_handlers_in_flight",
+        "Tool calls and resource reads being served.",
+        ("kind",),
+    )
+)
+
+
+@contextmanager
+def track_handler(kind: str, name: str) -> Iterator[None]:
+    """Time one tool call or resource read and count its outcome."""
+    HANDLERS_IN_FLIGHT.inc(kind)
+    status = "error"
+    try:
+        with HANDLER_SECONDS.time(kind, name):
+            yield
+        status = "ok"
+    finally:
+        HANDLERS_IN_FLIGHT.dec(kind)
+        HANDLER_CALLS.inc(kind, name, status)
@@ -0,0 +1,236 @@
+import bisect
+from collections.abc import Sequence
+from contextlib import aclosing
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+from brewfather_mcp.categories import CategorySpec
+from brewfather_mcp.types import (
+    InventoryDetail,
+    InventoryItem,
+    ListQueryParams,
+    OrderByDirection,
+)
+
+if TYPE_CHECKING:
+    from brewfather_mcp.api import BrewfatherInventoryClient
+
+# Numeric fields range predicates and the local index support.
+NUMERIC_FIELDS = ("inventory", "alpha", "attenuation", "color")
+
+# Fields results can be ordered by. Their API names match the model fields, so
+# they double as `order_by` values. None of them is unique, so they can't be
+# used as pagination cursors.
+ORDER_FIELDS = ("name", *NUMERIC_FIELDS)
+
+
+@dataclass(frozen=True)
+class Range:
+    field: str
+    min: float | None = None
+    max: float | None = None
+
+    def matches(self, value: float | None) -> bool:
+        if value is None:
+            return False
+
+        return (self.min is None or value >= self.min) and (
+            self.max is None or value <= self.max
+        )
+
+
+@dataclass(frozen=True)
+class InventoryQuery:
+    """Structured predicates over the items of one category.
+
+    Every predicate must hold for an item to match: numeric `ranges`
+    (bounds inclusive), `type` (case-insensitive), `origin` (case-insensitive
+    substring) and `in_stock` (inventory above zero).
+    """
+
+    spec: CategorySpec[Any, Any]
+    ranges: tuple[Range, ...] = ()
+    type: str | None = None
+    origin: str | None = None
+    in_stock: bool = False
+    order_by: str | None = None
+    descending: bool = False
+    limit: int | None = None
+
+    @property
+    def fields(self) -> set[str]:
+        """Item fields the predicates and the ordering read."""
+        fields = {range.field for range in self.ranges}
+        if self.type is not None:
+            fields.add("type")
+        if self.origin is not None:
+            fields.add("origin")
+        if self.order_by is not None:
+            fields.add(self.order_by)
+        return fields
+
+    def validate(self) -> None:
+        detail_fields = self.spec.detail_model.model_fields
+        for field in self.fields:
+            if field not in detail_fields and field != "name":
+                raise ValueError(f"{self.spec.title} have no {field!r} field")
+
+        for range in self.ranges:
+            if range.field not in NUMERIC_FIELDS:
+                raise ValueError(f"{range.field!r} is not a numeric field")
+
+        if self.order_by is not None and self.order_by not in ORDER_FIELDS:
+            raise ValueError(f"Can't order by {self.order_by!r}")
+
+        if self.limit is not None and self.limit < 1:
+            raise ValueError("limit must be at least 1")
+
+    def matches(self, item: InventoryItem) -> bool:
+        if self.in_stock and not getattr(item, "inventory", 0) > 0:
+            return False
+
+        if self.type is not None and (
+            str(getattr(item, "type", "")).casefold() != self.type.casefold()
+        ):
+            return False
+
+        if self.origin is not None and (
+            self.origin.casefold() not in str(getattr(item, "origin", "")).casefold()
+        ):
+            return False
+
+        return all(range.matches(getattr(item, range.field)) for range in self.ranges)
+
+
+class InventoryIndex[TDetail: InventoryDetail]:
+    """Sorted indexes over the numeric fields of a detail list.
+
+    A range predicate is a pair of bisections into the sorted values of its
+    field, so only the items within the most selective range are checked
+    against the rest of the query.
+    """
+
+    def __init__(self, items: Sequence[TDetail]):
+        self.items = items
+        self._sorted: dict[str, tuple[list[float], list[int]]] = {}
+        fields = items[0].__class__.model_fields if items else {}
+        for field in NUMERIC_FIELDS:
+            if field not in fields:
+                continue
+
+            entries = sorted(
+                (value, position)
+                for position, item in enumerate(items)
+                if (value := getattr(item, field)) is not None
+            )
+            self._sorted[field] = (
+                [value for value, _ in entries],
+                [position for _, position in entries],
+            )
+
+    def _candidates(self, range: Range) -> list[int]:
+        values, positions = self._sorted.get(range.field, ([], []))
+        low = 0 if range.min is None else bisect.bisect_left(values, range.min)
+        high = (
+            len(values) if range.max is None else bisect.bisect_right(values, range.max)
+        )
+        return positions[low:high]
+
+    def select(self, query: InventoryQuery) -> list[TDetail]:
+        if query.ranges:
+            candidates = min(
+                (self._candidates(range) for range in query.ranges), key=len
+            )
+            items = [self.items[position] for position in sorted(candidates)]
+        else:
+            items = list(self.items)
+
+        return [item for item in items if query.matches(item)]
+
+
+def _index_for[TDetail: InventoryDetail](
+    client: "BrewfatherInventoryClient",
+    spec: CategorySpec[Any, TDetail],
+    items: list[TDetail],
+) -> InventoryIndex[TDetail]:
+    """Index of `items` kept by `client`, rebuilt when the list changed."""
+    index = client.indexes.get(spec.category)
+    if index is None or index.items is not items:
+        index = client.indexes[spec.category] = InventoryIndex(items)
+
+    return index
+
+
+async def run_query(
+    client: "BrewfatherInventoryClient", query: InventoryQuery
+) -> list[InventoryItem]:
+    """Items of `query.spec` matching `query`.
+
+    Queries that only read fields of the list model are pushed down to the
+    list endpoint: `in_stock` as `inventory_exists`, and `limit` when nothing
+    else is left to filter locally. The ordering is pushed down as `order_by`
+    only when a single page answers the query; paging by a field with ties
+    would skip the items tied across a page boundary, so otherwise pages are
+    read by `_id` and ordered locally. Anything else is answered from the
+    detail list, which the client keeps in sync, through an `InventoryIndex`.
+    """
+    query.validate()
+    spec = query.spec
+
+    if query.fields <= spec.item_model.model_fields.keys():
+        return await _query_list_endpoint(client, query)
+
+    index = _index_for(client, spec, await client.get_detail_list(spec))
+    return _ordered(index.select(query), query)[: query.limit]
+
+
+def _ordered[TItem: InventoryItem](
+    items: list[TItem], query: InventoryQuery
+) -> list[TItem]:
+    """`items` in the order of `query`, those without a value last."""
+    if query.order_by is None:
+        return items
+
+    order_by = query.order_by
+    ordered = sorted(
+        (item for item in items if getattr(item, order_by) is not None),
+        key=attrgetter(order_by),
+        reverse=query.descending,
+    )
+    ordered.extend(item for item in items if getattr(item, order_by) is None)
+    return ordered
+
+
+async def _query_list_endpoint(
+    client: "BrewfatherInventoryClient", query: InventoryQuery
+) -> list[InventoryItem]:
+    query_params = ListQueryParams(inventory_exists=query.in_stock or None)
+    from brewfather_mcp.api import MAX_PAGE_SIZE
+
+    filters_locally = bool(query.ranges or query.type or query.origin)
+    if query.limit is not None and query.limit <= MAX_PAGE_SIZE and not filters_locally:
+        # The first page holds every match, no cursor to follow.
+        query_params.limit = query.limit
+        query_params.order_by = query.order_by
+        if query.order_by is not None and query.descending:
+            query_params.order_by_direction = OrderByDirection.DESCENDING
+        page = await client.get_list(query.spec, query_params)
+        return [item for item in page.root if query.matches(item)]
+
+    matches: list[InventoryItem] = []
+    async with aclosing(client.iter_items(query.spec, query_params)) as items:
+        async for item in items:
+            if not query.matches(item):
+                continue
+
+            matches.append(item)
+            # Items come by `_id`, all of them are needed to order them.
+            if (
+                query.order_by is None
+                and query.limit is not None
+                and len(matches) >= query.limit
+            ):
+                break
+
+    return _ordered(matches, query)[: query.limit]
@@ -0,0 +1,231 @@
+import asyncio
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from enum import StrEnum, auto
+
+
+class RateLimitPolicy(StrEnum):
+    """What a caller does when the request budget is exhausted."""
+
+    WAIT = auto()
+    FAIL_FAST = auto()
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request can't be made without exceeding the API quota."""
+
+    retry_after: float
+
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"Brewfather API request quota exhausted, retry in {retry_after:.1f}s"
+        )
+        self.retry_after = retry_after
+
+
+# Policy set with `rate_limit_policy`, None when the client default applies.
+type PolicyOverride = RateLimitPolicy | SharedPolicy | None
+
+
+class SharedPolicy:
+    """Rate limit policy of a call shared by several callers.
+
+    Resolves to the most patient policy of the callers waiting on the call
+    right now: it waits for the quota as long as one of them would, and only
+    fails fast once every caller left would. A caller without a policy of its
+    own stands for the client default.
+    """
+
+    def __init__(self):
+        self._callers: list[PolicyOverride] = []
+
+    @contextmanager
+    def caller(self, policy: PolicyOverride) -> Iterator[None]:
+        self._callers.append(policy)
+        try:
+            yield
+        finally:
+            self._callers.remove(policy)
+
+    def resolve(self) -> RateLimitPolicy | None:
+        policies = {
+            policy.resolve() if isinstance(policy, SharedPolicy) else policy
+            for policy in self._callers
+        }
+        if RateLimitPolicy.WAIT in policies:
+            return RateLimitPolicy.WAIT
+        if None in policies or not policies:
+            return None
+        return RateLimitPolicy.FAIL_FAST
+
+
+_policy: ContextVar[PolicyOverride] = ContextVar("rate_limit_policy", default=None)
+
+
+def current_policy() -> RateLimitPolicy | None:
+    """Policy set with `rate_limit_policy` for the running task, if any."""
+    policy = _policy.get()
+    return policy.resolve() if isinstance(policy, SharedPolicy) else policy
+
+
+def policy_override() -> PolicyOverride:
+    """The override itself, shared policies left unresolved."""
+    return _policy.get()
+
+
+@contextmanager
+def rate_limit_policy(policy: RateLimitPolicy | SharedPolicy) -> Iterator[None]:
+    """Override the rate limit policy of every request made inside the block.
+
+    The override follows the asyncio context, so it also applies to tasks
+    spawned from the block (e.g. concurrent detail fetches).
+    """
+    token = _policy.set(policy)
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+class RequestCount:
+    def __init__(self):
+        self.requests = 0
+
+
+_counts: ContextVar[tuple[RequestCount, ...]] = ContextVar("request_counts", default=())
+
+
+@contextmanager
+def count_requests() -> Iterator[RequestCount]:
+    """Count the API requests made inside the block.
+
+    Like the policy override this follows the asyncio context, so requests
+    of calls other callers started and this block only joined are left out.
+    """
+    count = RequestCount()
+    token = _counts.set((*_counts.get(), count))
+    try:
+        yield count
+    finally:
+        _counts.reset(token)
+
+
+def record_request() -> None:
+    for count in _counts.get():
+        count.requests += 1
+
+
+def parse_retry_after(value: str | None, default: float) -> float:
+    """Seconds to wait from a `Retry-After` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return default
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class TokenBucket:
+    """Token bucket sized to an API quota of `capacity` requests per `period`.
+
+    The bucket starts full and refills continuously. `pause` blocks every
+    caller until the given delay has passed, which is how a
+    `429 Too Many Requests` from the server is honoured.
+    """
+
+    capacity: int
+    period: float
+
+    def __init__(
+        self,
+        capacity: int,
+        period: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.period = period
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def refill_rate(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / self.period
+
+    @property
+    def tokens(self) -> float:
+        """Requests that can be made right now."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        # Nothing is refilled while the bucket is paused.
+        refill_from = max(self._updated_at, self._paused_until)
+        if now > refill_from:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - refill_from) * self.refill_rate
+            )
+        self._updated_at = now
+
+    def time_until_available(self) -> float:
+        """Seconds until a token can be taken, 0 if one is available now."""
+        self._refill()
+        paused_for = max(0.0, self._paused_until - self._clock())
+        return paused_for + max(0.0, 1 - self._tokens) / self.refill_rate
+
+    def pause(self, seconds: float) -> None:
+        """Refuse tokens for the next `seconds`.
+
+        The bucket is drained down to a single token, so one request can probe
+        the server when the pause ends and the rest wait for the refill.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 1.0)
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    async def acquire(
+        self,
+        policy: RateLimitPolicy = RateLimitPolicy.WAIT,
+        max_wait: float | None = None,
+    ) -> None:
+        """Take one token.
+
+        With `RateLimitPolicy.WAIT` callers queue up in order until a token is
+        available, unless that would take longer than `max_wait`. With
+        `RateLimitPolicy.FAIL_FAST` `RateLimitExceeded` is raised straight away.
+        """
+        if policy is RateLimitPolicy.FAIL_FAST:
+            wait = self.time_until_available()
+            if wait > 0 or self._lock.locked():
+                raise RateLimitExceeded(wait)
+
+            self._tokens -= 1
+            return
+
+        async with self._lock:
+            while (wait := self.time_until_available()) > 0:
+                if max_wait is not None and wait > max_wait:
+                    raise RateLimitExceeded(wait)
+
+                await asyncio.sleep(wait)
+
+            self._tokens -= 1
@@ -0,0 +1,87 @@
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from operator import attrgetter
+from typing import Any
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+class Renderer[TModel]:
+    """Renders a model as `Label: value` lines, one per field.
+
+    Fields are given as `(label, source)` or `(label, source, suffix)`, where
+    the source is an attribute path (`"timestamp.seconds"`) or a callable
+    taking the model. Getters are compiled once, and each render builds its
+    output with a single join. In compact mode fields whose value is None or
+    empty are left out.
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[
+            tuple[str, str | Callable[[TModel], Any]]
+            | tuple[str, str | Callable[[TModel], Any], str]
+        ],
+    ):
+        self._fields: list[tuple[str, Callable[[TModel], Any], str]] = []
+        for label, source, *suffix in fields:
+            getter = attrgetter(source) if isinstance(source, str) else source
+            self._fields.append(
+                (f"{label}: ", getter, f" {suffix[0]}" if suffix else "")
+            )
+
+    def render(self, item: TModel, compact: bool = False) -> str:
+        lines: list[str] = []
+        for prefix, getter, suffix in self._fields:
+            value = getter(item)
+            if compact and _is_empty(value):
+                continue
+
+            lines.append(f"{prefix}{value}{suffix}\n")
+
+        return "".join(lines)
+
+
+def render_rows(rows: Iterable[Mapping[str, Any]], compact: bool = False) -> str:
+    """Render dict rows as `key: value` blocks separated by a blank line."""
+    lines: list[str] = []
+    for row in rows:
+        for key, value in row.items():
+            if compact and _is_empty(value):
+                continue
+
+            lines.append(f"{key}: {value}\n")
+        lines.append("\n")
+
+    return "".join(lines)
+
+
+async def render_page[TModel](
+    items: AsyncIterator[TModel],
+    renderer: Renderer[TModel],
+    max_bytes: int,
+    compact: bool = False,
+    separator: str = "---\n",
+) -> tuple[str, TModel | None]:
+    """Render items from `items` until the output would exceed `max_bytes`.
+
+    At least one item is always rendered. Returns the page and the last item
+    rendered on it when more items are left, or None on the last page.
+    Iteration stops at the first item that doesn't fit, so only as much of
+    `items` is consumed as the page needs.
+    """
+    blocks: list[str] = []
+    size = 0
+    last: TModel | None = None
+    async for item in items:
+        block = renderer.render(item, compact)
+        block_size = len(block.encode()) + (len(separator) if blocks else 0)
+        if blocks and size + block_size > max_bytes:
+            return separator.join(blocks), last
+
+        blocks.append(block)
+        size += block_size
+        last = item
+
+    return separator.join(blocks), None
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from brewfather_mcp.categories import CategorySpec
+from brewfather_mcp.ratelimit import (
+    RateLimitExceeded,
+    RateLimitPolicy,
+    count_requests,
+    rate_limit_policy,
+)
+from brewfather_mcp.sync import SyncMode
+from brewfather_mcp.tracing import span
+from brewfather_mcp.types import InventoryCategory
+
+if TYPE_CHECKING:
+    from brewfather_mcp.api import BrewfatherInventoryClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CategorySchedule:
+    category: InventoryCategory
+    # Seconds between refreshes, shrinking while the category keeps changing.
+    interval: float
+    next_run_in: float
+    runs: int
+    requests: int
+    last_changed: int | None
+
+
+@dataclass(frozen=True)
+class SchedulerStats:
+    categories: tuple[CategorySchedule, ...]
+    requests: int
+    deferrals: int
+    uptime: float
+
+    @property
+    def requests_per_hour(self) -> float:
+        return self.requests * 3600 / self.uptime if self.uptime else 0.0
+
+
+@dataclass
+class _Slot:
+    spec: CategorySpec[Any, Any]
+    interval: float
+    next_run: float
+    runs: int = 0
+    requests: int = 0
+    last_changed: int | None = None
+
+
+class RefreshScheduler:
+    """Refreshes the inventory in the background so reads find warm data.
+
+    Each category is synced on its own interval, starting at `interval`. A
+    delta sync that finds changes halves it (down to `min_interval`), one that
+    doesn't stretches it by half (up to `max_interval`), so categories that
+    change often are refreshed often. Intervals are stretched further while
+    less than `quota_reserve` of the request quota is left, and no refresh
+    starts below `quota_reserve / 2`, keeping the rest for interactive calls.
+
+    Requests the client makes outside the scheduler count as interactive
+    load; above `busy_requests_per_minute` due refreshes are put off by
+    `min_interval`. Refreshes run with the fail-fast rate limit policy, so
+    they never wait on the quota.
+    """
+
+    def __init__(
+        self,
+        client: "BrewfatherInventoryClient",
+        specs: Iterable[CategorySpec[Any, Any]],
+        interval: float = 600.0,
+        min_interval: float | None = None,
+        max_interval: float | None = None,
+        quota_reserve: float = 0.5,
+        busy_requests_per_minute: float = 20.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._client = client
+        self.min_interval = min_interval or interval / 10
+        self.max_interval = max_interval or interval * 6
+        self.quota_reserve = quota_reserve
+        self.busy_requests_per_minute = busy_requests_per_minute
+        self._clock = clock
+        self._started_at = clock()
+        # Every category is refreshed once right away to warm the replicas.
+        self._slots = [
+            _Slot(spec, interval, next_run=self._started_at) for spec in specs
+        ]
+        self._requests = 0
+        self._deferrals = 0
+        self._last_tick = self._started_at
+        self._last_interactive = client.requests_made
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        _ = self._task.cancel()
+        _ = await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            delay = await self.tick()
+            await asyncio.sleep(delay)
+
+    def _interactive_rate(self, now: float) -> float:
+        """Requests per minute made outside the scheduler since the last tick."""
+        interactive = self._client.requests_made - self._requests
+        elapsed = now - self._last_tick
+        rate = (interactive - self._last_interactive) * 60 / elapsed if elapsed else 0
+        self._last_interactive = interactive
+        self._last_tick = now
+        return rate
+
+    def _quota_left(self) -> float:
+        limiter = self._client.rate_limiter
+        return limiter.tokens / limiter.capacity
+
+    async def tick(self) -> float:
+        """Run the refreshes that are due, returns seconds until the next one."""
+        now = self._clock()
+        due = [slot for slot in self._slots if slot.next_run <= now]
+        if due and self._interactive_rate(now) > self.busy_requests_per_minute:
+            logger.info("Interactive load is high, putting off background refresh")
+            for slot in due:
+                slot.next_run = now + self.min_interval
+            self._deferrals += len(due)
+            due = []
+
+        for slot in sorted(due, key=lambda slot: slot.next_run):
+            await self._refresh(slot)
+
+        now = self._clock()
+        return max(0.0, min(slot.next_run for slot in self._slots) - now)
+
+    async def _refresh(self, slot: _Slot) -> None:
+        quota_left = self._quota_left()
+        if quota_left < self.quota_reserve / 2:
+            limiter = self._client.rate_limiter
+            missing = (self.quota_reserve / 2 - quota_left) * limiter.capacity
+            slot.next_run = self._clock() + missing / limiter.refill_rate
+            self._deferrals += 1
+            return
+
+        category = slot.spec.category
+        # Only requests made on behalf of the refresh are counted, not those of
+        # interactive calls it joins, nor of interactive calls happening meanwhile.
+        with count_requests() as spent:
+            try:
+                with (
+                    span("scheduled refresh", category=category),
+                    rate_limit_policy(RateLimitPolicy.FAIL_FAST),
+                ):
+                    result = await self._client.refresh(slot.spec)
+            except RateLimitExceeded as e:
+                slot.next_run = self._clock() + e.retry_after
+                self._deferrals += 1
+                return
+            except Exception:
+                logger.exception("Background refresh of %s failed", category)
+                result = None
+            finally:
+                slot.requests += spent.requests
+                self._requests += spent.requests
+
+        slot.runs += 1
+        if result is not None:
+            slot.last_changed = result.changed + result.deleted
+        # A full refresh reports every item as changed, only deltas tell how
+        # often the category changes.
+        if result is not None and result.mode is SyncMode.DELTA:
+            if slot.last_changed:
+                slot.interval = max(self.min_interval, slot.interval / 2)
+            else:
+                slot.interval = min(self.max_interval, slot.interval * 1.5)
+
+        # Stretch the interval while the quota runs low.
+        stretch = max(1.0, self.quota_reserve / max(self._quota_left(), 0.05))
+        slot.next_run = self._clock() + slot.interval * stretch
+
+    def stats(self) -> SchedulerStats:
+        now = self._clock()
+        return SchedulerStats(
+            categories=tuple(
+                CategorySchedule(
+                    category=slot.spec.category,
+                    interval=slot.interval,
+                    next_run_in=max(0.0, slot.next_run - now),
+                    runs=slot.runs,
+                    requests=slot.requests,
+                    last_changed=slot.last_changed,
+                )
+                for slot in self._slots
+            ),
+            requests=self._requests,
+            deferrals=self._deferrals,
+            uptime=now - self._started_at,
+        )
@@ -0,0 +1,169 @@
+import math
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from brewfather_mcp.types import InventoryCategory, InventoryItem
+
+# Item fields matched against, when the model has them. Names and suppliers
+# come with the list endpoints, product IDs only with the details.
+SEARCH_FIELDS = ("name", "supplier", "laboratory", "product_id")
+
+type ItemKey = tuple[InventoryCategory, str]
+type TermKey = tuple[ItemKey, str]
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Case-insensitive trigrams of `text`, padded so short words still match."""
+    padded = f"  {' '.join(text.casefold().split())} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    category: InventoryCategory
+    id: str
+    name: str
+    # Field and value the query matched best, e.g. a yeast's product ID.
+    field: str
+    value: str
+    # Trigram similarity between the query and `value`, 1.0 on a full match.
+    score: float
+
+
+class NameIndex:
+    """Trigram index over names, suppliers and product IDs of the inventory.
+
+    Every distinct field value is split into trigrams once, and each trigram
+    maps to the values containing it; items sharing a value (a supplier, a
+    common malt name) share its postings. A lookup only visits the values
+    sharing a trigram with the query, ranks them by Jaccard similarity of the
+    trigram sets, and expands the best ones to the items holding them.
+
+    A match scoring at least `min_score` shares at least that fraction of
+    the query's trigrams, so the most common query trigrams can be skipped
+    when collecting candidates without missing any match.
+    """
+
+    def __init__(self):
+        self._postings: defaultdict[str, set[str]] = defaultdict(set)
+        self._grams: dict[str, frozenset[str]] = {}
+        # Items holding each indexed value, and in which field, in insertion
+        # order so ties rank the same way every time.
+        self._holders: defaultdict[str, dict[TermKey, None]] = defaultdict(dict)
+        self._terms: dict[ItemKey, tuple[tuple[str, str], ...]] = {}
+        self._names: dict[ItemKey, str] = {}
+        self._keys: defaultdict[InventoryCategory, set[ItemKey]] = defaultdict(set)
+
+    def __contains__(self, category: InventoryCategory) -> bool:
+        return category in self._keys
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def update(
+        self, category: InventoryCategory, items: Iterable[InventoryItem]
+    ) -> None:
+        """Make the entries of `category` match `items`."""
+        items = list(items)
+        ids = {item.id for item in items}
+        deleted = [id for _, id in self._keys[category] if id not in ids]
+        self.apply_changes(category, items, deleted)
+
+    def apply_changes(
+        self,
+        category: InventoryCategory,
+        changed: Iterable[InventoryItem],
+        deleted_ids: Iterable[str],
+    ) -> None:
+        """Index added or changed items of `category` and drop deleted ones.
+
+        Items whose indexed fields didn't change are left as they are.
+        """
+        keys = self._keys[category]
+        for item in changed:
+            key = (category, item.id)
+            terms = tuple(
+                (field, str(value))
+                for field in SEARCH_FIELDS
+                if (value := getattr(item, field, None))
+            )
+            if self._terms.get(key) == terms:
+                continue
+
+            self._remove(key)
+            self._add(key, terms)
+            keys.add(key)
+
+        for id in deleted_ids:
+            self._remove((category, id))
+            keys.discard((category, id))
+
+    def _add(self, key: ItemKey, terms: tuple[tuple[str, str], ...]) -> None:
+        self._terms[key] = terms
+        self._names[key] = dict(terms).get("name", "")
+        for field, value in terms:
+            holders = self._holders[value]
+            if not holders:
+                self._grams[value] = trigrams(value)
+                for gram in self._grams[value]:
+                    self._postings[gram].add(value)
+            holders[(key, field)] = None
+
+    def _remove(self, key: ItemKey) -> None:
+        for field, value in self._terms.pop(key, ()):
+            holders = self._holders[value]
+            _ = holders.pop((key, field), None)
+            if holders:
+                continue
+
+            del self._holders[value]
+            for gram in self._grams.pop(value):
+                postings = self._postings[gram]
+                postings.discard(value)
+                if not postings:
+                    del self._postings[gram]
+        _ = self._names.pop(key, None)
+
+    def search(
+        self,
+        query: str,
+        categories: Iterable[InventoryCategory] | None = None,
+        limit: int = 10,
+        min_score: float = 0.2,
+    ) -> list[NameMatch]:
+        """Best `limit` items matching `query`, highest score first."""
+        wanted = set(categories) if categories is not None else None
+        query_grams = trigrams(query)
+        known = sorted(
+            (gram for gram in query_grams if gram in self._postings),
+            key=lambda gram: len(self._postings[gram]),
+        )
+        required = max(1, math.ceil(min_score * len(query_grams)))
+        candidates: set[str] = set().union(
+            *(self._postings[gram] for gram in known[: len(known) - required + 1])
+        )
+
+        scored: list[tuple[float, str]] = []
+        for value in candidates:
+            grams = self._grams[value]
+            shared = len(query_grams & grams)
+            score = shared / (len(query_grams) + len(grams) - shared)
+            if score >= min_score:
+                scored.append((score, value))
+        scored.sort(reverse=True)
+
+        matches: dict[ItemKey, NameMatch] = {}
+        for score, value in scored:
+            for key, field in self._holders[value]:
+                if key in matches or (wanted is not None and key[0] not in wanted):
+                    continue
+
+                category, id = key
+                matches[key] = NameMatch(
+                    category, id, self._names[key], field, value, score
+                )
+                if len(matches) == limit:
+                    return list(matches.values())
+
+        return list(matches.values())
@@ -1,32 +1,300 @@
-import asyncio
+import argparse
+import atexit
+import base64
+import binascii
+import hmac
 import logging
+import os
+import typing
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable, Sequence
+from contextlib import aclosing, asynccontextmanager
+from datetime import datetime, timedelta
 
+import anyio
 from dotenv import load_dotenv
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.fastmcp.prompts.base import Message
-from mcp.types import TextContent
-
-from brewfather_mcp.api import BrewfatherInventoryClient
-from brewfather_mcp.inventory import (
-    get_fermentables_summary,
-    get_hops_summary,
-    get_yeast_summary,
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from mcp.types import EmbeddedResource, ImageContent, LoggingLevel, TextContent
+from pydantic import AnyUrl
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from brewfather_mcp.categories import (
+    BY_CATEGORY,
+    CATEGORIES,
+    FERMENTABLES,
+    HOPS,
+    MISCS,
+    YEASTS,
+    CategorySpec,
 )
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    filename="/tmp/application.log",  # Path to log file
-    filemode="a",
+from brewfather_mcp.config import ServerConfig, env_int
+from brewfather_mcp.expiry import ExpiringItem
+from brewfather_mcp.inventory import get_category_summary
+from brewfather_mcp.logs import (
+    configure_queue_logging,
+    output_handler,
+    request_scope,
+    set_level,
+)
+from brewfather_mcp.metrics import (
+    API_REQUEST_SECONDS,
+    API_REQUESTS,
+    HANDLER_CALLS,
+    HANDLER_SECONDS,
+    REGISTRY,
+    Gauge,
+    Histogram,
+    track_handler,
+)
+from brewfather_mcp.query import InventoryQuery, Range, run_query
+from brewfather_mcp.rendering import render_page, render_rows
+from brewfather_mcp.sync import ProgressCallback
+from brewfather_mcp.tenants import (
+    TenantMiddleware,
+    TenantRegistry,
+    bearer_token,
+    current_tenant,
+    invalid_token,
+    load_credentials,
 )
+from brewfather_mcp.tracing import (
+    JsonlExporter,
+    OtlpExporter,
+    SpanExporter,
+    Tracer,
+    set_tracer,
+    span,
+)
+from brewfather_mcp.types import InventoryCategory, ListQueryParams
+from brewfather_mcp.utils import AnyDictList, as_completed_bounded, gather_bounded
+
+if typing.TYPE_CHECKING:
+    from starlette.applications import Starlette
+
+    from brewfather_mcp.api import BrewfatherInventoryClient
+    from brewfather_mcp.scheduler import RefreshScheduler
 
 logger = logging.getLogger(__name__)
 
-mcp = FastMCP("BrewfatherMCP")
 
-_ = load_dotenv()
+# MCP sessions currently open. Over stdio there is one for the life of the
+# process, over HTTP every client connection opens its own.
+_sessions = 0
+
+
+@asynccontextmanager
+async def lifespan(_server: FastMCP) -> AsyncIterator[None]:
+    """Share the Brewfather client between sessions, closing its pool after the last.
+
+    Every session uses the same client, so the connection pool, cache, rate
+    limiter and indexes are shared. The background refresh scheduler, when
+    enabled, runs while any session is open. Otherwise nothing touches the API
+    until the first request.
+    """
+    global _sessions, refresh_scheduler
+    config = get_config()
+    if config.refresh_scheduler and config.tenants_file is not None:
+        # The scheduler refreshes the account of the environment credentials,
+        # which a multi-tenant server doesn't serve.
+        raise ValueError(
+            "BREWFATHER_REFRESH_SCHEDULER can't be used with BREWFATHER_TENANTS_FILE"
+        )
+
+    _sessions += 1
+    if _sessions == 1:
+        if config.refresh_scheduler and refresh_scheduler is None:
+            from brewfather_mcp.scheduler import RefreshScheduler
+
+            refresh_scheduler = RefreshScheduler(
+                get_client(),
+                CATEGORIES,
+                interval=config.refresh_interval,
+                quota_reserve=config.refresh_quota_reserve,
+                busy_requests_per_minute=config.refresh_busy_requests_per_minute,
+            )
+        if refresh_scheduler is not None:
+            refresh_scheduler.start()
+    try:
+        yield
+    finally:
+        _sessions -= 1
+        if _sessions == 0:
+            if refresh_scheduler is not None:
+                await refresh_scheduler.stop()
+            if brewfather_client is not None:
+                await brewfather_client.aclose()
+            if tenant_registry is not None:
+                await tenant_registry.aclose()
+
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP instrumenting every tool call and resource read.
+
+    Each is timed, traced and gets a request id for its log records, and
+    clients can change the log level. See metrics.py, tracing.py and logs.py.
+    """
+
+    def _setup_handlers(self) -> None:
+        super()._setup_handlers()
+        _ = self._mcp_server.set_logging_level()(self.set_logging_level)
+
+    async def set_logging_level(self, level: LoggingLevel) -> None:
+        """Handle `logging/setLevel`, for every session of the server.
+
+        The level is process wide, so tenants can't change it: one would
+        change the logs of every other.
+        """
+        if get_tenants() is not None:
+            logger.warning(
+                "Ignoring log level %s asked for by tenant %s",
+                level,
+                current_tenant.get(),
+            )
+            return
+
+        set_level(level)
+        logger.info("Log level set to %s", level)
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, typing.Any]
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        with (
+            request_scope(),
+            track_handler("tool", name),
+            span(f"tool {name}"),
+        ):
+            return await super().call_tool(name, arguments)
+
+    async def read_resource(self, uri: AnyUrl | str) -> Iterable[ReadResourceContents]:
+        name = self._resource_name(str(uri))
+        with (
+            request_scope(),
+            track_handler("resource", name),
+            span(f"resource {name}", uri=str(uri)),
+        ):
+            return await super().read_resource(uri)
+
+    def _resource_name(self, uri: str) -> str:
+        """URI template of a resource, keeping ids out of the metric labels."""
+        resources = self._resource_manager.list_resources()
+        if any(str(resource.uri) == uri for resource in resources):
+            return uri
+
+        for template in self._resource_manager.list_templates():
+            if template.matches(uri) is not None:
+                return template.uri_template
+
+        return "unknown"
+
+
+mcp = InstrumentedFastMCP("BrewfatherMCP", lifespan=lifespan)
+
+# Created on first use, so the server starts without touching the API client
+# (or its credentials). Tests replace it with a mock.
+server_config: ServerConfig | None = None
+brewfather_client: "BrewfatherInventoryClient | None" = None
+refresh_scheduler: "RefreshScheduler | None" = None
+tenant_registry: TenantRegistry | None = None
+
+
+def get_config() -> ServerConfig:
+    """Server settings, read on first use after loading `.env`.
+
+    The clients read their own settings and credentials from the environment,
+    so `.env` is loaded before any of them is created.
+    """
+    global server_config
+    if server_config is None:
+        _ = load_dotenv()
+        server_config = ServerConfig.from_env()
 
-brewfather_client = BrewfatherInventoryClient()
+    return server_config
+
+
+def get_tenants() -> TenantRegistry | None:
+    global tenant_registry
+    config = get_config()
+    if tenant_registry is None and config.tenants_file is not None:
+        tenant_registry = TenantRegistry(
+            load_credentials(config.tenants_file), max_tenants=config.max_tenants
+        )
+
+    return tenant_registry
+
+
+def get_client() -> "BrewfatherInventoryClient":
+    """Client of the tenant being served, or the one of the environment credentials."""
+    global brewfather_client
+    tenants = get_tenants()
+    tenant = current_tenant.get()
+    if tenant is not None and tenants is not None:
+        return tenants.client(tenant)
+
+    if brewfather_client is None:
+        from brewfather_mcp.api import BrewfatherInventoryClient
+
+        brewfather_client = BrewfatherInventoryClient()
+
+    return brewfather_client
+
+
+def open_clients() -> dict[str, "BrewfatherInventoryClient"]:
+    """Clients created so far by tenant, "" for the environment credentials."""
+    clients = {"": brewfather_client} if brewfather_client is not None else {}
+    if tenant_registry is not None:
+        clients.update(tenant_registry.clients())
+
+    return clients
+
+
+def client_gauge(
+    name: str, help: str, read: Callable[["BrewfatherInventoryClient"], float]
+) -> Gauge:
+    return REGISTRY.register(
+        Gauge(
+            name,
+            help,
+            ("tenant",),
+            callback=lambda: {
+                (tenant,): read(client) for tenant, client in open_clients().items()
+            },
+        )
+    )
+
+
+_ = client_gauge(
+    "brewfather_cache_hit_ratio",
+    "Share of response cache lookups served from the cache.",
+    lambda client: client.cache.stats().hit_ratio,
+)
+_ = client_gauge(
+    "brewfather_cache_bytes",
+    "Size of the cached responses.",
+    lambda client: client.cache.stats().size_bytes,
+)
+_ = client_gauge(
+    "brewfather_api_requests_in_flight",
+    "Requests waiting on the rate limiter or the Brewfather API.",
+    lambda client: client.requests_in_flight,
+)
+_ = client_gauge(
+    "brewfather_rate_limit_tokens",
+    "Requests left in the client side quota bucket.",
+    lambda client: client.rate_limiter.tokens,
+)
+_ = client_gauge(
+    "brewfather_single_flight_dedupe_ratio",
+    "Share of API reads that joined an identical one already in flight.",
+    lambda client: client.single_flight.stats().dedupe_ratio,
+)
+_ = client_gauge(
+    "brewfather_single_flight_in_flight",
+    "Distinct API reads and syncs in flight, each shared by its callers.",
+    lambda client: client.single_flight.stats().in_flight,
+)
 
 
 @mcp.prompt(
@@ -65,264 +333,656 @@ async def inventory_categories() -> str:
     content = """
     Fermentables (Grains, Adjuncts, etc..)
     Hops
+    Miscs (Spices, Finings, Water Agents, etc..)
     Yeasts
     """
 
     return content
 
 
-@mcp.resource(
-    uri="inventory://fermentables",
-    name="Fermentables",
-    description="List all the fermentables (malts, adjuncts, grains, etc) inventory.",
-)
-async def read_fermentables() -> str:
-    try:
-        data = await brewfather_client.get_fermentables_list()
+def category_list_resource(
+    spec: CategorySpec[typing.Any, typing.Any],
+) -> Callable[[], Coroutine[typing.Any, typing.Any, str]]:
+    async def read_items() -> str:
+        logger.info("received request")
 
-        formatted_response: list[str] = []
-        for item in data.root:
-            formatted = f"""Name: {item.name}
-Type: {item.type}
-Supplier: {item.supplier}
-Quantity: {item.inventory} kg
-Identifier: {item.id}
-"""
+        try:
+            compact = get_config().compact_output
+            formatted_response: list[str] = []
+            async for item in get_client().iter_items(spec):
+                formatted_response.append(spec.render_item.render(item, compact))
 
-            formatted_response.append(formatted)
+            return "---\n".join(formatted_response)
+        except Exception:
+            logger.exception("Error happened")
+            raise
 
-        return "---\n".join(formatted_response)
-    except Exception:
-        logger.exception("Error happened")
-        raise
+    return read_items
 
 
-@mcp.resource(
+FIRST_PAGE = "start"
+
+
+def encode_page_cursor(id: str) -> str:
+    return base64.urlsafe_b64encode(id.encode()).decode().rstrip("=")
+
+
+def decode_page_cursor(cursor: str) -> str | None:
+    """The id a page starts after, None for `FIRST_PAGE`."""
+    if cursor == FIRST_PAGE:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid page cursor: {cursor}") from e
+
+
+def category_page_resource(
+    spec: CategorySpec[typing.Any, typing.Any],
+) -> Callable[[str], Coroutine[typing.Any, typing.Any, str]]:
+    async def read_page(cursor: str) -> str:
+        logger.info("received request")
+
+        try:
+            config = get_config()
+            query_params = ListQueryParams(start_after=decode_page_cursor(cursor))
+            async with aclosing(get_client().iter_items(spec, query_params)) as items:
+                page, last = await render_page(
+                    items,
+                    spec.render_item,
+                    config.resource_page_bytes,
+                    config.compact_output,
+                )
+
+            if last is not None:
+                next_cursor = encode_page_cursor(last.id)
+                page += (
+                    f"---\nNext page: inventory://{spec.category}/page/{next_cursor}\n"
+                )
+
+            return page
+        except Exception:
+            logger.exception("Error happened")
+            raise
+
+    return read_page
+
+
+def category_detail_resource(
+    spec: CategorySpec[typing.Any, typing.Any],
+) -> Callable[[str], Coroutine[typing.Any, typing.Any, str]]:
+    async def read_item(identifier: str) -> str:
+        logger.info("received request")
+
+        try:
+            item = await get_client().get_detail(spec, identifier)
+            return spec.render_detail.render(item, get_config().compact_output)
+        except Exception:
+            logger.exception("Error happened")
+            raise
+
+    return read_item
+
+
+read_fermentables = mcp.resource(
+    uri="inventory://fermentables",
+    name="Fermentables",
+    description=FERMENTABLES.description,
+)(category_list_resource(FERMENTABLES))
+
+read_fermentables_page = mcp.resource(
+    uri="inventory://fermentables/page/{cursor}",
+    name="Fermentables page",
+    description=f"{FERMENTABLES.description} Paged, start with the `{FIRST_PAGE}` cursor.",
+)(category_page_resource(FERMENTABLES))
+
+read_fermentable_detail = mcp.resource(
     uri="inventory://fermentables/{identifier}",
     name="Fermentable detail",
     description="Detailed information of the fermentable item.",
-)
-async def read_fermentable_detail(identifier: str) -> str:
-    logger.info("received request")
+)(category_detail_resource(FERMENTABLES))
+
+read_hops = mcp.resource(
+    uri="inventory://hops",
+    name="Hops",
+    description=HOPS.description,
+)(category_list_resource(HOPS))
+
+read_hops_page = mcp.resource(
+    uri="inventory://hops/page/{cursor}",
+    name="Hops page",
+    description=f"{HOPS.description} Paged, start with the `{FIRST_PAGE}` cursor.",
+)(category_page_resource(HOPS))
+
+read_hops_detail = mcp.resource(
+    uri="inventory://hops/{identifier}",
+    name="Hop detail",
+    description="Detailed information of the hop item.",
+)(category_detail_resource(HOPS))
+
+read_miscs = mcp.resource(
+    uri="inventory://miscs",
+    name="Miscs",
+    description=MISCS.description,
+)(category_list_resource(MISCS))
+
+read_miscs_page = mcp.resource(
+    uri="inventory://miscs/page/{cursor}",
+    name="Miscs page",
+    description=f"{MISCS.description} Paged, start with the `{FIRST_PAGE}` cursor.",
+)(category_page_resource(MISCS))
+
+read_miscs_detail = mcp.resource(
+    uri="inventory://miscs/{identifier}",
+    name="Misc detail",
+    description="Detailed information of the miscellaneous item.",
+)(category_detail_resource(MISCS))
+
+read_yeasts = mcp.resource(
+    uri="inventory://yeasts",
+    name="Yeasts",
+    description=YEASTS.description,
+)(category_list_resource(YEASTS))
+
+read_yeasts_page = mcp.resource(
+    uri="inventory://yeasts/page/{cursor}",
+    name="Yeasts page",
+    description=f"{YEASTS.description} Paged, start with the `{FIRST_PAGE}` cursor.",
+)(category_page_resource(YEASTS))
+
+read_yeasts_detail = mcp.resource(
+    uri="inventory://yeasts/{identifier}",
+    name="Yeast detail",
+    description="Detailed information of the yeast item.",
+)(category_detail_resource(YEASTS))
+
+
+class SummaryProgress:
+    """Forwards the per-category item counts of a summary to the MCP client."""
+
+    def __init__(self, ctx: Context, titles: list[str]):
+        self._ctx = ctx
+        self._fetched = dict.fromkeys(titles, 0)
+        self._totals: dict[str, int | None] = dict.fromkeys(titles)
+
+    @property
+    def fetched(self) -> int:
+        return sum(self._fetched.values())
+
+    def callback(self, title: str) -> ProgressCallback:
+        async def on_progress(fetched: int, total: int | None) -> None:
+            self._fetched[title] = fetched
+            self._totals[title] = total
+            totals = list(self._totals.values())
+            overall = None if None in totals else sum(typing.cast(list[int], totals))
+            await self._ctx.report_progress(self.fetched, overall)
+
+        return on_progress
+
+
+def format_summary_section(title: str, rows: AnyDictList, compact: bool) -> str:
+    return f"{title}:\n\n{render_rows(rows, compact)}"
 
-    try:
-        item = await brewfather_client.get_fermentable_detail(identifier)
-
-        formatted_response = f"""Name: {item.name}
-Type: {item.type}
-Supplier: {item.supplier}
-Inventory: {item.inventory}
-Origin: {item.origin}
-Grain Category: {item.grain_category}
-Potential: {item.potential}
-Potential Percentage: {item.potential_percentage}
-Color: {item.color}
-Moisture: {item.moisture}
-Protein: {item.protein}
-Diastatic Power: {item.diastatic_power}
-Friability: {item.friability}
-Not Fermentable: {item.not_fermentable}
-Max In Batch: {item.max_in_batch}
-Coarse Fine Diff: {item.coarse_fine_diff}
-Percent Extract Fine-Ground Dry Basis (FGDB): {item.fgdb}
-Hidden: {item.hidden}
-Notes: {item.notes}
-User Notes: {item.user_notes}
-Used In: {item.used_in}
-Substitutes: {item.substitutes}
-Cost Per Amount: {item.cost_per_amount}
-Best Before Date: {item.best_before_date}
-Manufacturing Date: {item.manufacturing_date}
-Free Amino Nitrogen (FAN): {item.fan}
-Percent Coarse-Ground Dry Basic (CGDB): {item.cgdb}
-Acid: {item.acid}
-ID: {item.id}
-"""
-
-        return formatted_response
 
+@mcp.tool()
+async def inventory_summary(
+    stream_sections: bool = False, compact: bool | None = None
+) -> str:
+    """Overview of all the inventory (malts, grains, hops, miscs and yeasts).
+
+    Progress is reported as items are fetched. With `stream_sections` each
+    category section is also sent as a log message as soon as it is ready.
+    `compact` leaves out empty fields, BREWFATHER_COMPACT_OUTPUT by default.
+    """
+    if compact is None:
+        compact = get_config().compact_output
+    try:
+        ctx = mcp.get_context()
+        progress = SummaryProgress(ctx, [spec.title for spec in CATEGORIES])
+
+        async def summarize(
+            spec: CategorySpec[typing.Any, typing.Any],
+        ) -> tuple[str, AnyDictList]:
+            return spec.title, await get_category_summary(
+                get_client(), spec, progress.callback(spec.title)
+            )
+
+        sections: dict[str, str] = {}
+        items = 0
+        async with aclosing(
+            as_completed_bounded(len(CATEGORIES), summarize, CATEGORIES)
+        ) as completed:
+            async for title, rows in completed:
+                sections[title] = format_summary_section(title, rows, compact)
+                items += len(rows)
+                await ctx.info(f"{title}: {len(rows)} items ready")
+                if stream_sections:
+                    await ctx.info(sections[title])
+
+        await ctx.report_progress(items, items)
+        return "\n---\n".join(sections[spec.title] for spec in CATEGORIES)
     except Exception:
-        logger.exception("Error happened")
+        logger.exception("Failed to show inventory summary")
         raise
 
 
-@mcp.resource(uri="inventory://hops")
-async def read_hops() -> str:
-    logger.info("received request")
+@mcp.resource(
+    uri="inventory://overview",
+    name="Brewfather Inventory Overview",
+    description="Overview of all the inventory(malts, grains, hops, miscs and yeasts). Contains the same data as the PDF/Print export from the app.",
+)
+async def inventory_overview() -> str:
+    return await inventory_summary()
 
-    try:
-        data = await brewfather_client.get_hops_list()
 
-        formatted_response: list[str] = []
-        for item in data.root:
-            formatted = f"""Identifier: {item.id}
-Alpha Acids (A.A): {item.alpha}
-Quantity: {item.inventory} grams
-Name: {item.name}
-Type: {item.type}
-Use: {item.use}
-"""
+@mcp.tool()
+async def query_inventory(
+    category: InventoryCategory,
+    min_inventory: float | None = None,
+    max_inventory: float | None = None,
+    min_alpha: float | None = None,
+    max_alpha: float | None = None,
+    min_attenuation: float | None = None,
+    max_attenuation: float | None = None,
+    min_color: float | None = None,
+    max_color: float | None = None,
+    type: str | None = None,
+    origin: str | None = None,
+    in_stock_only: bool = False,
+    order_by: str | None = None,
+    descending: bool = False,
+    limit: int = 50,
+) -> str:
+    """Find inventory items of one category matching all the given filters.
+
+    Ranges are inclusive and only apply to categories with that field (alpha
+    for hops, attenuation for yeasts, color for fermentables). `type` is an
+    exact, case-insensitive match and `origin` a case-insensitive substring.
+    Results can be ordered by name, inventory, alpha, attenuation or color.
+    """
+    try:
+        spec = BY_CATEGORY[category]
+        bounds = {
+            "inventory": (min_inventory, max_inventory),
+            "alpha": (min_alpha, max_alpha),
+            "attenuation": (min_attenuation, max_attenuation),
+            "color": (min_color, max_color),
+        }
+        query = InventoryQuery(
+            spec=spec,
+            ranges=tuple(
+                Range(field, low, high)
+                for field, (low, high) in bounds.items()
+                if low is not None or high is not None
+            ),
+            type=type,
+            origin=origin,
+            in_stock=in_stock_only,
+            order_by=order_by,
+            descending=descending,
+            limit=limit,
+        )
+        items = await run_query(get_client(), query)
+        if not items:
+            return f"No matching {spec.title}"
+
+        compact = get_config().compact_output
+        rendered = "---\n".join(
+            spec.render_item.render(item, compact) for item in items
+        )
+        return f"{len(items)} matching {spec.title}:\n\n{rendered}"
+    except Exception:
+        logger.exception("Failed to query the inventory")
+        raise
 
-            formatted_response.append(formatted)
 
-        return "---\n".join(formatted_response)
+@mcp.tool()
+async def resolve_ingredient(
+    name: str, category: InventoryCategory | None = None, limit: int = 10
+) -> str:
+    """Find inventory items by approximate name, supplier or product ID.
+
+    Returns the best matches with their category and ID, to be used with the
+    detail resources (e.g. inventory://hops/{id}). Typos and partial names are
+    fine. `category` restricts the search to one category.
+    """
+    try:
+        specs = [BY_CATEGORY[category]] if category is not None else CATEGORIES
+        client = get_client()
+        _ = await gather_bounded(len(specs), client.index_names, specs)
+        matches = client.names.search(name, [spec.category for spec in specs], limit)
+        if not matches:
+            return f"No inventory items match {name!r}"
+
+        titles = {spec.category: spec.title for spec in CATEGORIES}
+        lines = [
+            f"{match.name} ({titles[match.category]}): ID {match.id}, "
+            f"{match.field} {match.value!r}, score {match.score:.2f}\n"
+            for match in matches
+        ]
+        return "".join(lines)
     except Exception:
-        logger.exception("Error happened")
+        logger.exception("Failed to resolve ingredient %r", name)
         raise
 
 
-@mcp.resource(uri="inventory://hops/{identifier}")
-async def read_hops_detail(identifier: str) -> str:
-    logger.info("received request")
+def format_expiring(expiring: list[ExpiringItem], days: int, compact: bool) -> str:
+    if not expiring:
+        return f"Nothing in stock expires in the next {days} days"
+
+    titles = {spec.category: spec.title for spec in CATEGORIES}
+    now = datetime.now()
+    rows: AnyDictList = []
+    for entry in expiring:
+        days_left = entry.days_left(now)
+        rows.append(
+            {
+                "Name": entry.item.name,
+                "Category": titles[entry.category],
+                "Best Before Date": entry.expires.date().isoformat(),
+                "Days Left": "expired" if days_left < 0 else days_left,
+                "Lot #": entry.item.lot_number,
+                "Inventory": entry.item.inventory,
+                "ID": entry.item.id,
+            }
+        )
+    return f"Expiring in the next {days} days:\n\n{render_rows(rows, compact)}"
+
 
+@mcp.tool()
+async def expiring_inventory(days: int | None = None) -> str:
+    """Items in stock whose best before date is within `days` days, soonest first.
+
+    `days` is BREWFATHER_EXPIRY_WINDOW_DAYS by default. Already expired items
+    are listed too. Answered from an index kept up to date by the inventory
+    syncs; only categories never synced are fetched.
+    """
+    if days is None:
+        days = get_config().expiry_window_days
     try:
-        item = await brewfather_client.get_hop_detail(identifier)
-
-        formatted = f"""Name: {item.name}
-Type: {item.type}
-Origin: {item.origin}
-Use: {item.use}
-Usage: {item.usage}
-Alpha Acid (% A.A): {item.alpha}
-Beta: {item.beta}
-Inventory: {item.inventory}
-Time: {item.time}
-IBU: {item.ibu}
-Oil: {item.oil}
-Myrcene: {item.myrcene}
-Caryophyllene: {item.caryophyllene}
-Humulene: {item.humulene}
-Cohumulone: {item.cohumulone}
-Farnesene: {item.farnesene}
-HSI: {item.hsi}
-Year: {item.year}
-Temp: {item.temp}
-Amount: {item.amount}
-Substitutes: {item.substitutes}
-Used In: {item.used_in}
-Notes: {item.notes}
-User Notes: {item.user_notes}
-Hidden: {item.hidden}
-Best Before Date: {item.best_before_date}
-Manufacturing Date: {item.manufacturing_date}
-Version: {item.version}
-ID: {item.id}
-"""
-        return formatted
-
-    except:
-        logger.exception("Error happened")
+        client = get_client()
+        missing = [spec for spec in CATEGORIES if spec.category not in client.expiry]
+        _ = await gather_bounded(len(CATEGORIES), client.get_detail_list, missing)
+        expiring = client.expiry.expiring(timedelta(days=days))
+        return format_expiring(expiring, days, get_config().compact_output)
+    except Exception:
+        logger.exception("Failed to list expiring inventory")
         raise
 
 
-@mcp.resource(uri="inventory://yeasts")
-async def read_yeasts() -> str:
-    logger.info("received request")
+@mcp.resource(
+    uri="inventory://expiring",
+    name="Expiring Inventory",
+    description="Items in stock expiring soon or already expired, soonest first.",
+)
+async def read_expiring_inventory() -> str:
+    return await expiring_inventory()
 
-    try:
-        data = await brewfather_client.get_yeasts_list()
-
-        formatted_response: list[str] = []
-        for item in data.root:
-            formatted = f"""Identifier: {item.id}
-Attenuation (%): {item.attenuation}
-Quantity: {item.inventory} packets
-Name: {item.name}
-Type: {item.type}
-"""
-
-            formatted_response.append(formatted)
-
-        return "---\n".join(formatted_response)
-    except:
-        logger.exception("Error happened")
-        raise
 
+@mcp.tool()
+async def inventory_stats() -> str:
+    """Totals and breakdowns of the inventory.
 
-@mcp.resource(uri="inventory://yeasts/{identifier}")
-async def read_yeasts_detail(identifier: str) -> str:
-    logger.info("received request")
+    Kilograms of base vs specialty malt and per grain category, grams of hops
+    per type and origin with the weighted average alpha acid, yeast packs per
+    laboratory, and the inventory value from the cost per amount of each item.
+    """
+    # NumPy is only imported once stats are asked for.
+    from brewfather_mcp.stats import category_stats, snapshot_for
 
     try:
-        item = await brewfather_client.get_yeast_detail(identifier)
-
-        formatted = f"""Name: {item.name}
-Type: {item.type}
-Form: {item.form}
-Laboratory: {item.laboratory}
-Product ID: {item.product_id}
-Inventory: {item.inventory}
-Amount: {item.amount}
-Unit: {item.unit}
-Attenuation: {item.attenuation}
-Min Attenuation: {item.min_attenuation}
-Max Attenuation: {item.max_attenuation}
-Flocculation: {item.flocculation}
-Min Temp: {item.min_temp}
-Max Temp: {item.max_temp}
-Max ABV: {item.max_abv}
-Cells Per Package: {item.cells_per_pkg}
-Age Rate: {item.age_rate}
-Ferments All: {item.ferments_all}
-Description: {item.description}
-User Notes: {item.user_notes}
-Hidden: {item.hidden}
-Best Before Date: {item.best_before_date}
-Manufacturing Date: {item.manufacturing_date}
-Timestamp: {item.timestamp.seconds}
-Created: {item.created.seconds}
-Version: {item.version}
-ID: {item.id}
-Rev: {item.rev}
-"""
-        return formatted
 
+        async def stats(
+            spec: CategorySpec[typing.Any, typing.Any],
+        ) -> dict[str, typing.Any]:
+            client = get_client()
+            items = await client.get_detail_list(spec)
+            return category_stats(spec, snapshot_for(client.snapshots, spec, items))
+
+        rows = await gather_bounded(len(CATEGORIES), stats, CATEGORIES)
+        sections = [
+            format_summary_section(spec.title, [row], get_config().compact_output)
+            for spec, row in zip(CATEGORIES, rows)
+        ]
+        total_value = sum(row["Value"] for row in rows)
+        return "\n---\n".join(sections) + f"\n---\nTotal value: {total_value:.2f}\n"
     except Exception:
-        logger.exception("Error happened")
+        logger.exception("Failed to compute inventory stats")
         raise
 
 
-@mcp.tool()
 @mcp.resource(
-    uri="inventory://overview",
-    name="Brewfather Inventory Overview",
-    description="Overview of all the inventory(malts, grains, hops and yeasts). Contains the same data as the PDF/Print export from the app.",
+    uri="inventory://stats",
+    name="Inventory Statistics",
+    description="Totals and breakdowns of the inventory: malts by grain category, hops by type and origin, yeasts by laboratory, and inventory value.",
 )
-async def inventory_summary() -> str:
-    try:
-        ctx = mcp.get_context()
-        fermentables_coro = get_fermentables_summary(brewfather_client)
-        hops_coro = get_hops_summary(brewfather_client)
-        yeasts_coro = get_yeast_summary(brewfather_client)
+async def read_inventory_stats() -> str:
+    return await inventory_stats()
+
 
-        result = await asyncio.gather(fermentables_coro, hops_coro, yeasts_coro)
-        await ctx.info("API data gathered")
+@mcp.resource(
+    uri="scheduler://status",
+    name="Background Refresh Schedule",
+    description="Next background refresh of each inventory category, its interval and the API requests spent on it.",
+)
+async def read_scheduler_status() -> str:
+    if refresh_scheduler is None:
+        return "Background refresh is disabled, set BREWFATHER_REFRESH_SCHEDULER=true to enable it."
+
+    stats = refresh_scheduler.stats()
+    titles = {spec.category: spec.title for spec in CATEGORIES}
+    rows: AnyDictList = [
+        {
+            "Category": titles[schedule.category],
+            "Next run in": f"{schedule.next_run_in:.0f}s",
+            "Interval": f"{schedule.interval:.0f}s",
+            "Runs": schedule.runs,
+            "Requests": schedule.requests,
+            "Changed last run": schedule.last_changed,
+        }
+        for schedule in stats.categories
+    ]
+    return (
+        f"Requests spent: {stats.requests} ({stats.requests_per_hour:.1f}/hour)\n"
+        f"Deferred runs: {stats.deferrals}\n\n{render_rows(rows, get_config().compact_output)}"
+    )
 
-        fermentables, hops, yeasts = result
 
-        response = "Fermentables:\n\n"
-        for fermentable in fermentables:
-            for k, v in fermentable.items():
-                response += f"{k}: {v}\n"
-            response += "\n"
+def format_latencies(histogram: Histogram, labels: tuple[str, ...]) -> dict[str, str]:
+    p50, p95 = histogram.quantile(0.5, *labels), histogram.quantile(0.95, *labels)
+    if p50 is None or p95 is None:
+        return {}
 
-        response += "\n---\n"
+    return {"p50": f"{p50 * 1000:.1f} ms", "p95": f"{p95 * 1000:.1f} ms"}
 
-        response += "Hops:\n\n"
-        for hop in hops:
-            for k, v in hop.items():
-                response += f"{k}: {v}\n"
 
-        response += "\n---\n"
+def client_rows(clients: dict[str, "BrewfatherInventoryClient"]) -> AnyDictList:
+    return [
+        {
+            "Tenant": tenant or "default",
+            "Cache hit ratio": f"{client.cache.stats().hit_ratio:.0%}",
+            "Cached": f"{client.cache.stats().size_bytes / 1024:.0f} KiB",
+            "In flight": client.requests_in_flight,
+            "Coalesced": f"{client.single_flight.stats().dedupe_ratio:.0%}",
+            "Quota left": f"{client.rate_limiter.tokens:.0f}",
+        }
+        for tenant, client in clients.items()
+    ]
 
-        response += "Yeasts:\n\n"
-        for yeast in yeasts:
-            for k, v in yeast.items():
-                response += f"{k}: {v}\n"
-            response += "\n"
 
-        await ctx.report_progress(100, 100)
-        return response
-    except Exception:
-        logger.exception("Failed to show inventory summary")
-        raise
+@mcp.resource(
+    uri="metrics://server",
+    name="Server Metrics",
+    description="Latency and outcome of tool calls, resource reads and Brewfather API requests, with the cache hit ratio, share of coalesced reads and quota left per client. Tenants only see their own client.",
+)
+async def read_server_metrics() -> str:
+    clients = open_clients()
+    if (tenants := get_tenants()) is not None:
+        # The server wide tables mix the traffic of every tenant, so a tenant
+        # only gets the row of its own client. /metrics has the rest.
+        tenant = current_tenant.get()
+        clients = {
+            name: client for name, client in tenants.clients().items() if name == tenant
+        }
+        return format_summary_section(
+            "Clients", client_rows(clients), get_config().compact_output
+        )
+
+    handlers: dict[tuple[str, ...], dict[str, float]] = {}
+    for (kind, name, status), count in HANDLER_CALLS.values.items():
+        handlers.setdefault((kind, name), {})[status] = count
+    handler_rows: AnyDictList = [
+        {
+            "Handler": f"{kind} {name}",
+            "Calls": int(sum(counts.values())),
+            "Errors": int(counts.get("error", 0)),
+            **format_latencies(HANDLER_SECONDS, (kind, name)),
+        }
+        for (kind, name), counts in sorted(handlers.items())
+    ]
+
+    endpoints: dict[str, dict[str, float]] = {}
+    for (endpoint, status), count in API_REQUESTS.values.items():
+        endpoints.setdefault(endpoint, {})[status] = count
+    endpoint_rows: AnyDictList = [
+        {
+            "Endpoint": endpoint,
+            "Requests": int(sum(counts.values())),
+            "Errors": int(
+                sum(n for status, n in counts.items() if not status.startswith("2"))
+            ),
+            **format_latencies(API_REQUEST_SECONDS, (endpoint,)),
+        }
+        for endpoint, counts in sorted(endpoints.items())
+    ]
+
+    sections = (
+        ("Tool calls and resource reads", handler_rows),
+        ("Brewfather API", endpoint_rows),
+        ("Clients", client_rows(clients)),
+    )
+    return "\n---\n".join(
+        format_summary_section(title, rows, get_config().compact_output)
+        for title, rows in sections
+        if rows
+    )
+
+
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    # The series name every tenant, which no tenant should learn about.
+    if get_tenants() is not None:
+        expected = get_config().metrics_token
+        token = bearer_token(request.headers)
+        if expected is None or not hmac.compare_digest(
+            expected.encode(), token.encode()
+        ):
+            return invalid_token()
+
+    return PlainTextResponse(
+        REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+def configure_logging(config: ServerConfig) -> None:
+    listener = configure_queue_logging(
+        output_handler(
+            config.log_file,
+            config.log_max_bytes,
+            config.log_backups,
+            config.log_rotate_when,
+        ),
+        level=config.log_level,
+        json_format=config.log_json,
+        queue_size=config.log_queue_size,
+    )
+    # Write out what is still queued when the server stops.
+    _ = atexit.register(listener.stop)
+
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+
+def http_app(transport: str) -> "Starlette":
+    """ASGI app serving MCP over HTTP, one session per client connection."""
+    if transport == "sse":
+        app = mcp.sse_app()
+    else:
+        # Only in newer releases of the mcp package.
+        streamable_http_app = getattr(mcp, "streamable_http_app", None)
+        if transport != "streamable-http" or streamable_http_app is None:
+            raise ValueError(f"Transport {transport!r} is not available, use sse")
+        app = streamable_http_app()
+
+    exempt_paths = [mcp.settings.message_path]
+    metrics_path = get_config().metrics_path
+    if metrics_path:
+        app.router.routes.append(Route(metrics_path, prometheus_metrics))
+        exempt_paths.append(metrics_path)
+
+    if (tenants := get_tenants()) is not None:
+        app.add_middleware(
+            TenantMiddleware, registry=tenants, exempt_paths=tuple(exempt_paths)
+        )
+
+    return app
+
+
+async def serve_http(transport: str, host: str, port: int) -> None:
+    import uvicorn
+
+    config = uvicorn.Config(
+        http_app(transport),
+        host=host,
+        port=port,
+        log_level=mcp.settings.log_level.lower(),
+        # Leave uvicorn's loggers to the root logger and its queue.
+        log_config=None,
+        # SSE streams stay open until the client goes away, don't wait on
+        # them forever on shutdown.
+        timeout_graceful_shutdown=5,
+    )
+    # Hold a session open so the shared client and scheduler outlive the
+    # client connections coming and going.
+    async with lifespan(mcp):
+        await uvicorn.Server(config).serve()
+
+
+def configure_tracing(config: ServerConfig) -> None:
+    exporters: list[SpanExporter] = []
+    if config.trace_file is not None:
+        exporters.append(JsonlExporter(config.trace_file))
+    if config.trace_otlp_endpoint is not None:
+        exporters.append(OtlpExporter(config.trace_otlp_endpoint))
+
+    if exporters:
+        tracer = Tracer(exporters, sample_rate=config.trace_sample_rate)
+        _ = set_tracer(tracer)
+        # Export what is still queued when the server stops.
+        _ = atexit.register(tracer.shutdown)
+
+
+def main() -> None:
+    """Run the server over stdio, or over HTTP for many clients at once."""
+    config = get_config()
+    parser = argparse.ArgumentParser(prog="brewfather-mcp")
+    _ = parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=os.getenv("BREWFATHER_TRANSPORT", "stdio"),
+    )
+    _ = parser.add_argument(
+        "--host", default=os.getenv("BREWFATHER_HTTP_HOST", "127.0.0.1")
+    )
+    _ = parser.add_argument(
+        "--port", type=int, default=env_int("BREWFATHER_HTTP_PORT", 8000)
+    )
+    args = parser.parse_args()
+
+    configure_logging(config)
+    configure_tracing(config)
+    if args.transport == "stdio":
+        mcp.run()
+    else:
+        anyio.run(serve_http, args.transport, args.host, args.port)
@@ -0,0 +1,74 @@
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from brewfather_mcp.ratelimit import SharedPolicy, policy_override, rate_limit_policy
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    calls: int
+    deduplicated: int
+    in_flight: int
+
+    @property
+    def dedupe_ratio(self) -> float:
+        return self.deduplicated / self.calls if self.calls else 0.0
+
+
+@dataclass(frozen=True)
+class _Flight:
+    task: asyncio.Task[Any]
+    policy: SharedPolicy
+
+
+class SingleFlight:
+    """Coalesces concurrent calls sharing a key into a single execution.
+
+    The first caller for a key starts the call in its own task, later callers
+    for the same key await that task and get the same result (or exception).
+    A caller being cancelled doesn't cancel the call for the others.
+
+    The call runs under a `SharedPolicy` of its callers, so one that would
+    wait for the rate limit isn't failed by a fail-fast caller having
+    started the call, nor the other way round.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, _Flight] = {}
+        self._calls = 0
+        self._deduplicated = 0
+
+    async def do[TReturn](
+        self,
+        key: Hashable,
+        async_fn: Callable[[], Coroutine[Any, Any, TReturn]],
+    ) -> TReturn:
+        self._calls += 1
+        flight = self._in_flight.get(key)
+        if flight is None:
+            policy = SharedPolicy()
+            with rate_limit_policy(policy):
+                task = asyncio.create_task(async_fn())
+            flight = self._in_flight[key] = _Flight(task, policy)
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self._deduplicated += 1
+
+        with flight.policy.caller(policy_override()):
+            return await asyncio.shield(flight.task)
+
+    async def aclose(self) -> None:
+        """Cancel every call still in flight."""
+        tasks = [flight.task for flight in self._in_flight.values()]
+        for task in tasks:
+            _ = task.cancel()
+        _ = await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(
+            calls=self._calls,
+            deduplicated=self._deduplicated,
+            in_flight=len(self._in_flight),
+        )
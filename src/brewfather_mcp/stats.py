@@ -0,0 +1,165 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from brewfather_mcp.categories import FERMENTABLES, HOPS, MISCS, YEASTS, CategorySpec
+from brewfather_mcp.types import InventoryCategory, InventoryItem
+
+UNKNOWN = "Unknown"
+
+type FloatArray = npt.NDArray[np.float64]
+
+
+class ColumnarSnapshot:
+    """Fields of a detail list laid out as NumPy columns.
+
+    Numeric fields are float arrays with NaN where a value is missing, text
+    fields are integer codes into the sorted table of their distinct values.
+    The items are read once when the snapshot is built; every aggregate after
+    that is a vectorized operation over the columns.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[InventoryItem],
+        numeric: Iterable[str],
+        labels: Iterable[str] = (),
+    ):
+        self.items = items
+        self.size = len(items)
+        self.numbers: dict[str, FloatArray] = {
+            field: np.fromiter(
+                (_number(getattr(item, field, None)) for item in items),
+                dtype=np.float64,
+                count=self.size,
+            )
+            for field in numeric
+        }
+        self.labels: dict[str, tuple[npt.NDArray[np.str_], npt.NDArray[np.intp]]] = {}
+        for field in labels:
+            values = np.array(
+                [_label(getattr(item, field, None)) for item in items] or [""],
+                dtype=np.str_,
+            )
+            names, codes = np.unique(values, return_inverse=True)
+            self.labels[field] = (names, codes[: self.size])
+
+    def total(self, field: str) -> float:
+        return float(np.nansum(self.numbers[field]))
+
+    def product_total(self, field: str, other: str) -> float:
+        """Sum of `field * other` over the items having both."""
+        return float(np.nansum(self.numbers[field] * self.numbers[other]))
+
+    def sum_by(self, label: str, field: str) -> dict[str, float]:
+        """Total of `field` per distinct `label`, largest first."""
+        names, codes = self.labels[label]
+        sums = np.bincount(
+            codes, weights=np.nan_to_num(self.numbers[field]), minlength=len(names)
+        )
+        order = np.argsort(-sums, kind="stable")
+        return {str(names[i]): float(sums[i]) for i in order if sums[i]}
+
+    def weighted_mean(self, field: str, weight: str) -> float | None:
+        values = self.numbers[field]
+        weights = np.nan_to_num(self.numbers[weight])
+        mask = ~np.isnan(values) & (weights > 0)
+        if not mask.any():
+            return None
+
+        return float(np.average(values[mask], weights=weights[mask]))
+
+
+def _number(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _label(value: Any) -> str:
+    if value is None:
+        return UNKNOWN
+
+    return str(value).strip() or UNKNOWN
+
+
+# Columns read per category to compute its statistics.
+_COLUMNS: dict[InventoryCategory, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    FERMENTABLES.category: (("inventory", "cost_per_amount"), ("grain_category",)),
+    HOPS.category: (("inventory", "alpha", "cost_per_amount"), ("type", "origin")),
+    MISCS.category: (("inventory", "cost_per_amount"), ("unit",)),
+    YEASTS.category: (("inventory", "cost_per_amount"), ("laboratory",)),
+}
+
+
+def snapshot_for(
+    snapshots: dict[InventoryCategory, ColumnarSnapshot],
+    spec: CategorySpec[Any, Any],
+    items: Sequence[InventoryItem],
+) -> ColumnarSnapshot:
+    """Snapshot of `items` from `snapshots`, rebuilt when the list changed."""
+    snapshot = snapshots.get(spec.category)
+    if snapshot is None or snapshot.items is not items:
+        numeric, labels = _COLUMNS[spec.category]
+        snapshot = snapshots[spec.category] = ColumnarSnapshot(items, numeric, labels)
+
+    return snapshot
+
+
+def _breakdown(sums: dict[str, float], unit: str) -> str:
+    return ", ".join(f"{name} {amount:g} {unit}" for name, amount in sums.items())
+
+
+def category_stats(
+    spec: CategorySpec[Any, Any], snapshot: ColumnarSnapshot
+) -> dict[str, Any]:
+    """Totals and breakdowns of one category, as a row of labelled values."""
+    value = snapshot.product_total("inventory", "cost_per_amount")
+    match spec.category:
+        case InventoryCategory.FERMENTABLES:
+            by_category = snapshot.sum_by("grain_category", "inventory")
+            base = sum(
+                amount
+                for name, amount in by_category.items()
+                if name.casefold() == "base"
+            )
+            # Any other grain category is a specialty malt, items without
+            # one (sugars, extracts) are neither.
+            specialty = sum(by_category.values()) - base - by_category.get(UNKNOWN, 0)
+            row = {
+                "Items": snapshot.size,
+                "Total": f"{snapshot.total('inventory'):g} kg",
+                "Base malt": f"{base:g} kg",
+                "Specialty malt": f"{specialty:g} kg",
+                "By grain category": _breakdown(by_category, "kg"),
+            }
+        case InventoryCategory.HOPS:
+            alpha = snapshot.weighted_mean("alpha", "inventory")
+            row = {
+                "Items": snapshot.size,
+                "Total": f"{snapshot.total('inventory'):g} grams",
+                "By type": _breakdown(snapshot.sum_by("type", "inventory"), "g"),
+                "By origin": _breakdown(snapshot.sum_by("origin", "inventory"), "g"),
+                "Weighted average alpha acid": (
+                    f"{alpha:.2f}%" if alpha is not None else None
+                ),
+            }
+        case InventoryCategory.YEASTS:
+            row = {
+                "Items": snapshot.size,
+                "Total": f"{snapshot.total('inventory'):g} pkg",
+                "By laboratory": _breakdown(
+                    snapshot.sum_by("laboratory", "inventory"), "pkg"
+                ),
+            }
+        case _:
+            row = {
+                "Items": snapshot.size,
+                "By unit": ", ".join(
+                    f"{amount:g} {unit}"
+                    for unit, amount in snapshot.sum_by("unit", "inventory").items()
+                ),
+            }
+
+    row["Value"] = round(value, 2)
+    return row
@@ -0,0 +1,212 @@
+import asyncio
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from brewfather_mcp.types import InventoryCategory, InventoryDetail
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    category TEXT NOT NULL,
+    id TEXT NOT NULL,
+    rev TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (category, id)
+);
+CREATE TABLE IF NOT EXISTS categories (
+    category TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Columns added after the first release of the schema.
+_CATEGORY_COLUMNS = {
+    "watermark": "INTEGER NOT NULL DEFAULT 0",
+    "reconciled_at": "REAL",
+}
+
+
+@dataclass(frozen=True)
+class StoredCategory[TDetail: InventoryDetail]:
+    items: list[TDetail]
+    fetched_at: float
+    size: int
+    watermark: int = 0
+    reconciled_at: float | None = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the category was last fetched from the API."""
+        return time.time() - self.fetched_at
+
+
+class InventoryStore:
+    """SQLite-backed store of the parsed `*Detail` records of each category.
+
+    Rows are keyed by category and id and carry the document `_rev`, so a
+    save only rewrites the items that changed. Blocking SQLite calls run in a
+    worker thread to keep the event loop free.
+    """
+
+    path: Path
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            _ = connection.execute("PRAGMA journal_mode=WAL")
+            _ = connection.executescript(_SCHEMA)
+
+            existing = {
+                row[1] for row in connection.execute("PRAGMA table_info(categories)")
+            }
+            for column, definition in _CATEGORY_COLUMNS.items():
+                if column not in existing:
+                    _ = connection.execute(
+                        f"ALTER TABLE categories ADD COLUMN {column} {definition}"
+                    )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    async def load[TDetail: InventoryDetail](
+        self, category: InventoryCategory, detail_model: type[TDetail]
+    ) -> StoredCategory[TDetail] | None:
+        """Stored items of `category`, or None if it was never saved."""
+        return await asyncio.to_thread(self._load, category, detail_model)
+
+    def _load[TDetail: InventoryDetail](
+        self, category: InventoryCategory, detail_model: type[TDetail]
+    ) -> StoredCategory[TDetail] | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                """
+                SELECT fetched_at, watermark, reconciled_at
+                FROM categories WHERE category = ?
+                """,
+                (category,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            rows = connection.execute(
+                "SELECT payload FROM items WHERE category = ? ORDER BY id",
+                (category,),
+            ).fetchall()
+
+        fetched_at, watermark, reconciled_at = row
+        return StoredCategory(
+            items=[detail_model.model_validate_json(payload) for (payload,) in rows],
+            fetched_at=fetched_at,
+            size=sum(len(payload) for (payload,) in rows),
+            watermark=watermark,
+            reconciled_at=reconciled_at,
+        )
+
+    async def save(
+        self,
+        category: InventoryCategory,
+        items: Sequence[InventoryDetail],
+        watermark: int = 0,
+    ) -> None:
+        """Replace the stored items of `category` with a fresh full fetch."""
+        now = time.time()
+        await asyncio.to_thread(
+            self._write,
+            category,
+            self._rows(category, items),
+            None,
+            (now, watermark, now),
+        )
+
+    async def apply_changes(
+        self,
+        category: InventoryCategory,
+        changed: Sequence[InventoryDetail],
+        deleted_ids: Iterable[str],
+        watermark: int,
+        reconciled: bool = False,
+    ) -> None:
+        """Upsert `changed` and drop `deleted_ids`, keeping the other items."""
+        now = time.time()
+        await asyncio.to_thread(
+            self._write,
+            category,
+            self._rows(category, changed),
+            list(deleted_ids),
+            (now, watermark, now if reconciled else None),
+        )
+
+    @staticmethod
+    def _rows(
+        category: InventoryCategory, items: Sequence[InventoryDetail]
+    ) -> list[tuple[str, str, str, str]]:
+        return [
+            (
+                category,
+                item.id,
+                item.rev,
+                item.model_dump_json(by_alias=True),
+            )
+            for item in items
+        ]
+
+    def _write(
+        self,
+        category: InventoryCategory,
+        rows: list[tuple[str, str, str, str]],
+        deleted_ids: list[str] | None,
+        state: tuple[float, int, float | None],
+    ) -> None:
+        """Upsert `rows`, then delete `deleted_ids` or, when None, every other row."""
+        with self._connect() as connection:
+            _ = connection.executemany(
+                """
+                INSERT INTO items (category, id, rev, payload) VALUES (?, ?, ?, ?)
+                ON CONFLICT (category, id) DO UPDATE
+                SET rev = excluded.rev, payload = excluded.payload
+                WHERE items.rev != excluded.rev
+                """,
+                rows,
+            )
+
+            if deleted_ids is None:
+                _ = connection.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS saved_ids (id TEXT PRIMARY KEY)"
+                )
+                _ = connection.execute("DELETE FROM saved_ids")
+                _ = connection.executemany(
+                    "INSERT OR IGNORE INTO saved_ids (id) VALUES (?)",
+                    [(row[1],) for row in rows],
+                )
+                _ = connection.execute(
+                    "DELETE FROM items WHERE category = ? AND id NOT IN (SELECT id FROM saved_ids)",
+                    (category,),
+                )
+            else:
+                _ = connection.executemany(
+                    "DELETE FROM items WHERE category = ? AND id = ?",
+                    [(category, id) for id in deleted_ids],
+                )
+
+            fetched_at, watermark, reconciled_at = state
+            _ = connection.execute(
+                """
+                INSERT INTO categories (category, fetched_at, watermark, reconciled_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (category) DO UPDATE SET
+                    fetched_at = excluded.fetched_at,
+                    watermark = excluded.watermark,
+                    reconciled_at = coalesce(excluded.reconciled_at, reconciled_at)
+                """,
+                (category, fetched_at, watermark, reconciled_at),
+            )
@@ -0,0 +1,404 @@
+import asyncio
+import logging
+import math
+import time
+import typing
+from collections import defaultdict
+from collections.abc import Callable, Collection, Coroutine, Sequence
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from enum import StrEnum, auto
+
+from brewfather_mcp.cache import EndpointKind
+from brewfather_mcp.tracing import span
+from brewfather_mcp.types import (
+    InventoryCategory,
+    InventoryDetail,
+    InventoryItem,
+    ListQueryParams,
+    OrderByDirection,
+)
+
+if typing.TYPE_CHECKING:
+    from brewfather_mcp.api import BrewfatherInventoryClient
+
+logger = logging.getLogger(__name__)
+
+type DetailGetter[TDetail] = Callable[[str], Coroutine[typing.Any, typing.Any, TDetail]]
+# Called with the items fetched so far and the expected total, if known.
+type ProgressCallback = Callable[
+    [int, int | None], Coroutine[typing.Any, typing.Any, None]
+]
+# Called with a category, the items added or changed in its replica and the
+# ids dropped from it.
+type ChangeListener = Callable[
+    [InventoryCategory, Sequence[InventoryItem], Collection[str]], None
+]
+# Called with a category and every item of it, once the replica holds all of
+# them.
+type RefreshListener = Callable[[InventoryCategory, Sequence[InventoryItem]], None]
+
+
+def _overlapping_cursor(page: list[dict[str, typing.Any]]) -> str:
+    """Start the next page of a descending `_timestamp_ms` listing at the oldest
+    timestamp of `page`, inclusive."""
+    return str(page[-1]["_timestamp_ms"] + 1)
+
+
+@dataclass
+class CategoryReplica[TDetail: InventoryDetail]:
+    """Local copy of one inventory category."""
+
+    items: dict[str, TDetail] = field(default_factory=dict)
+    # Highest `_timestamp_ms` seen, changes are pulled from there on.
+    watermark: int = 0
+    synced_at: float | None = None
+    reconciled_at: float | None = None
+    # Average payload bytes of an item, used to size cache entries.
+    item_size: int = 0
+    # `items` sorted by id, rebuilt after each sync.
+    ordered: list[TDetail] = field(default_factory=list)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last sync, infinite if never synced."""
+        if self.synced_at is None:
+            return math.inf
+
+        return time.time() - self.synced_at
+
+    def refresh_order(self) -> None:
+        self.ordered = [self.items[id] for id in sorted(self.items)]
+
+
+class SyncMode(StrEnum):
+    FULL = auto()
+    DELTA = auto()
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    category: InventoryCategory
+    mode: SyncMode
+    requests: int
+    changed: int
+    deleted: int
+
+
+class InventorySync:
+    """Keeps a replica of each inventory category in sync with the API.
+
+    Once a category has been fully fetched, a sync only pulls the documents
+    changed since the replica's watermark: the list endpoint is read ordered
+    by `_timestamp_ms` descending and paging stops at the first document older
+    than the watermark, so an unchanged category costs a single request.
+
+    Deletions don't bump any timestamp, so every `reconcile_interval` seconds
+    the ids of the category are listed as well. Deleted ids are dropped from
+    the replica; ids the replica has never seen (drift) trigger a full
+    refresh, as does a delta that spans more than `max_delta_pages` pages.
+
+    Listeners added with `subscribe` are told about every change applied to
+    a replica, including the items it's seeded with from the store, so
+    indexes over the inventory can be kept up to date incrementally.
+    """
+
+    def __init__(
+        self,
+        client: "BrewfatherInventoryClient",
+        reconcile_interval: float,
+        max_delta_pages: int,
+    ):
+        self._client = client
+        self.reconcile_interval = reconcile_interval
+        self.max_delta_pages = max_delta_pages
+        self._replicas: dict[InventoryCategory, CategoryReplica[typing.Any]] = {}
+        self._load_locks: defaultdict[InventoryCategory, asyncio.Lock] = defaultdict(
+            asyncio.Lock
+        )
+        self._sync_locks: defaultdict[InventoryCategory, asyncio.Lock] = defaultdict(
+            asyncio.Lock
+        )
+        self.last_results: dict[InventoryCategory, SyncResult] = {}
+        self._listeners: list[tuple[ChangeListener, RefreshListener | None]] = []
+
+    def subscribe(
+        self, listener: ChangeListener, on_refresh: RefreshListener | None = None
+    ) -> None:
+        """Follow the changes applied to the replicas.
+
+        When the replica of a category is loaded or fully refreshed,
+        `on_refresh` is called instead of `listener` with every item of the
+        category. The deletions passed to `listener` are only those of the
+        replica, so subscribers holding items it never had, e.g. read from
+        the list endpoint, need `on_refresh` to drop them.
+        """
+        self._listeners.append((listener, on_refresh))
+
+    def _notify(
+        self,
+        category: InventoryCategory,
+        changed: Sequence[InventoryItem],
+        deleted: Collection[str],
+        complete: bool = False,
+    ) -> None:
+        """`complete` tells `changed` holds every item of `category`."""
+        for listener, on_refresh in self._listeners:
+            if complete and on_refresh is not None:
+                on_refresh(category, changed)
+            else:
+                listener(category, changed, deleted)
+
+    async def replica[TDetail: InventoryDetail](
+        self, category: InventoryCategory, detail_model: type[TDetail]
+    ) -> CategoryReplica[TDetail]:
+        """Replica of `category`, seeded from the on-disk store on first use."""
+        async with self._load_locks[category]:
+            replica = self._replicas.get(category)
+            if replica is not None:
+                return replica
+
+            replica = CategoryReplica[TDetail]()
+            store = self._client.store
+            if store is not None:
+                stored = await store.load(category, detail_model)
+                if stored is not None:
+                    replica = CategoryReplica(
+                        items={item.id: item for item in stored.items},
+                        watermark=stored.watermark,
+                        synced_at=stored.fetched_at,
+                        reconciled_at=stored.reconciled_at,
+                        item_size=stored.size // max(len(stored.items), 1),
+                    )
+                    replica.refresh_order()
+                    self._notify(category, stored.items, (), complete=True)
+
+            self._replicas[category] = replica
+            return replica
+
+    async def sync[TDetail: InventoryDetail](
+        self,
+        category: InventoryCategory,
+        detail_model: type[TDetail],
+        get_detail: DetailGetter[TDetail],
+        on_progress: ProgressCallback | None = None,
+    ) -> SyncResult:
+        """Bring the replica of `category` up to date.
+
+        `on_progress` is awaited as pages of a full refresh are parsed and
+        once more when the sync is done.
+        """
+        with span("sync", category=category) as current:
+            async with self._sync_locks[category]:
+                replica = await self.replica(category, detail_model)
+
+                result: SyncResult | None = None
+                if replica.synced_at is not None and replica.watermark:
+                    result = await self._delta(
+                        category, detail_model, get_detail, replica
+                    )
+
+                    reconcile_age = time.time() - (replica.reconciled_at or 0)
+                    if result is not None and reconcile_age > self.reconcile_interval:
+                        result = await self._reconcile(category, replica, result)
+
+                if result is None:
+                    result = await self._full(
+                        category, detail_model, get_detail, replica, on_progress
+                    )
+
+                replica.refresh_order()
+                self._client.cache.set(
+                    category,
+                    EndpointKind.LIST,
+                    "complete",
+                    replica.ordered,
+                    replica.item_size * len(replica.items),
+                )
+
+            if on_progress is not None:
+                await on_progress(len(replica.ordered), len(replica.ordered))
+
+            logger.info(
+                "Synced %s (%s): %d requests, %d changed, %d deleted",
+                category,
+                result.mode,
+                result.requests,
+                result.changed,
+                result.deleted,
+            )
+            current.set(
+                mode=result.mode,
+                requests=result.requests,
+                changed=result.changed,
+                deleted=result.deleted,
+            )
+            self.last_results[category] = result
+            return result
+
+    async def _full[TDetail: InventoryDetail](
+        self,
+        category: InventoryCategory,
+        detail_model: type[TDetail],
+        get_detail: DetailGetter[TDetail],
+        replica: CategoryReplica[TDetail],
+        on_progress: ProgressCallback | None,
+    ) -> SyncResult:
+        items: list[TDetail] = []
+        requests = 0
+        size = 0
+        async with aclosing(
+            self._client.iter_raw_pages(category, ListQueryParams(complete=True))
+        ) as pages:
+            async for page, page_size in pages:
+                requests += 1
+                size += page_size
+                items.extend(
+                    await self._client.parse_details(
+                        category,
+                        detail_model,
+                        get_detail,
+                        page,
+                        page_size // max(len(page), 1),
+                    )
+                )
+                if on_progress is not None:
+                    # The previous item count is the best guess of the total.
+                    expected = (
+                        max(len(replica.items), len(items)) if replica.items else None
+                    )
+                    await on_progress(len(items), expected)
+
+        deleted = replica.items.keys() - {item.id for item in items}
+        for id in deleted:
+            self._client.cache.delete(category, EndpointKind.DETAIL, id)
+
+        replica.items = {item.id: item for item in items}
+        replica.watermark = max((item.timestamp_ms for item in items), default=0)
+        replica.synced_at = replica.reconciled_at = time.time()
+        replica.item_size = size // max(len(items), 1)
+
+        if self._client.store is not None:
+            await self._client.store.save(category, items, replica.watermark)
+        self._notify(category, items, deleted, complete=True)
+
+        return SyncResult(category, SyncMode.FULL, requests, len(items), len(deleted))
+
+    async def _delta[TDetail: InventoryDetail](
+        self,
+        category: InventoryCategory,
+        detail_model: type[TDetail],
+        get_detail: DetailGetter[TDetail],
+        replica: CategoryReplica[TDetail],
+    ) -> SyncResult | None:
+        """Pull the documents changed since the watermark.
+
+        Returns None when the changes span too many pages, a full refresh is
+        cheaper then. Timestamps are not unique, so every page after the first
+        starts at the oldest timestamp of the previous one again and documents
+        sharing it across the page boundary are read twice instead of skipped.
+        """
+        from brewfather_mcp.api import MAX_PAGE_SIZE
+
+        query_params = ListQueryParams(
+            complete=True,
+            limit=MAX_PAGE_SIZE,
+            order_by="_timestamp_ms",
+            order_by_direction=OrderByDirection.DESCENDING,
+        )
+        changed_raw: dict[str, dict[str, typing.Any]] = {}
+        requests = 0
+        seen = 0
+        size = 0
+        async with aclosing(
+            self._client.iter_raw_pages(category, query_params, _overlapping_cursor)
+        ) as pages:
+            async for page, page_size in pages:
+                requests += 1
+                seen += len(page)
+                size += page_size
+                reached_watermark = False
+                for raw_item in page:
+                    if raw_item.get("_timestamp_ms", 0) < replica.watermark:
+                        reached_watermark = True
+                        break
+
+                    current = replica.items.get(raw_item["_id"])
+                    if current is None or current.rev != raw_item.get("_rev"):
+                        changed_raw[raw_item["_id"]] = raw_item
+
+                if reached_watermark:
+                    break
+
+                if len(page) == query_params.limit and page[0].get(
+                    "_timestamp_ms"
+                ) == page[-1].get("_timestamp_ms"):
+                    # The whole page shares one timestamp, the cursor can't
+                    # get past it.
+                    return None
+
+                if requests >= self.max_delta_pages:
+                    return None
+
+        changed = await self._client.parse_details(
+            category,
+            detail_model,
+            get_detail,
+            list(changed_raw.values()),
+            size // max(seen, 1),
+        )
+        for item in changed:
+            replica.items[item.id] = item
+            replica.watermark = max(replica.watermark, item.timestamp_ms)
+        replica.synced_at = time.time()
+
+        if self._client.store is not None:
+            await self._client.store.apply_changes(
+                category, changed, (), replica.watermark
+            )
+        self._notify(category, changed, ())
+
+        return SyncResult(category, SyncMode.DELTA, requests, len(changed), 0)
+
+    async def _reconcile(
+        self,
+        category: InventoryCategory,
+        replica: CategoryReplica[typing.Any],
+        delta: SyncResult,
+    ) -> SyncResult | None:
+        """Detect deletions by listing every id of the category.
+
+        Returns None when the API has ids the replica doesn't know about.
+        """
+        ids: set[str] = set()
+        requests = 0
+        async with aclosing(
+            self._client.iter_raw_pages(category, ListQueryParams())
+        ) as pages:
+            async for page, _ in pages:
+                requests += 1
+                ids.update(raw_item["_id"] for raw_item in page)
+
+        if ids - replica.items.keys():
+            logger.warning("Replica of %s drifted, doing a full refresh", category)
+            return None
+
+        deleted = replica.items.keys() - ids
+        for id in deleted:
+            del replica.items[id]
+            self._client.cache.delete(category, EndpointKind.DETAIL, id)
+        replica.reconciled_at = time.time()
+
+        if self._client.store is not None:
+            await self._client.store.apply_changes(
+                category, (), deleted, replica.watermark, reconciled=True
+            )
+        self._notify(category, (), deleted)
+
+        return SyncResult(
+            category,
+            delta.mode,
+            delta.requests + requests,
+            delta.changed,
+            len(deleted),
+        )
@@ -0,0 +1,257 @@
+import asyncio
+import hmac
+import json
+import logging
+from collections import Counter, OrderedDict
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from brewfather_mcp.config import ClientConfig
+
+if TYPE_CHECKING:
+    from brewfather_mcp.api import BrewfatherInventoryClient
+
+logger = logging.getLogger(__name__)
+
+TENANT_HEADER = "X-Brewfather-Tenant"
+TENANT_PARAM = "tenant"
+
+# Tenant of the request being served, None outside of a multi-tenant server.
+current_tenant: ContextVar[str | None] = ContextVar("current_tenant", default=None)
+
+
+@dataclass(frozen=True)
+class Credentials:
+    user_id: str
+    api_key: str
+    # Bearer token the clients of the tenant authenticate with.
+    token: str
+
+
+@dataclass(frozen=True)
+class TenantStats:
+    tenants: int
+    active: int
+    created: int
+    evictions: int
+
+    @property
+    def eviction_ratio(self) -> float:
+        return self.evictions / self.created if self.created else 0.0
+
+
+def load_credentials(path: str | Path) -> dict[str, Credentials]:
+    """Read `{"tenant": {"user_id": ..., "api_key": ..., "token": ...}}` from a
+    JSON file."""
+    with Path(path).expanduser().open() as file:
+        tenants = json.load(file)
+
+    credentials: dict[str, Credentials] = {}
+    for tenant, entry in tenants.items():
+        if not entry.get("token"):
+            raise ValueError(f"Tenant {tenant!r} has no token in {path}")
+        credentials[tenant] = Credentials(
+            entry["user_id"], entry["api_key"], entry["token"]
+        )
+
+    return credentials
+
+
+class TenantRegistry:
+    """One Brewfather client per tenant, created on first use.
+
+    Each tenant gets its own connection pool, cache, rate limit bucket and
+    indexes, so tenants never see each other's data or spend each other's
+    quota. At most `max_tenants` clients are kept, the least recently used
+    idle one is closed to make room for a new tenant. A client is idle when
+    nothing `hold`s its tenant and no request is in flight. The connection
+    and cache limits of `config` are totals, split evenly between the
+    `max_tenants` slots.
+    """
+
+    def __init__(
+        self,
+        credentials: Mapping[str, Credentials],
+        config: ClientConfig | None = None,
+        max_tenants: int = 8,
+    ):
+        self._credentials = dict(credentials)
+        self.max_tenants = max_tenants
+        config = config or ClientConfig.from_env()
+
+        def share(total: int) -> int:
+            return max(1, total // max_tenants)
+
+        self.config = replace(
+            config,
+            max_connections=share(config.max_connections),
+            max_keepalive_connections=share(config.max_keepalive_connections),
+            cache_max_entries=share(config.cache_max_entries),
+            cache_max_bytes=share(config.cache_max_bytes),
+        )
+        self._clients: OrderedDict[str, BrewfatherInventoryClient] = OrderedDict()
+        self._closing: set[asyncio.Task[None]] = set()
+        # Sessions and requests using each tenant's client.
+        self._holders: Counter[str] = Counter()
+        self._created = 0
+        self._evictions = 0
+
+    def __contains__(self, tenant: object) -> bool:
+        return tenant in self._credentials
+
+    def authenticate(self, tenant: str, token: str) -> bool:
+        """Whether `token` is the bearer token of `tenant`."""
+        credentials = self._credentials.get(tenant)
+        return credentials is not None and hmac.compare_digest(
+            credentials.token.encode(), token.encode()
+        )
+
+    def client(self, tenant: str) -> "BrewfatherInventoryClient":
+        client = self._clients.get(tenant)
+        if client is not None:
+            self._clients.move_to_end(tenant)
+            return client
+
+        from brewfather_mcp.api import BrewfatherInventoryClient
+
+        credentials = self._credentials[tenant]
+        config = self.config
+        if config.store_path is not None:
+            path = Path(config.store_path)
+            config = replace(
+                config, store_path=str(path.with_stem(f"{path.stem}-{tenant}"))
+            )
+
+        self._evict(self.max_tenants - 1)
+        if len(self._clients) >= self.max_tenants:
+            logger.warning(
+                "All %d tenant clients are busy, going over the limit", self.max_tenants
+            )
+
+        client = self._clients[tenant] = BrewfatherInventoryClient(
+            config, credentials.user_id, credentials.api_key
+        )
+        self._created += 1
+        return client
+
+    @contextmanager
+    def hold(self, tenant: str) -> Iterator[None]:
+        """Keep the client of `tenant` from being closed while in use.
+
+        Held for the life of an SSE session, whose tool calls may sit between
+        two API requests at any time. Once the last holder lets go, clients
+        beyond `max_tenants` are closed.
+        """
+        self._holders[tenant] += 1
+        try:
+            yield
+        finally:
+            self._holders[tenant] -= 1
+            if not self._holders[tenant]:
+                del self._holders[tenant]
+                self._evict(self.max_tenants)
+
+    def _evict(self, keep: int) -> None:
+        """Close idle clients, least recently used first, until `keep` are left."""
+        for tenant in list(self._clients):
+            if len(self._clients) <= keep:
+                return
+
+            client = self._clients[tenant]
+            if self._holders[tenant] or client.requests_in_flight:
+                continue
+
+            del self._clients[tenant]
+            self._evictions += 1
+            logger.info("Closing the client of idle tenant %s", tenant)
+            task = asyncio.create_task(client.aclose())
+            # Keep a reference until it's done, `aclose` waits for it.
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        _ = await asyncio.gather(
+            *self._closing,
+            *(client.aclose() for client in clients),
+            return_exceptions=True,
+        )
+
+    def clients(self) -> dict[str, "BrewfatherInventoryClient"]:
+        return dict(self._clients)
+
+    def stats(self) -> TenantStats:
+        return TenantStats(
+            tenants=len(self._credentials),
+            active=len(self._clients),
+            created=self._created,
+            evictions=self._evictions,
+        )
+
+
+def bearer_token(headers: Headers) -> str:
+    """Token of the `Authorization: Bearer` header, empty without one."""
+    scheme, _, token = headers.get("Authorization", "").partition(" ")
+    return token if scheme.lower() == "bearer" else ""
+
+
+def invalid_token() -> PlainTextResponse:
+    return PlainTextResponse(
+        "Invalid token", status_code=401, headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+class TenantMiddleware:
+    """Sets `current_tenant` from the tenant header or query parameter.
+
+    The request has to carry the tenant's token as `Authorization: Bearer`,
+    requests naming an unknown tenant or with a wrong token are refused.
+    Requests without a tenant are only let through under `exempt_paths`: the
+    SSE message endpoint, whose session was bound to a tenant when its stream
+    was opened, and the server wide metrics, which check a token of their own.
+    """
+
+    def __init__(
+        self, app: ASGIApp, registry: TenantRegistry, exempt_paths: tuple[str, ...]
+    ):
+        self.app = app
+        self.registry = registry
+        self.exempt_paths = exempt_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        tenant = headers.get(TENANT_HEADER) or QueryParams(scope["query_string"]).get(
+            TENANT_PARAM
+        )
+        if tenant is None and scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        if tenant not in self.registry:
+            response = PlainTextResponse("Unknown tenant", status_code=403)
+            await response(scope, receive, send)
+            return
+
+        if not self.registry.authenticate(tenant, bearer_token(headers)):
+            await invalid_token()(scope, receive, send)
+            return
+
+        token = current_tenant.set(tenant)
+        try:
+            with self.registry.hold(tenant):
+                await self.app(scope, receive, send)
+        finally:
+            current_tenant.reset(token)
@@ -0,0 +1,338 @@
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+type AttributeValue = str | int | float | bool
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    error: str | None = None
+    sampled: bool = True
+
+    def set(self, **attributes: AttributeValue | None) -> None:
+        """Add attributes, None values are left out."""
+        if self.sampled:
+            self.attributes.update(
+                (key, value) for key, value in attributes.items() if value is not None
+            )
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start_ns / 1e9,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+# Stands in for every span of a trace that wasn't sampled.
+_UNSAMPLED = Span("unsampled", "", "", None, 0, sampled=False)
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class _NoSpan:
+    def __enter__(self) -> Span:
+        return _UNSAMPLED
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+
+class JsonlExporter:
+    """Appends one JSON object per finished span to a file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self.path.open("a") as file:
+            _ = file.writelines(json.dumps(span.as_dict()) + "\n" for span in spans)
+
+
+def _otlp_value(value: AttributeValue) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpExporter:
+    """Posts spans to an OTLP/HTTP collector in the JSON encoding.
+
+    `endpoint` is the traces URL of the collector, e.g.
+    `http://localhost:4318/v1/traces` for a local OpenTelemetry Collector or
+    Jaeger.
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "brewfather-mcp"):
+        # Imported here, like the API client, to keep server startup light.
+        import httpx
+
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._http = httpx.Client(timeout=5.0)
+
+    def payload(self, spans: Sequence[Span]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": _otlp_value(self.service_name),
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "brewfather_mcp"},
+                            "spans": [
+                                {
+                                    "traceId": span.trace_id,
+                                    "spanId": span.span_id,
+                                    "parentSpanId": span.parent_id or "",
+                                    "name": span.name,
+                                    # SPAN_KIND_INTERNAL
+                                    "kind": 1,
+                                    "startTimeUnixNano": str(span.start_ns),
+                                    "endTimeUnixNano": str(span.end_ns),
+                                    "attributes": [
+                                        {"key": key, "value": _otlp_value(value)}
+                                        for key, value in span.attributes.items()
+                                    ],
+                                    # STATUS_CODE_ERROR or STATUS_CODE_UNSET
+                                    "status": (
+                                        {"code": 2, "message": span.error}
+                                        if span.error
+                                        else {}
+                                    ),
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export(self, spans: Sequence[Span]) -> None:
+        _ = self._http.post(self.endpoint, json=self.payload(spans)).raise_for_status()
+
+
+class BatchSpanProcessor:
+    """Hands finished spans to the exporters from a background thread.
+
+    Recording a span only puts it on a queue, so exporting never blocks the
+    event loop. Spans are exported in batches of up to `batch_size`, at
+    least every `interval` seconds. Past `max_queue` waiting spans new ones
+    are dropped.
+    """
+
+    def __init__(
+        self,
+        exporters: Sequence[SpanExporter],
+        batch_size: int = 256,
+        interval: float = 2.0,
+        max_queue: int = 8192,
+    ):
+        self.exporters = exporters
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue: queue.Queue[Span | threading.Event | None] = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        if self._queue.qsize() >= self.max_queue:
+            self.dropped += 1
+            return
+
+        self._queue.put_nowait(span)
+
+    def _run(self) -> None:
+        batch: list[Span] = []
+        exported_at = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.interval)
+            except queue.Empty:
+                self._export(batch)
+                batch = []
+                exported_at = time.monotonic()
+                continue
+
+            if isinstance(item, Span):
+                batch.append(item)
+                due = time.monotonic() - exported_at >= self.interval
+                if len(batch) < self.batch_size and not due:
+                    continue
+
+            self._export(batch)
+            batch = []
+            exported_at = time.monotonic()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _export(self, batch: list[Span]) -> None:
+        if not batch:
+            return
+
+        for exporter in self.exporters:
+            try:
+                exporter.export(batch)
+            except Exception:
+                logger.exception("Exporting %d spans failed", len(batch))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every span submitted so far is exported."""
+        done = threading.Event()
+        self._queue.put_nowait(done)
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._queue.put_nowait(None)
+        self._thread.join(timeout)
+
+
+class Tracer:
+    """Records spans when at least one exporter is configured.
+
+    Whether a trace is recorded is decided once at its root span, with
+    probability `sample_rate`, and every span below it follows. Spans below
+    an unsampled root, or of a tracer without exporters, cost a context
+    variable lookup.
+    """
+
+    def __init__(
+        self,
+        exporters: Sequence[SpanExporter] = (),
+        sample_rate: float = 1.0,
+        random: Callable[[], float] = random.random,
+    ):
+        self.sample_rate = sample_rate
+        self._random = random
+        self.processor = BatchSpanProcessor(exporters) if exporters else None
+
+    def span(
+        self, name: str, **attributes: AttributeValue | None
+    ) -> AbstractContextManager[Span]:
+        parent = _current_span.get()
+        if self.processor is None or (parent is not None and not parent.sampled):
+            return _NO_SPAN
+
+        return self._record(name, parent, attributes)
+
+    @contextmanager
+    def _record(
+        self,
+        name: str,
+        parent: Span | None,
+        attributes: dict[str, AttributeValue | None],
+    ) -> Iterator[Span]:
+        assert self.processor is not None
+        if parent is None and self._random() >= self.sample_rate:
+            # Children of an unsampled root find it and skip recording.
+            token = _current_span.set(_UNSAMPLED)
+            try:
+                yield _UNSAMPLED
+            finally:
+                _current_span.reset(token)
+            return
+
+        span = Span(
+            name=name,
+            trace_id=(
+                parent.trace_id
+                if parent is not None
+                else f"{random.getrandbits(128):032x}"
+            ),
+            span_id=f"{random.getrandbits(64):016x}",
+            parent_id=parent.span_id if parent is not None else None,
+            start_ns=time.time_ns(),
+        )
+        span.set(**attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self.processor.submit(span)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        return self.processor.flush(timeout) if self.processor is not None else True
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+
+
+_tracer = Tracer()
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Install `tracer` for every `span` call, returns the previous one."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def span(
+    name: str, **attributes: AttributeValue | None
+) -> AbstractContextManager[Span]:
+    """Span of the installed tracer, to be used as a context manager."""
+    return _tracer.span(name, **attributes)
+
+
+def current_span() -> Span | None:
+    """Innermost span being recorded, None outside of any."""
+    return _current_span.get()
@@ -1,9 +1,9 @@
 import urllib.parse
+from dataclasses import dataclass
 from datetime import datetime
 from enum import StrEnum, auto
 
 from pydantic import BaseModel, Field, RootModel, field_validator
-from pydantic.config import ConfigDict
 
 import brewfather_mcp.utils as utils
 
@@ -19,6 +19,13 @@ class InventoryItem(BaseModel):
     id: str = Field(alias="_id")
 
 
+class InventoryDetail(InventoryItem):
+    """Document fields every detail record carries, whatever its category."""
+
+    rev: str = Field(alias="_rev")
+    timestamp_ms: int = Field(alias="_timestamp_ms")
+
+
 class Fermentable(InventoryItem):
     """
     Represents a fermentable ingredient like malt or adjunct.
@@ -50,7 +57,7 @@ class Timestamp(BaseModel):
         return datetime.fromtimestamp(self.seconds + (self.nanoseconds / 1e9))
 
 
-class FermentableDetail(Fermentable):
+class FermentableDetail(Fermentable, InventoryDetail):
     """
     Comprehensive model for a brewing ingredient with detailed properties.
     """
@@ -60,7 +67,6 @@ class FermentableDetail(Fermentable):
     not_fermentable: bool | None = Field(alias="notFermentable", default=None)
     substitutes: str = ""
     potential: float
-    timestamp_ms: int = Field(alias="_timestamp_ms")
     percentage: float = 0
     grain_category: str | None = Field(alias="grainCategory", default=None)
     created: Timestamp = Field(alias="_created")
@@ -80,7 +86,6 @@ class FermentableDetail(Fermentable):
     notes: str | None = None
     ibu_per_amount: float | None = Field(alias="ibuPerAmount", default=None)
     friability: float | None = None
-    rev: str = Field(alias="_rev")
     excluded: bool = False
     timestamp: Timestamp = Field(alias="_timestamp")
     color: float = 0
@@ -124,7 +129,7 @@ class HopList(RootModel[list[Hop]]):
     pass
 
 
-class HopDetail(Hop):
+class HopDetail(Hop, InventoryDetail):
     """
     Extended hop model with all additional properties.
     """
@@ -136,7 +141,6 @@ class HopDetail(Hop):
     year: int | None = None
     usage: str | None = None
     origin: str | None = None
-    rev: str = Field(alias="_rev")
     oil: float | None = None
     timestamp: Timestamp = Field(alias="_timestamp")
     version: str = Field(alias="_version")
@@ -149,7 +153,6 @@ class HopDetail(Hop):
     )  # Unix timestamp in milliseconds
     used_in: str = Field(alias="usedIn", default="")
     myrcene: float | None = None
-    timestamp_ms: int = Field(alias="_timestamp_ms")
     cohumulone: float | None = None
     humulene: float | None = None
     created: Timestamp = Field(alias="_created")
@@ -161,6 +164,59 @@ class HopDetail(Hop):
     ibu: float = 0
     hsi: float | None = None  # Hop Storage Index
     lot_number: str | None = Field(alias="lotNumber", default=None)
+    cost_per_amount: float | None = Field(alias="costPerAmount", default=None)
+
+    model_config = {
+        "populate_by_name": True,
+    }
+
+    @field_validator("manufacturing_date", "best_before_date", mode="before")
+    @classmethod
+    def convert_timestamp_to_isodate(cls, value):
+        return utils.convert_timestamp_to_iso8601(value)
+
+
+class Misc(InventoryItem):
+    """Base model for miscellaneous ingredients (spices, finings, water agents, etc)."""
+
+    inventory: float = 0
+    name: str
+    type: str
+    unit: str | None = None
+    use: str | None = None
+
+    model_config = {
+        "populate_by_name": True,
+    }
+
+
+class MiscList(RootModel[list[Misc]]):
+    """A collection of miscellaneous ingredients."""
+
+    pass
+
+
+class MiscDetail(Misc, InventoryDetail):
+    """Extended miscellaneous ingredient model with all additional properties."""
+
+    amount: float | None = None
+    amount_per_l: float | None = Field(alias="amountPerL", default=None)
+    best_before_date: str | None = Field(alias="bestBeforeDate", default=None)
+    concentration: float | None = None
+    cost_per_amount: float | None = Field(alias="costPerAmount", default=None)
+    created: Timestamp = Field(alias="_created")
+    hidden: bool = False
+    lot_number: str | None = Field(alias="lotNumber", default=None)
+    manufacturing_date: str | None = Field(alias="manufacturingDate", default=None)
+    notes: str | None = None
+    substitutes: str = ""
+    time: float | None = None
+    time_is_days: bool = Field(alias="timeIsDays", default=False)
+    timestamp: Timestamp = Field(alias="_timestamp")
+    used_in: str = Field(alias="usedIn", default="")
+    user_notes: str = Field(alias="userNotes", default="")
+    version: str = Field(alias="_version")
+    water_adjustment: bool = Field(alias="waterAdjustment", default=False)
 
     model_config = {
         "populate_by_name": True,
@@ -202,7 +258,7 @@ class YeastList(RootModel[list[Yeast]]):
     pass
 
 
-class YeastDetail(Yeast):
+class YeastDetail(Yeast, InventoryDetail):
     """Extended yeast model with all additional properties."""
 
     laboratory: str
@@ -224,12 +280,11 @@ class YeastDetail(Yeast):
     ferments_all: bool = Field(alias="fermentsAll", default=False)
     manufacturing_date: str | None = Field(alias="manufacturingDate", default=None)
     timestamp: Timestamp = Field(alias="_timestamp")
-    timestamp_ms: int = Field(alias="_timestamp_ms")
     user_notes: str = Field(alias="userNotes", default="")
-    rev: str = Field(alias="_rev")
     created: Timestamp = Field(alias="_created")
     version: str = Field(alias="_version")
     lot_number: str | None = Field(alias="lotNumber", default=None)
+    cost_per_amount: float | None = Field(alias="costPerAmount", default=None)
 
     @field_validator("manufacturing_date", "best_before_date", mode="before")
     @classmethod
@@ -246,6 +301,7 @@ class OrderByDirection(StrEnum):
     DESCENDING = "desc"
 
 
+@dataclass
 class ListQueryParams:
     inventory_negative: bool | None = None
     complete: bool | None = None
@@ -256,29 +312,30 @@ class ListQueryParams:
     order_by_direction: OrderByDirection | None = None
 
     def as_query_param_str(self) -> str | None:
-        qs = ""
+        params: dict[str, str] = {}
 
         if self.inventory_negative:
-            qs += f"inventory_negative={self.inventory_negative}"
+            params["inventory_negative"] = "true"
 
         if self.complete:
-            qs += f"complete={self.complete}"
+            params["complete"] = "true"
+
         if self.inventory_exists:
-            qs += f"inventory_exists={self.inventory_exists}"
+            params["inventory_exists"] = "true"
 
         if self.limit:
-            qs += f"limit={self.limit}"
+            params["limit"] = str(self.limit)
 
         if self.start_after:
-            qs += f"start_after={urllib.parse.quote_plus(self.start_after)}"
+            params["start_after"] = self.start_after
 
         if self.order_by:
-            qs += f"order_by={urllib.parse.quote_plus(self.order_by)}"
+            params["order_by"] = self.order_by
 
         if self.order_by_direction:
-            qs += f"order_by_direction={self.order_by_direction}"
+            params["order_by_direction"] = str(self.order_by_direction)
 
-        if qs:
-            return qs
+        if params:
+            return urllib.parse.urlencode(params)
         else:
-            None
+            return None
@@ -1,26 +1,23 @@
 import asyncio
-from collections.abc import Coroutine
 import typing
+from collections.abc import AsyncIterator, Coroutine, Iterable
+from contextlib import aclosing
 from datetime import datetime
-from itertools import batched
-
-from pydantic import RootModel
-
-if typing.TYPE_CHECKING:
-    from brewfather_mcp.types import (
-        InventoryItem,
-    )
 
 AnyType = str | int | float
 AnyDict = dict[str, str | int | float | None]
 AnyDictList = list[AnyDict]
 
 
-def convert_timestamp_to_iso8601(value: int | None) -> str | None:
+def convert_timestamp_to_iso8601(value: int | str | None) -> str | None:
     """Convert Unix timestamp to ISO 8601 formatted string."""
     if not value:
         return None
 
+    # Already converted, e.g. a model serialized and validated again
+    if isinstance(value, str):
+        return value
+
     # If the value is an integer (Unix timestamp), convert it
     if value:
         # Check if it's in milliseconds (13 digits) or seconds (10 digits)
@@ -35,19 +32,68 @@ def convert_timestamp_to_iso8601(value: int | None) -> str | None:
         return None
 
 
-async def get_in_batches[TReturn: "InventoryItem", TIterable: "InventoryItem"](
-    batch_size: int,
-    async_fn: typing.Callable[[str], Coroutine[typing.Any, typing.Any, TReturn]],
-    main_iterable: RootModel[list[TIterable]],
+async def _run_bounded[TItem, TReturn](
+    max_in_flight: int,
+    async_fn: typing.Callable[[TItem], Coroutine[typing.Any, typing.Any, TReturn]],
+    items: Iterable[TItem],
+) -> AsyncIterator[tuple[int, TReturn]]:
+    """Run `async_fn` over `items` keeping at most `max_in_flight` calls running.
+
+    A new call starts as soon as one finishes, coroutines are only created
+    when a slot frees up. Yields `(position, result)` in completion order.
+    On error the calls still running are cancelled and the error re-raised.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    pending: dict[asyncio.Task[TReturn], int] = {}
+    remaining = enumerate(items)
+
+    def start_next() -> None:
+        for position, item in remaining:
+            pending[asyncio.create_task(async_fn(item))] = position
+            return
+
+    try:
+        for _ in range(max_in_flight):
+            start_next()
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                position = pending.pop(task)
+                result = task.result()
+                start_next()
+                yield position, result
+    finally:
+        for task in pending:
+            _ = task.cancel()
+        _ = await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def gather_bounded[TItem, TReturn](
+    max_in_flight: int,
+    async_fn: typing.Callable[[TItem], Coroutine[typing.Any, typing.Any, TReturn]],
+    items: Iterable[TItem],
 ) -> list[TReturn]:
-    """Auxiliary function to execute function in async batches."""
-    detail_results: list[TReturn] = []
-    detail_tasks = [async_fn(data.id) for data in main_iterable.root]
-    batches = batched(detail_tasks, batch_size)
-    for batch in batches:
-        detail_results.extend(await asyncio.gather(*batch))
-
-    return detail_results
+    """Sliding-window `asyncio.gather`: results are returned in input order."""
+    results: dict[int, TReturn] = {}
+    async with aclosing(_run_bounded(max_in_flight, async_fn, items)) as runs:
+        async for position, result in runs:
+            results[position] = result
+
+    return [results[position] for position in range(len(results))]
+
+
+async def as_completed_bounded[TItem, TReturn](
+    max_in_flight: int,
+    async_fn: typing.Callable[[TItem], Coroutine[typing.Any, typing.Any, TReturn]],
+    items: Iterable[TItem],
+) -> AsyncIterator[TReturn]:
+    """Sliding-window `asyncio.as_completed`: yields results as they finish."""
+    async with aclosing(_run_bounded(max_in_flight, async_fn, items)) as runs:
+        async for _, result in runs:
+            yield result
 
 
 def empty_if_null(s: AnyType | None) -> str:
@@ -1,6 +1,4 @@
-import asyncio
-from brewfather_mcp.server import mcp
+from brewfather_mcp.server import main
 
 if __name__ == "__main__":
-    loop = asyncio.get_running_loop()
-    loop.run_until_complete(mcp.run_stdio_async())
+    main()
@@ -1,10 +1,104 @@
 import typing
+from collections.abc import Awaitable, Callable
+
+import httpx
 from dotenv import load_dotenv
 import pytest
 
+from brewfather_mcp.api import BrewfatherInventoryClient
+from brewfather_mcp.config import ClientConfig
+
 _ = load_dotenv()
 
 
+class FakeClock:
+    """Monotonic clock moved forward by hand, for the `clock=` parameters."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def async_items(items):
+    for item in items:
+        yield item
+
+
+def hop_payload(id: str, **overrides: object) -> dict[str, object]:
+    payload: dict[str, object] = {
+        "_id": id,
+        "_rev": "rev-1",
+        "_version": "2.11.6",
+        "_timestamp_ms": 1700000000000,
+        "_timestamp": {"_seconds": 1700000000, "_nanoseconds": 0},
+        "_created": {"_seconds": 1600000000, "_nanoseconds": 0},
+        "alpha": 12,
+        "inventory": 70,
+        "name": f"Hop {id}",
+        "type": "Pellet",
+        "use": "Boil",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def mock_api_client(
+    handler: Callable[[httpx.Request], httpx.Response | Awaitable[httpx.Response]],
+    **config: typing.Any,
+) -> BrewfatherInventoryClient:
+    """Client whose requests are answered by `handler` instead of the API."""
+    client = BrewfatherInventoryClient(
+        ClientConfig(base_url="http://test/v2", **config)
+    )
+    client._http_client = httpx.AsyncClient(
+        auth=client.auth, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+class FakeInventory:
+    """In-memory stand-in for the hops list endpoint, honouring the cursor."""
+
+    def __init__(self, count: int):
+        self.hops = {
+            f"hop-{i:03}": hop_payload(f"hop-{i:03}", _timestamp_ms=1000 + i)
+            for i in range(count)
+        }
+        self.clock = 1000 + count
+        self.requests: list[httpx.Request] = []
+
+    def update(self, id: str, **changes: object) -> None:
+        self.clock += 1
+        self.hops[id] = hop_payload(
+            id, _rev=f"rev-{self.clock}", _timestamp_ms=self.clock, **changes
+        )
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        params = request.url.params
+        order_by = params.get("order_by", "_id")
+        descending = params.get("order_by_direction") == "desc"
+
+        docs = sorted(
+            self.hops.values(), key=lambda doc: doc[order_by], reverse=descending
+        )
+        if (start_after := params.get("start_after")) is not None:
+            cursor = type(docs[0][order_by])(start_after)
+            docs = [
+                doc
+                for doc in docs
+                if (doc[order_by] < cursor if descending else doc[order_by] > cursor)
+            ]
+
+        docs = docs[: int(params.get("limit", 10))]
+        if params.get("complete") != "true":
+            docs = [{"_id": doc["_id"], "name": doc["name"]} for doc in docs]
+
+        return httpx.Response(200, json=docs)
+
+
 @pytest.fixture
 def httpx_mock():
     """Return a mock httpx client."""
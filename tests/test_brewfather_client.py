@@ -2,13 +2,17 @@ from unittest.mock import patch
 
 import httpx
 import pytest
+from conftest import hop_payload, mock_api_client
 
-from brewfather_mcp.api import BrewfatherInventoryClient
+from brewfather_mcp.api import MAX_PAGE_SIZE, BrewfatherInventoryClient
+from brewfather_mcp.config import ClientConfig
 from brewfather_mcp.types import (
     FermentableDetail,
     FermentableList,
     HopDetail,
     HopList,
+    ListQueryParams,
+    MiscDetail,
     YeastDetail,
     YeastList,
 )
@@ -111,3 +115,217 @@ class TestYeasts:
             assert result.name is not None
             assert result.id is not None
             assert result.attenuation > 0
+
+
+class TestConnectionPool:
+    @pytest.mark.asyncio
+    async def test_http_client_is_shared(
+        self, brewfather_client: BrewfatherInventoryClient
+    ):
+        first = brewfather_client.http_client
+        assert brewfather_client.http_client is first
+
+        await brewfather_client.aclose()
+        assert first.is_closed
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_pool(self):
+        async with BrewfatherInventoryClient() as client:
+            http_client = client.http_client
+            assert not http_client.is_closed
+
+        assert http_client.is_closed
+        # The pool is rebuilt transparently on next use.
+        assert not client.http_client.is_closed
+        await client.aclose()
+
+    def test_config_from_env(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("BREWFATHER_API_BASE_URL", "http://127.0.0.1:9999/v2")
+        monkeypatch.setenv("BREWFATHER_MAX_CONNECTIONS", "4")
+        monkeypatch.setenv("BREWFATHER_HTTP2", "true")
+
+        config = ClientConfig.from_env()
+
+        assert config.base_url == "http://127.0.0.1:9999/v2"
+        assert config.max_connections == 4
+        assert config.http2 is True
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_pool(self):
+        seen_urls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_urls.append(str(request.url))
+            return httpx.Response(
+                200,
+                json=[
+                    {
+                        "_id": "hop-1",
+                        "alpha": 5.5,
+                        "inventory": 100,
+                        "name": "Test Hop",
+                        "type": "Pellet",
+                        "use": "Boil",
+                    }
+                ],
+            )
+
+        client = mock_api_client(handler, cache_max_entries=0)
+        pool = client.http_client
+
+        for _ in range(3):
+            result = await client.get_hops_list()
+            assert result.root[0].name == "Test Hop"
+
+        assert client.http_client is pool
+        assert seen_urls == ["http://test/v2/inventory/hops"] * 3
+        await client.aclose()
+
+
+class TestBulkDetailList:
+    def test_query_params_are_joined(self):
+        query_params = ListQueryParams(complete=True, limit=50, start_after="a&b")
+
+        assert (
+            query_params.as_query_param_str()
+            == "complete=true&limit=50&start_after=a%26b"
+        )
+        assert ListQueryParams().as_query_param_str() is None
+
+    @pytest.mark.asyncio
+    async def test_empty_query_params_add_no_query_string(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=[])
+
+        client = mock_api_client(handler)
+
+        _ = await client.get_hops_list(ListQueryParams())
+
+        assert str(requests[0].url) == "http://test/v2/inventory/hops"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pages_complete_list_and_fills_incomplete_items(self):
+        hop_ids = [f"hop-{i:03}" for i in range(MAX_PAGE_SIZE + 2)]
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path.endswith("/hops"):
+                assert request.url.params["complete"] == "true"
+                start_after = request.url.params.get("start_after")
+                start = hop_ids.index(start_after) + 1 if start_after else 0
+                page = [
+                    # The bulk payload of "hop-001" misses required fields.
+                    {"_id": id} if id == "hop-001" else hop_payload(id)
+                    for id in hop_ids[start : start + MAX_PAGE_SIZE]
+                ]
+                return httpx.Response(200, json=page)
+
+            return httpx.Response(
+                200, json=hop_payload(request.url.path.split("/")[-1])
+            )
+
+        client = mock_api_client(handler)
+
+        result = await client.get_hops_detail_list()
+
+        assert [hop.id for hop in result] == hop_ids
+        assert all(isinstance(hop, HopDetail) for hop in result)
+        # Incomplete items are fetched as soon as their page is parsed.
+        assert [request.url.path for request in requests] == [
+            "/v2/inventory/hops",
+            "/v2/inventory/hops/hop-001",
+            "/v2/inventory/hops",
+        ]
+        await client.aclose()
+
+
+class TestListIterators:
+    @pytest.mark.asyncio
+    async def test_follows_cursor_through_every_page(self):
+        hop_ids = [f"hop-{i:03}" for i in range(2 * MAX_PAGE_SIZE + 5)]
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            assert request.url.params["limit"] == str(MAX_PAGE_SIZE)
+            assert request.url.params["inventory_exists"] == "true"
+            start_after = request.url.params.get("start_after")
+            start = hop_ids.index(start_after) + 1 if start_after else 0
+            return httpx.Response(
+                200,
+                json=[hop_payload(id) for id in hop_ids[start : start + MAX_PAGE_SIZE]],
+            )
+
+        client = mock_api_client(handler)
+
+        hops = [
+            hop
+            async for hop in client.iter_hops(ListQueryParams(inventory_exists=True))
+        ]
+
+        assert [hop.id for hop in hops] == hop_ids
+        assert len(requests) == 3
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pages_are_fetched_lazily(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200, json=[hop_payload(f"hop-{i}") for i in range(MAX_PAGE_SIZE)]
+            )
+
+        client = mock_api_client(handler)
+
+        async for hop in client.iter_hops():
+            assert hop.id == "hop-0"
+            break
+
+        assert len(requests) == 1
+        await client.aclose()
+
+
+class TestMiscs:
+    @pytest.mark.asyncio
+    async def test_miscs_use_the_shared_category_path(self):
+        misc = {
+            "_id": "misc-1",
+            "_rev": "rev-1",
+            "_version": "2.11.6",
+            "_timestamp_ms": 1700000000000,
+            "_timestamp": {"_seconds": 1700000000, "_nanoseconds": 0},
+            "_created": {"_seconds": 1600000000, "_nanoseconds": 0},
+            "name": "Gypsum",
+            "type": "Water Agent",
+            "use": "Mash",
+            "inventory": 120,
+            "unit": "g",
+            "waterAdjustment": True,
+            "bestBeforeDate": 1735689600000,
+        }
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=[misc])
+
+        client = mock_api_client(handler)
+
+        [detail] = await client.get_miscs_detail_list()
+
+        assert isinstance(detail, MiscDetail)
+        assert (detail.name, detail.unit, detail.water_adjustment) == (
+            "Gypsum",
+            "g",
+            True,
+        )
+        assert await client.get_misc_detail("misc-1") is detail
+        assert [request.url.path for request in requests] == ["/v2/inventory/miscs"]
+        await client.aclose()
@@ -0,0 +1,124 @@
+import httpx
+import pytest
+from conftest import FakeClock, hop_payload, mock_api_client
+
+from brewfather_mcp.cache import EndpointKind, ResponseCache
+from brewfather_mcp.types import InventoryCategory
+
+HOPS = InventoryCategory.HOPS
+YEASTS = InventoryCategory.YEASTS
+LIST = EndpointKind.LIST
+DETAIL = EndpointKind.DETAIL
+
+
+def make_cache(clock: FakeClock, **kwargs) -> ResponseCache:
+    options = {
+        "max_entries": 100,
+        "max_bytes": 10_000,
+        "ttls": {LIST: 60, DETAIL: 300},
+        "clock": clock,
+    }
+    options.update(kwargs)
+    return ResponseCache(**options)
+
+
+class TestResponseCache:
+    def test_hit_and_miss_counters(self):
+        cache = make_cache(FakeClock())
+
+        assert cache.get(HOPS, DETAIL, "a") is None
+        cache.set(HOPS, DETAIL, "a", "value", 10)
+        assert cache.get(HOPS, DETAIL, "a") == "value"
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.hit_ratio == 0.5
+        assert stats.size_bytes == 10
+
+    def test_ttl_per_kind_and_category(self):
+        clock = FakeClock()
+        cache = make_cache(clock, ttl_overrides={(YEASTS, DETAIL): 10})
+
+        cache.set(HOPS, LIST, "list", "hops list", 1)
+        cache.set(HOPS, DETAIL, "a", "hop", 1)
+        cache.set(YEASTS, DETAIL, "b", "yeast", 1)
+
+        clock.now = 30
+        assert cache.get(HOPS, LIST, "list") == "hops list"
+        assert cache.get(YEASTS, DETAIL, "b") is None
+
+        clock.now = 61
+        assert cache.get(HOPS, LIST, "list") is None
+        assert cache.get(HOPS, DETAIL, "a") == "hop"
+        assert cache.stats().entries == 1
+
+    def test_zero_ttl_disables_caching(self):
+        cache = make_cache(FakeClock(), ttls={LIST: 0, DETAIL: 300})
+
+        cache.set(HOPS, LIST, "list", "hops list", 1)
+
+        assert cache.get(HOPS, LIST, "list") is None
+
+    def test_lru_eviction_by_entry_count(self):
+        cache = make_cache(FakeClock(), max_entries=2)
+
+        cache.set(HOPS, DETAIL, "a", "a", 1)
+        cache.set(HOPS, DETAIL, "b", "b", 1)
+        assert cache.get(HOPS, DETAIL, "a") == "a"
+        cache.set(HOPS, DETAIL, "c", "c", 1)
+
+        assert cache.get(HOPS, DETAIL, "b") is None
+        assert cache.get(HOPS, DETAIL, "a") == "a"
+        assert cache.get(HOPS, DETAIL, "c") == "c"
+        assert cache.stats().evictions == 1
+
+    def test_lru_eviction_by_bytes(self):
+        cache = make_cache(FakeClock(), max_bytes=100)
+
+        cache.set(HOPS, DETAIL, "a", "a", 60)
+        cache.set(HOPS, DETAIL, "b", "b", 60)
+        cache.set(HOPS, DETAIL, "too-big", "too-big", 101)
+
+        assert cache.get(HOPS, DETAIL, "a") is None
+        assert cache.get(HOPS, DETAIL, "b") == "b"
+        assert cache.get(HOPS, DETAIL, "too-big") is None
+        assert cache.stats().size_bytes == 60
+
+    def test_invalidate_category(self):
+        cache = make_cache(FakeClock())
+        cache.set(HOPS, DETAIL, "a", "a", 1)
+        cache.set(YEASTS, DETAIL, "b", "b", 1)
+
+        cache.invalidate(HOPS)
+
+        assert cache.get(HOPS, DETAIL, "a") is None
+        assert cache.get(YEASTS, DETAIL, "b") == "b"
+
+
+class TestClientCache:
+    @pytest.mark.asyncio
+    async def test_bulk_list_fills_detail_entries(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path.endswith("/hops"):
+                return httpx.Response(200, json=[hop_payload("a"), hop_payload("b")])
+
+            return httpx.Response(200, json=hop_payload("a"))
+
+        client = mock_api_client(handler)
+
+        details = await client.get_hops_detail_list()
+        assert await client.get_hops_detail_list() is details
+        hop = await client.get_hop_detail("b")
+        list_result = await client.get_hops_list()
+        assert await client.get_hops_list() is list_result
+
+        assert hop is details[1]
+        assert [request.url.path for request in requests] == [
+            "/v2/inventory/hops",
+            "/v2/inventory/hops",
+        ]
+        assert client.cache.stats().hits == 3
+        await client.aclose()
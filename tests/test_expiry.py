@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+from conftest import FakeInventory, hop_payload, mock_api_client
+
+from brewfather_mcp.expiry import ExpiryIndex
+from brewfather_mcp.sync import SyncMode
+from brewfather_mcp.types import HopDetail, InventoryCategory
+
+HOPS = InventoryCategory.HOPS
+NOW = datetime(2026, 1, 1)
+
+
+def ms(when: datetime) -> int:
+    return int(when.timestamp() * 1000)
+
+
+def hop(id: str, days: int | None, inventory: float = 10) -> HopDetail:
+    best_before = ms(NOW + timedelta(days=days)) if days is not None else None
+    return HopDetail.model_validate(
+        hop_payload(id, bestBeforeDate=best_before, inventory=inventory)
+    )
+
+
+class TestExpiryIndex:
+    def test_lists_items_expiring_within_the_window_soonest_first(self):
+        index = ExpiryIndex()
+        index.apply_changes(
+            HOPS,
+            [hop("late", 90), hop("soon", 5), hop("expired", -3), hop("undated", None)],
+            (),
+        )
+
+        expiring = index.expiring(timedelta(days=30), now=NOW)
+
+        assert [entry.item.id for entry in expiring] == ["expired", "soon"]
+        assert [entry.days_left(NOW) for entry in expiring] == [-3, 5]
+        assert HOPS in index
+        assert InventoryCategory.YEASTS not in index
+
+    def test_follows_changes_and_deletions(self):
+        index = ExpiryIndex()
+        index.apply_changes(HOPS, [hop("a", 5), hop("b", 10), hop("c", 20)], ())
+
+        index.apply_changes(HOPS, [hop("a", 60), hop("b", 10, inventory=0)], ["c"])
+        index.apply_changes(InventoryCategory.YEASTS, [], ())
+
+        assert index.expiring(timedelta(days=30), now=NOW) == []
+        assert [
+            entry.item.id for entry in index.expiring(timedelta(days=90), now=NOW)
+        ] == ["a"]
+        assert len(index) == 1
+
+
+class TestClientExpiryIndex:
+    @pytest.mark.asyncio
+    async def test_kept_up_to_date_by_delta_syncs(self):
+        inventory = FakeInventory(3)
+        client = mock_api_client(inventory.handler, cache_list_ttl=0)
+        _ = await client.get_hops_detail_list()
+        assert client.expiry.expiring(timedelta(days=30)) == []
+
+        soon = ms(datetime.now() + timedelta(days=7))
+        inventory.update("hop-001", bestBeforeDate=soon)
+        result = await client.sync.sync(HOPS, HopDetail, client.get_hop_detail)
+
+        expiring = client.expiry.expiring(timedelta(days=30))
+
+        assert [entry.item.id for entry in expiring] == ["hop-001"]
+        assert (result.mode, result.requests, result.changed) == (
+            SyncMode.DELTA,
+            1,
+            1,
+        )
+        await client.aclose()
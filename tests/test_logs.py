@@ -0,0 +1,137 @@
+import json
+import logging
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mcp import types
+
+from brewfather_mcp.logs import (
+    LOG_RECORDS_DROPPED,
+    configure_queue_logging,
+    output_handler,
+    request_scope,
+    set_level,
+)
+from brewfather_mcp.server import mcp
+from brewfather_mcp.tenants import current_tenant
+
+logger = logging.getLogger("brewfather_mcp.test")
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class BlockingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        _ = self.release.wait(5)
+        self.records.append(record)
+
+
+class TestLogPipeline:
+    def test_json_records_carry_request_context(self, root_logger, tmp_path):
+        path = tmp_path / "logs" / "server.log"
+        listener = configure_queue_logging(output_handler(str(path)))
+        token = current_tenant.set("alice")
+        try:
+            with request_scope() as rid:
+                logger.info("Fetched %d hops", 3, extra={"category": "hops"})
+                try:
+                    raise ValueError("boom")
+                except ValueError:
+                    logger.exception("Refresh failed")
+            logger.debug("Below the level")
+        finally:
+            current_tenant.reset(token)
+            listener.stop()
+
+        fetched, failed = [json.loads(line) for line in path.read_text().splitlines()]
+        assert fetched["message"] == "Fetched 3 hops"
+        assert fetched["request_id"] == failed["request_id"] == rid
+        assert fetched["tenant"] == "alice"
+        assert fetched["category"] == "hops"
+        assert failed["level"] == "ERROR"
+        assert "ValueError: boom" in failed["exception"]
+
+    def test_slow_output_never_blocks_the_caller(self, root_logger):
+        handler = BlockingHandler()
+        listener = configure_queue_logging(handler, queue_size=4)
+        dropped = LOG_RECORDS_DROPPED.values.get((), 0)
+
+        started = time.perf_counter()
+        for i in range(10):
+            logger.warning("Record %d", i)
+        elapsed = time.perf_counter() - started
+        handler.release.set()
+        listener.stop()
+
+        assert elapsed < 0.1
+        # One record is taken off the queue by the listener, four wait in it.
+        assert len(handler.records) + LOG_RECORDS_DROPPED.values[()] - dropped == 10
+        assert handler.records[0].getMessage() == "Record 0"
+
+    def test_size_rotation(self, root_logger, tmp_path):
+        path = tmp_path / "server.log"
+        listener = configure_queue_logging(
+            output_handler(str(path), max_bytes=512, backups=2)
+        )
+        for i in range(50):
+            logger.info("Record %d", i)
+        listener.stop()
+
+        assert sorted(file.name for file in tmp_path.iterdir()) == [
+            "server.log",
+            "server.log.1",
+            "server.log.2",
+        ]
+        assert path.stat().st_size <= 512
+
+
+class TestLevels:
+    def test_python_and_mcp_level_names(self, root_logger):
+        set_level("debug")
+        assert root_logger.level == logging.DEBUG
+        set_level("emergency")
+        assert root_logger.level == logging.CRITICAL
+        with pytest.raises(ValueError):
+            set_level("verbose")
+
+    @pytest.mark.asyncio
+    async def test_clients_set_the_level(self, root_logger):
+        handler = mcp._mcp_server.request_handlers[types.SetLevelRequest]
+
+        _ = await handler(
+            types.SetLevelRequest(
+                method="logging/setLevel",
+                params=types.SetLevelRequestParams(level="warning"),
+            )
+        )
+
+        assert root_logger.level == logging.WARNING
+
+    @pytest.mark.asyncio
+    async def test_tenants_cannot_set_the_level(self, root_logger):
+        handler = mcp._mcp_server.request_handlers[types.SetLevelRequest]
+        root_logger.setLevel(logging.INFO)
+
+        with patch("brewfather_mcp.server.tenant_registry", MagicMock()):
+            _ = await handler(
+                types.SetLevelRequest(
+                    method="logging/setLevel",
+                    params=types.SetLevelRequestParams(level="debug"),
+                )
+            )
+
+        assert root_logger.level == logging.INFO
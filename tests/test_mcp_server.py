@@ -1,23 +1,49 @@
 # type: ignore
 
+import asyncio
+import os
+import re
+import subprocess
+import sys
+from dataclasses import replace
+
+import httpx
 import pytest
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from conftest import async_items, hop_payload, mock_api_client
 from unittest.mock import patch, MagicMock, AsyncMock
 
 from brewfather_mcp.server import (
+    FIRST_PAGE,
+    decode_page_cursor,
+    encode_page_cursor,
+    get_client,
+    get_config,
+    http_app,
+    lifespan,
+    mcp,
+    read_hops_page,
     inventory_categories,
     read_fermentables,
     read_fermentable_detail,
     read_hops,
     read_hops_detail,
+    read_miscs,
+    read_miscs_detail,
     read_yeasts,
     read_yeasts_detail,
     inventory_summary,
     styles_based_inventory_prompt,
 )
 from brewfather_mcp.api import BrewfatherInventoryClient
+from brewfather_mcp.config import ServerConfig
 from brewfather_mcp.types import (
     FermentableList,
     HopList,
+    InventoryCategory,
+    MiscList,
     YeastList,
 )
 
@@ -25,6 +51,7 @@ from brewfather_mcp.types import (
 @pytest.fixture
 def mock_brewfather_client(mocker):
     mocker.patch("os.getenv", "credential")
+    mocker.patch("brewfather_mcp.server.server_config", ServerConfig())
     client = AsyncMock(spec=BrewfatherInventoryClient)
 
     fermentable = MagicMock(
@@ -126,16 +153,79 @@ def mock_brewfather_client(mocker):
     fermentables_list.root = [fermentable]
     client.get_fermentables_list.return_value = fermentables_list
     client.get_fermentable_detail.return_value = fermentable
+    client.get_fermentables_detail_list.return_value = [fermentable]
+    client.iter_fermentables = MagicMock(
+        side_effect=lambda *args: async_items([fermentable])
+    )
 
     hops_list = MagicMock(spec=HopList)
     hops_list.root = [hop]
     client.get_hops_list.return_value = hops_list
     client.get_hop_detail.return_value = hop
+    client.get_hops_detail_list.return_value = [hop]
+    client.iter_hops = MagicMock(side_effect=lambda *args: async_items([hop]))
 
     yeasts_list = MagicMock(spec=YeastList)
     yeasts_list.root = [yeast]
     client.get_yeasts_list.return_value = yeasts_list
     client.get_yeast_detail.return_value = yeast
+    client.get_yeasts_detail_list.return_value = [yeast]
+    client.iter_yeasts = MagicMock(side_effect=lambda *args: async_items([yeast]))
+
+    misc = MagicMock(
+        name="Test Misc",
+        type="Water Agent",
+        use="Mash",
+        inventory=50,
+        unit="g",
+        lot_number=None,
+        best_before_date=None,
+        id="test-misc-id",
+    )
+    miscs_list = MagicMock(spec=MiscList)
+    miscs_list.root = [misc]
+    client.get_miscs_list.return_value = miscs_list
+    client.get_misc_detail.return_value = misc
+    client.get_miscs_detail_list.return_value = [misc]
+    client.iter_miscs = MagicMock(side_effect=lambda *args: async_items([misc]))
+
+    # The generic methods delegate to the per-category ones set up above.
+    by_category = {
+        InventoryCategory.FERMENTABLES: (
+            client.iter_fermentables,
+            client.get_fermentable_detail,
+            client.get_fermentables_detail_list,
+        ),
+        InventoryCategory.HOPS: (
+            client.iter_hops,
+            client.get_hop_detail,
+            client.get_hops_detail_list,
+        ),
+        InventoryCategory.MISCELLANEOUS: (
+            client.iter_miscs,
+            client.get_misc_detail,
+            client.get_miscs_detail_list,
+        ),
+        InventoryCategory.YEASTS: (
+            client.iter_yeasts,
+            client.get_yeast_detail,
+            client.get_yeasts_detail_list,
+        ),
+    }
+
+    async def get_detail(spec, id):
+        return await by_category[spec.category][1](id)
+
+    async def get_detail_list(spec, on_progress=None):
+        return await by_category[spec.category][2](on_progress)
+
+    client.iter_items = MagicMock(
+        side_effect=lambda spec, query_params=None: by_category[spec.category][0](
+            query_params
+        )
+    )
+    client.get_detail.side_effect = get_detail
+    client.get_detail_list.side_effect = get_detail_list
 
     return client
 
@@ -188,6 +278,21 @@ class TestBrewfatherMCP:
             assert "Pellet" in result
             assert "US" in result
 
+    @pytest.mark.asyncio
+    async def test_read_miscs(self, mock_brewfather_client):
+        with patch("brewfather_mcp.server.brewfather_client", mock_brewfather_client):
+            result = await read_miscs()
+            assert "Test Misc" in result
+            assert "Water Agent" in result
+            assert "50 g" in result
+
+    @pytest.mark.asyncio
+    async def test_read_miscs_detail(self, mock_brewfather_client):
+        with patch("brewfather_mcp.server.brewfather_client", mock_brewfather_client):
+            result = await read_miscs_detail("test-misc-id")
+            assert "Test Misc" in result
+            assert "Mash" in result
+
     @pytest.mark.asyncio
     async def test_read_yeasts(self, mock_brewfather_client):
         with patch("brewfather_mcp.server.brewfather_client", mock_brewfather_client):
@@ -227,11 +332,39 @@ class TestBrewfatherMCP:
             result = await inventory_summary()
             assert "Fermentables:" in result
             assert "Hops:" in result
+            assert "Miscs:" in result
             assert "Yeasts:" in result
             assert "Test Malt" in result
             assert "Test Hop" in result
+            assert "Test Misc" in result
             assert "Test Yeast" in result
-            mock_mcp_context.report_progress.assert_called_with(100, 100)
+            mock_mcp_context.report_progress.assert_called_with(4, 4)
+            mock_mcp_context.info.assert_any_call("Hops: 1 items ready")
+
+    @pytest.mark.asyncio
+    async def test_inventory_summary_reports_item_progress(
+        self, mock_brewfather_client, mock_mcp_context
+    ):
+        async def detail_list(on_progress=None):
+            await on_progress(1, 2)
+            await on_progress(2, 2)
+            return [hop, hop]
+
+        hop = mock_brewfather_client.get_hops_detail_list.return_value[0]
+        mock_brewfather_client.get_hops_detail_list.side_effect = detail_list
+        with (
+            patch("brewfather_mcp.server.brewfather_client", mock_brewfather_client),
+            patch(
+                "brewfather_mcp.server.mcp.get_context", return_value=mock_mcp_context
+            ),
+        ):
+            result = await inventory_summary(stream_sections=True)
+
+        calls = mock_mcp_context.report_progress.call_args_list
+        assert calls[0].args == (1, None)
+        assert calls[1].args == (2, None)
+        assert calls[-1].args == (5, 5)
+        mock_mcp_context.info.assert_any_call(result.split("\n---\n")[1])
 
     @pytest.mark.asyncio
     async def test_styles_based_inventory_prompt(self):
@@ -243,9 +376,7 @@ class TestBrewfatherMCP:
 
     @pytest.mark.asyncio
     async def test_error_handling_read_fermentables(self, mock_brewfather_client):
-        mock_brewfather_client.get_fermentables_list.side_effect = Exception(
-            "API error"
-        )
+        mock_brewfather_client.iter_fermentables.side_effect = Exception("API error")
         with (
             patch("brewfather_mcp.server.brewfather_client", mock_brewfather_client),
             patch("brewfather_mcp.server.logger") as mock_logger,
@@ -254,3 +385,152 @@ class TestBrewfatherMCP:
                 await read_fermentables()
 
             mock_logger.exception.assert_called_once()
+
+
+class TestPagedResources:
+    @pytest.mark.asyncio
+    async def test_pages_cover_the_category_within_budget(self):
+        hop_ids = [f"hop-{i:03}" for i in range(120)]
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            start_after = request.url.params.get("start_after")
+            start = hop_ids.index(start_after) + 1 if start_after else 0
+            limit = int(request.url.params["limit"])
+            return httpx.Response(
+                200, json=[hop_payload(id) for id in hop_ids[start : start + limit]]
+            )
+
+        client = mock_api_client(handler)
+
+        seen = []
+        pages = 0
+        cursor = FIRST_PAGE
+        with (
+            patch("brewfather_mcp.server.brewfather_client", client),
+            patch(
+                "brewfather_mcp.server.server_config",
+                replace(get_config(), resource_page_bytes=2000),
+            ),
+        ):
+            while cursor is not None:
+                page = await read_hops_page(cursor)
+                pages += 1
+                body, _, next_link = page.partition("---\nNext page: ")
+                assert len(body.encode()) <= 2000
+                seen.extend(re.findall(r"Identifier: (\S+)", body))
+                cursor = next_link.strip().rsplit("/", 1)[-1] if next_link else None
+
+            # One API page per resource page, the first one is then cached.
+            assert len(requests) == pages > 1
+            first_page = await read_hops_page(FIRST_PAGE)
+
+        assert seen == hop_ids
+        assert first_page.startswith("Identifier: hop-000\n")
+        await client.aclose()
+
+    def test_cursor_round_trip(self):
+        assert decode_page_cursor(encode_page_cursor("default-8e9450d5")) == (
+            "default-8e9450d5"
+        )
+        assert decode_page_cursor(FIRST_PAGE) is None
+        with pytest.raises(ValueError):
+            decode_page_cursor("%%%")
+
+
+class TestLazyStartup:
+    def test_import_needs_no_credentials_nor_heavy_modules(self, tmp_path):
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if not key.startswith("BREWFATHER_")
+        }
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        code = (
+            "import sys, brewfather_mcp.server as server; "
+            "assert server.brewfather_client is None; "
+            "assert server.server_config is None; "
+            "assert 'numpy' not in sys.modules; "
+            "assert 'brewfather_mcp.api' not in sys.modules"
+        )
+
+        # A failed assertion makes the import exit non-zero, with its traceback
+        # in the captured stderr of the test.
+        _ = subprocess.run(
+            [sys.executable, "-c", code], cwd=tmp_path, env=env, check=True
+        )
+
+    def test_client_is_created_once_on_first_use(self):
+        with patch("brewfather_mcp.server.brewfather_client", None):
+            client = get_client()
+
+            assert isinstance(client, BrewfatherInventoryClient)
+            assert get_client() is client
+
+
+class TestHttpSessions:
+    @pytest.mark.asyncio
+    async def test_client_is_closed_after_the_last_session(self):
+        client = AsyncMock(spec=BrewfatherInventoryClient)
+        with patch("brewfather_mcp.server.brewfather_client", client):
+            async with lifespan(mcp):
+                async with lifespan(mcp):
+                    pass
+
+                client.aclose.assert_not_awaited()
+
+            client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_sse_sessions_share_one_client(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            hops = [hop_payload(f"hop-{i:03}") for i in range(20)]
+            return httpx.Response(200, json=hops if "hops" in request.url.path else [])
+
+        client = mock_api_client(handler)
+        http_server = uvicorn.Server(
+            uvicorn.Config(
+                http_app("sse"), host="127.0.0.1", port=0, log_level="critical"
+            )
+        )
+
+        async def resolve(url: str) -> str:
+            async with (
+                sse_client(url) as (read, write),
+                ClientSession(read, write) as session,
+            ):
+                _ = await session.initialize()
+                result = await session.call_tool(
+                    "resolve_ingredient", {"name": "hop 007", "category": "hops"}
+                )
+                return result.content[0].text
+
+        with patch("brewfather_mcp.server.brewfather_client", client):
+            async with lifespan(mcp):
+                serving = asyncio.create_task(http_server.serve())
+                while not http_server.started:
+                    await asyncio.sleep(0.01)
+                port = http_server.servers[0].sockets[0].getsockname()[1]
+                url = f"http://127.0.0.1:{port}/sse"
+
+                first = await resolve(url)
+                made = len(requests)
+                second = await resolve(url)
+
+                http_server.should_exit = http_server.force_exit = True
+                await serving
+
+        assert first == second
+        assert first.startswith("Hop hop-007 (Hops): ID hop-007")
+        assert len(requests) == made == 1
+
+    def test_streamable_http_needs_a_newer_mcp(self):
+        if hasattr(mcp, "streamable_http_app"):
+            pytest.skip("mcp supports streamable HTTP")
+
+        with pytest.raises(ValueError, match="not available"):
+            _ = http_app("streamable-http")
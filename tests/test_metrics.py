@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+from conftest import hop_payload, mock_api_client
+from mcp.server.fastmcp.exceptions import ToolError
+
+from brewfather_mcp.metrics import (
+    API_REQUESTS,
+    HANDLER_CALLS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+from brewfather_mcp.server import http_app, mcp, read_server_metrics
+
+
+class TestMetrics:
+    def test_histogram_quantiles_interpolate_within_buckets(self):
+        histogram = Histogram("latency", "", buckets=(0.1, 0.2, 0.4))
+        for value in (0.05, 0.15, 0.15, 0.3):
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == pytest.approx(0.15)
+        assert histogram.quantile(1.0) == pytest.approx(0.4)
+        assert Histogram("empty", "").quantile(0.5) is None
+
+    def test_prometheus_text_format(self):
+        registry = MetricsRegistry()
+        requests = registry.register(Counter("requests_total", "Requests.", ("code",)))
+        latency = registry.register(Histogram("latency", "Latency.", buckets=(0.5, 1)))
+        _ = registry.register(
+            Gauge("tokens", "Tokens.", ("tenant",), callback=lambda: {("a",): 3})
+        )
+        requests.inc("200")
+        requests.inc("200")
+        latency.observe(0.7)
+
+        assert registry.render_prometheus().splitlines() == [
+            "# HELP requests_total Requests.",
+            "# TYPE requests_total counter",
+            'requests_total{code="200"} 2.0',
+            "# HELP latency Latency.",
+            "# TYPE latency histogram",
+            'latency_bucket{le="0.5"} 0.0',
+            'latency_bucket{le="1.0"} 1.0',
+            'latency_bucket{le="+Inf"} 1.0',
+            "latency_sum 0.7",
+            "latency_count 1.0",
+            "# HELP tokens Tokens.",
+            "# TYPE tokens gauge",
+            'tokens{tenant="a"} 3.0',
+        ]
+
+    def test_labels_must_match(self):
+        with pytest.raises(ValueError):
+            Counter("requests_total", "", ("code",)).inc()
+
+
+class TestInstrumentation:
+    @pytest.mark.asyncio
+    async def test_api_requests_are_counted_per_endpoint_and_status(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("missing"):
+                return httpx.Response(404)
+            return httpx.Response(200, json=hop_payload("a"))
+
+        client = mock_api_client(handler)
+        ok = API_REQUESTS.values.get(("hops.detail", "200"), 0)
+        missing = API_REQUESTS.values.get(("hops.detail", "404"), 0)
+
+        _ = await client.get_hop_detail("a")
+        with pytest.raises(httpx.HTTPStatusError):
+            _ = await client.get_hop_detail("missing")
+
+        assert API_REQUESTS.values[("hops.detail", "200")] == ok + 1
+        assert API_REQUESTS.values[("hops.detail", "404")] == missing + 1
+        assert client.requests_in_flight == 0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_handlers_are_timed_by_name_and_template(self):
+        errors = HANDLER_CALLS.values.get(("tool", "query_inventory", "error"), 0)
+
+        with pytest.raises(ToolError):
+            _ = await mcp.call_tool("query_inventory", {"category": "cider"})
+        _ = await mcp.read_resource("inventory://categories")
+
+        assert HANDLER_CALLS.values[("tool", "query_inventory", "error")] == errors + 1
+        assert ("resource", "inventory://categories", "ok") in HANDLER_CALLS.values
+        assert (
+            mcp._resource_name("inventory://hops/abc")
+            == "inventory://hops/{identifier}"
+        )
+        assert mcp._resource_name("inventory://hops/page/x") == (
+            "inventory://hops/page/{cursor}"
+        )
+
+        with patch("brewfather_mcp.server.brewfather_client", None):
+            report = await read_server_metrics()
+        assert "tool query_inventory" in report
+        assert "resource inventory://categories" in report
+
+    @pytest.mark.asyncio
+    async def test_prometheus_endpoint(self):
+        transport = httpx.ASGITransport(app=http_app("sse"))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+            response = await http.get("/metrics")
+
+        assert response.status_code == 200
+        assert "# TYPE mcp_handler_seconds histogram" in response.text
@@ -0,0 +1,157 @@
+import httpx
+import pytest
+from conftest import hop_payload, mock_api_client
+
+from brewfather_mcp.api import BrewfatherInventoryClient
+from brewfather_mcp.categories import FERMENTABLES, HOPS
+from brewfather_mcp.query import InventoryIndex, InventoryQuery, Range, run_query
+from brewfather_mcp.types import HopDetail, ListQueryParams
+
+HOP_DOCS = [
+    hop_payload("hop-001", name="Citra", alpha=12.0, inventory=100, origin="US"),
+    hop_payload("hop-002", name="Saaz", alpha=3.5, inventory=0, origin="Czech"),
+    hop_payload("hop-003", name="Mosaic", alpha=11.5, inventory=50, origin="US"),
+    hop_payload("hop-004", name="Magnum", alpha=14.0, inventory=20, type="Leaf"),
+    hop_payload("hop-005", name="Hallertau", alpha=4.0, inventory=30, origin="DE"),
+]
+
+
+def query_client(
+    docs: list[dict[str, object]], requests: list[httpx.Request]
+) -> BrewfatherInventoryClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        params = request.url.params
+        order_by = params.get("order_by", "_id")
+        selected = sorted(
+            docs,
+            key=lambda doc: doc[order_by],
+            reverse=params.get("order_by_direction") == "desc",
+        )
+        if params.get("inventory_exists") == "true":
+            selected = [doc for doc in selected if doc["inventory"] > 0]
+        if "start_after" in params:
+            assert order_by == "_id"
+            selected = [doc for doc in selected if doc["_id"] > params["start_after"]]
+        return httpx.Response(200, json=selected[: int(params.get("limit", 10))])
+
+    client = mock_api_client(handler)
+    return client
+
+
+class TestListPushdown:
+    @pytest.mark.asyncio
+    async def test_stock_ordering_and_limit_go_to_the_api(self):
+        requests: list[httpx.Request] = []
+        client = query_client(HOP_DOCS, requests)
+
+        hops = await run_query(
+            client,
+            InventoryQuery(
+                HOPS, in_stock=True, order_by="alpha", descending=True, limit=2
+            ),
+        )
+
+        assert [hop.name for hop in hops] == ["Magnum", "Citra"]
+        assert len(requests) == 1
+        assert dict(requests[0].url.params) == {
+            "inventory_exists": "true",
+            "limit": "2",
+            "order_by": "alpha",
+            "order_by_direction": "desc",
+        }
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_list_fields_are_filtered_without_details(self):
+        requests: list[httpx.Request] = []
+        client = query_client(HOP_DOCS, requests)
+
+        hops = await run_query(
+            client, InventoryQuery(HOPS, ranges=(Range("alpha", 11, 13),), limit=10)
+        )
+
+        assert [hop.name for hop in hops] == ["Citra", "Mosaic"]
+        assert all("/hops/" not in request.url.path for request in requests)
+        assert "limit=10" not in str(requests[0].url)
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_ties_across_pages_are_ordered_locally(self):
+        docs = [
+            hop_payload(f"hop-{i:03}", alpha=5.0 if i % 2 else 7.0, inventory=i)
+            for i in range(1, 81)
+        ]
+        requests: list[httpx.Request] = []
+        client = query_client(docs, requests)
+
+        hops = await run_query(
+            client,
+            InventoryQuery(
+                HOPS, ranges=(Range("inventory", min=2),), order_by="alpha", limit=60
+            ),
+        )
+
+        assert len(hops) == 60
+        assert [hop.alpha for hop in hops] == [5.0] * 39 + [7.0] * 21
+        assert all("order_by" not in request.url.params for request in requests)
+        assert len(requests) == 2
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_only_id_ordering_can_be_paged(self):
+        client = query_client(HOP_DOCS, [])
+
+        with pytest.raises(ValueError, match="alpha"):
+            _ = [
+                hop async for hop in client.iter_hops(ListQueryParams(order_by="alpha"))
+            ]
+        await client.aclose()
+
+
+class TestLocalIndex:
+    @pytest.mark.asyncio
+    async def test_detail_fields_are_answered_from_the_detail_list(self):
+        requests: list[httpx.Request] = []
+        client = query_client(HOP_DOCS, requests)
+
+        hops = await run_query(
+            client,
+            InventoryQuery(
+                HOPS,
+                ranges=(Range("inventory", min=1),),
+                origin="us",
+                order_by="inventory",
+            ),
+        )
+        again = await run_query(client, InventoryQuery(HOPS, origin="czech"))
+
+        assert [hop.name for hop in hops] == ["Mosaic", "Citra"]
+        assert [hop.name for hop in again] == ["Saaz"]
+        assert requests[0].url.params["complete"] == "true"
+        assert len(requests) == 1
+        assert list(client.indexes) == [HOPS.category]
+        await client.aclose()
+
+    def test_ranges_bisect_the_most_selective_field(self):
+        hops = [HopDetail.model_validate(doc) for doc in HOP_DOCS]
+        index = InventoryIndex(hops)
+
+        query = InventoryQuery(
+            HOPS, ranges=(Range("alpha", max=12), Range("inventory", 20, 50))
+        )
+
+        assert index._candidates(Range("alpha", 3.5, 4.0)) == [1, 4]
+        assert [hop.name for hop in index.select(query)] == ["Mosaic", "Hallertau"]
+
+    @pytest.mark.asyncio
+    async def test_fields_the_category_lacks_are_rejected(self):
+        client = query_client([], [])
+
+        with pytest.raises(ValueError, match="alpha"):
+            _ = await run_query(
+                client, InventoryQuery(FERMENTABLES, ranges=(Range("alpha", 1),))
+            )
+        with pytest.raises(ValueError, match="order by"):
+            _ = await run_query(client, InventoryQuery(HOPS, order_by="notes"))
+        await client.aclose()
@@ -0,0 +1,168 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import httpx
+import pytest
+from conftest import FakeClock, mock_api_client
+
+from brewfather_mcp.ratelimit import (
+    RateLimitExceeded,
+    RateLimitPolicy,
+    SharedPolicy,
+    TokenBucket,
+    current_policy,
+    parse_retry_after,
+    rate_limit_policy,
+)
+
+
+class TestTokenBucket:
+    def test_refills_at_quota_rate(self):
+        clock = FakeClock(1000.0)
+        bucket = TokenBucket(3600, period=3600, clock=clock)
+
+        bucket._tokens = 0
+        clock.now += 2.5
+
+        assert bucket.tokens == pytest.approx(2.5)
+        assert bucket.time_until_available() == 0
+
+    def test_never_exceeds_capacity(self):
+        clock = FakeClock(1000.0)
+        bucket = TokenBucket(10, period=3600, clock=clock)
+
+        clock.now += 10_000
+
+        assert bucket.tokens == 10
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_when_empty(self):
+        clock = FakeClock(1000.0)
+        bucket = TokenBucket(2, period=3600, clock=clock)
+
+        await bucket.acquire(RateLimitPolicy.FAIL_FAST)
+        await bucket.acquire(RateLimitPolicy.FAIL_FAST)
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await bucket.acquire(RateLimitPolicy.FAIL_FAST)
+
+        assert exc_info.value.retry_after == pytest.approx(1800)
+
+    @pytest.mark.asyncio
+    async def test_wait_for_refill(self):
+        bucket = TokenBucket(100, period=1)
+        bucket._tokens = 0
+
+        await asyncio.wait_for(bucket.acquire(RateLimitPolicy.WAIT), timeout=1)
+
+        assert bucket.tokens < 1
+
+    @pytest.mark.asyncio
+    async def test_wait_gives_up_after_max_wait(self):
+        bucket = TokenBucket(1, period=3600)
+        await bucket.acquire()
+
+        with pytest.raises(RateLimitExceeded):
+            await bucket.acquire(RateLimitPolicy.WAIT, max_wait=0.1)
+
+    def test_pause_blocks_until_elapsed(self):
+        clock = FakeClock(1000.0)
+        bucket = TokenBucket(500, period=3600, clock=clock)
+
+        bucket.pause(30)
+
+        assert bucket.time_until_available() == pytest.approx(30)
+        clock.now += 30
+        assert bucket.time_until_available() == 0
+        # The time spent paused is not refilled.
+        assert bucket.tokens == pytest.approx(1)
+
+
+class TestSharedPolicy:
+    def test_most_patient_caller_wins(self):
+        shared = SharedPolicy()
+
+        with shared.caller(RateLimitPolicy.FAIL_FAST):
+            assert shared.resolve() is RateLimitPolicy.FAIL_FAST
+            with shared.caller(None):
+                assert shared.resolve() is None
+                with shared.caller(RateLimitPolicy.WAIT):
+                    assert shared.resolve() is RateLimitPolicy.WAIT
+            assert shared.resolve() is RateLimitPolicy.FAIL_FAST
+
+        assert shared.resolve() is None
+
+    def test_current_policy_resolves_the_shared_one(self):
+        shared = SharedPolicy()
+
+        with rate_limit_policy(shared), shared.caller(RateLimitPolicy.WAIT):
+            assert current_policy() is RateLimitPolicy.WAIT
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("120", default=60) == 120
+
+    def test_http_date(self):
+        retry_at = datetime.now(UTC) + timedelta(seconds=90)
+
+        assert parse_retry_after(format_datetime(retry_at, usegmt=True), 60) == (
+            pytest.approx(90, abs=2)
+        )
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None, default=60) == 60
+        assert parse_retry_after("soon", default=60) == 60
+
+
+class TestClientRateLimiting:
+    @pytest.mark.asyncio
+    async def test_retries_after_429(self):
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0.05"}),
+            httpx.Response(200, json=[]),
+        ]
+        client = mock_api_client(lambda request: responses.pop(0))
+
+        result = await client.get_hops_list()
+
+        assert result.root == []
+        assert responses == []
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_on_429_pauses_bucket(self):
+        client = mock_api_client(
+            lambda request: httpx.Response(429, headers={"Retry-After": "30"})
+        )
+
+        with rate_limit_policy(RateLimitPolicy.FAIL_FAST):
+            with pytest.raises(RateLimitExceeded):
+                await client.get_hops_list()
+
+            # Every later call fails fast without reaching the server.
+            with pytest.raises(RateLimitExceeded) as exc_info:
+                await client.get_yeasts_list()
+
+        assert exc_info.value.retry_after == pytest.approx(30, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_quota_is_shared_by_all_methods(self):
+        client = mock_api_client(
+            lambda request: httpx.Response(200, json=[]),
+            requests_per_hour=2,
+            rate_limit_policy=RateLimitPolicy.FAIL_FAST,
+        )
+
+        await client.get_hops_list()
+        await client.get_yeasts_list()
+
+        with pytest.raises(RateLimitExceeded):
+            await client.get_fermentables_list()
+
+    @pytest.mark.asyncio
+    async def test_error_status_is_raised(self):
+        client = mock_api_client(lambda request: httpx.Response(404))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_hop_detail("missing")
@@ -0,0 +1,81 @@
+import pytest
+from conftest import async_items, hop_payload
+
+from brewfather_mcp.categories import HOPS
+from brewfather_mcp.rendering import Renderer, render_page, render_rows
+from brewfather_mcp.types import Hop, HopDetail
+
+
+class TestRenderer:
+    def test_renders_labels_values_and_suffixes(self):
+        renderer = Renderer[Hop](
+            (
+                ("Name", "name"),
+                ("Quantity", "inventory", "grams"),
+                ("Label", lambda hop: hop.name.upper()),
+            )
+        )
+
+        assert renderer.render(Hop.model_validate(hop_payload("a"))) == (
+            "Name: Hop a\nQuantity: 70.0 grams\nLabel: HOP A\n"
+        )
+
+    def test_nested_attributes(self):
+        hop = HopDetail.model_validate(hop_payload("a"))
+
+        assert Renderer[HopDetail]((("Created", "created.seconds"),)).render(hop) == (
+            "Created: 1600000000\n"
+        )
+
+    def test_compact_drops_empty_fields(self):
+        hop = HopDetail.model_validate(hop_payload("a"))
+
+        full = HOPS.render_detail.render(hop)
+        compact = HOPS.render_detail.render(hop, compact=True)
+
+        assert "Beta: None\n" in full
+        assert "Notes: \n" in full
+        assert "Beta:" not in compact
+        assert "Notes:" not in compact
+        assert "Name: Hop a\n" in compact
+        assert "Hidden: False\n" in compact
+        assert len(compact) < len(full) / 2
+
+
+class TestRenderRows:
+    def test_rows_are_separated_by_a_blank_line(self):
+        rows = [{"Name": "a", "Lot #": ""}, {"Name": "b", "Lot #": "L1"}]
+
+        assert render_rows(rows) == "Name: a\nLot #: \n\nName: b\nLot #: L1\n\n"
+        assert render_rows(rows, compact=True) == "Name: a\n\nName: b\nLot #: L1\n\n"
+
+
+class TestRenderPage:
+    @pytest.mark.asyncio
+    async def test_stops_at_the_budget(self):
+        hops = [Hop.model_validate(hop_payload(f"hop-{i}")) for i in range(10)]
+        block = HOPS.render_item.render(hops[0])
+        consumed = []
+
+        async def items():
+            for hop in hops:
+                consumed.append(hop)
+                yield hop
+
+        page, last = await render_page(
+            items(), HOPS.render_item, max_bytes=3 * len(block) + 2 * len("---\n")
+        )
+
+        assert page.count("Identifier:") == 3
+        assert last is hops[2]
+        assert len(consumed) == 4
+
+    @pytest.mark.asyncio
+    async def test_last_page_and_oversized_items(self):
+        hops = [Hop.model_validate(hop_payload(f"hop-{i}")) for i in range(2)]
+
+        page, last = await render_page(async_items(hops), HOPS.render_item, 10_000)
+        assert (page.count("Identifier:"), last) == (2, None)
+
+        page, last = await render_page(async_items(hops), HOPS.render_item, 1)
+        assert (page.count("Identifier:"), last) == (1, hops[0])
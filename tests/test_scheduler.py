@@ -0,0 +1,71 @@
+import pytest
+from conftest import FakeClock, FakeInventory, mock_api_client
+
+from brewfather_mcp.categories import HOPS
+from brewfather_mcp.scheduler import RefreshScheduler
+
+
+def scheduler(inventory: FakeInventory, **kwargs) -> tuple[RefreshScheduler, FakeClock]:
+    clock = FakeClock(1000.0)
+    client = mock_api_client(inventory.handler, cache_list_ttl=0)
+    return RefreshScheduler(client, [HOPS], interval=100, clock=clock, **kwargs), clock
+
+
+class TestRefreshScheduler:
+    @pytest.mark.asyncio
+    async def test_warms_up_then_adapts_to_change_frequency(self):
+        inventory = FakeInventory(5)
+        refresh, clock = scheduler(inventory)
+
+        assert await refresh.tick() == 100
+        assert refresh.stats().categories[0].requests == 1
+
+        clock.now += 100
+        assert await refresh.tick() == 150
+
+        inventory.update("hop-001", inventory=1)
+        clock.now += 150
+        assert await refresh.tick() == 75
+
+        stats = refresh.stats()
+        schedule = stats.categories[0]
+        assert (schedule.runs, schedule.last_changed, schedule.next_run_in) == (
+            3,
+            1,
+            75,
+        )
+        assert stats.requests == len(inventory.requests) == 3
+        assert stats.requests_per_hour == pytest.approx(3 * 3600 / 250)
+        await refresh._client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_backs_off_under_interactive_load(self):
+        inventory = FakeInventory(5)
+        refresh, clock = scheduler(inventory, busy_requests_per_minute=5)
+        _ = await refresh.tick()
+
+        clock.now += 150
+        # Requests made by tool calls in the meantime.
+        refresh._client.requests_made += 20
+
+        assert await refresh.tick() == 10
+        assert refresh.stats().deferrals == 1
+        assert refresh.stats().categories[0].runs == 1
+
+        clock.now += 10
+        assert await refresh.tick() == 150
+        await refresh._client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_keeps_the_quota_reserve_for_interactive_calls(self):
+        inventory = FakeInventory(5)
+        refresh, _ = scheduler(inventory, quota_reserve=0.5)
+        limiter = refresh._client.rate_limiter
+        limiter._tokens = limiter.capacity * 0.1
+
+        delay = await refresh.tick()
+
+        assert inventory.requests == []
+        assert delay == pytest.approx(0.15 * limiter.capacity / limiter.refill_rate)
+        assert refresh.stats().deferrals == 1
+        await refresh._client.aclose()
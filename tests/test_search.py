@@ -0,0 +1,120 @@
+import httpx
+import pytest
+from conftest import hop_payload, mock_api_client
+
+from brewfather_mcp.categories import HOPS
+from brewfather_mcp.search import NameIndex, trigrams
+from brewfather_mcp.types import (
+    Fermentable,
+    Hop,
+    InventoryCategory,
+    YeastDetail,
+)
+
+
+def hop(id: str, name: str) -> Hop:
+    return Hop.model_validate(hop_payload(id, name=name))
+
+
+def yeast(id: str, name: str, product_id: str) -> YeastDetail:
+    return YeastDetail.model_validate(
+        hop_payload(
+            id,
+            attenuation=81,
+            inventory=1,
+            name=name,
+            type="Ale",
+            laboratory="Fermentis",
+            productId=product_id,
+            form="Dry",
+        )
+    )
+
+
+def fermentable(id: str, name: str, supplier: str) -> Fermentable:
+    return Fermentable(_id=id, inventory=1, name=name, supplier=supplier, type="Grain")
+
+
+@pytest.fixture
+def index() -> NameIndex:
+    index = NameIndex()
+    index.update(
+        InventoryCategory.HOPS,
+        [hop("hop-1", "Citra"), hop("hop-2", "Citra Cryo"), hop("hop-3", "Saaz")],
+    )
+    index.update(
+        InventoryCategory.FERMENTABLES,
+        [fermentable("malt-1", "Pilsner Malt", "Weyermann")],
+    )
+    return index
+
+
+class TestNameIndex:
+    def test_trigrams_ignore_case_and_spacing(self):
+        assert trigrams("Citra") == trigrams("  citra ")
+        assert "  c" in trigrams("Citra")
+
+    def test_ranks_closest_names_first(self, index: NameIndex):
+        matches = index.search("citra")
+
+        assert [match.id for match in matches] == ["hop-1", "hop-2"]
+        assert matches[0].score == 1.0
+        assert matches[0].category == InventoryCategory.HOPS
+
+    def test_tolerates_typos(self, index: NameIndex):
+        assert index.search("pilsener malt")[0].id == "malt-1"
+
+    def test_matches_suppliers_and_product_ids(self, index: NameIndex):
+        index.update(
+            InventoryCategory.YEASTS, [yeast("yeast-1", "Safale American", "US-05")]
+        )
+
+        by_supplier = index.search("weyerman")[0]
+        by_product = index.search("us05")[0]
+
+        assert (by_supplier.id, by_supplier.field) == ("malt-1", "supplier")
+        assert (by_product.id, by_product.field, by_product.value) == (
+            "yeast-1",
+            "product_id",
+            "US-05",
+        )
+
+    def test_filters_by_category(self, index: NameIndex):
+        assert index.search("citra", [InventoryCategory.FERMENTABLES]) == []
+
+    def test_update_reindexes_changes_and_drops_missing_items(self, index: NameIndex):
+        index.update(
+            InventoryCategory.HOPS, [hop("hop-1", "Mosaic"), hop("hop-3", "Saaz")]
+        )
+
+        assert [match.id for match in index.search("citra")] == []
+        assert index.search("mosaic")[0].id == "hop-1"
+        assert len(index) == 3
+
+
+class TestClientNameIndex:
+    @pytest.mark.asyncio
+    async def test_built_from_the_list_and_kept_up_to_date_by_syncs(self):
+        docs = {"hop-1": hop_payload("hop-1", name="Citra")}
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=list(docs.values()))
+
+        client = mock_api_client(handler, cache_list_ttl=0)
+
+        await client.index_names(HOPS)
+        await client.index_names(HOPS)
+        assert len(requests) == 1
+        assert "complete" not in requests[0].url.params
+        assert client.names.search("citra")[0].id == "hop-1"
+
+        docs["hop-2"] = hop_payload("hop-2", name="Nelson Sauvin")
+        del docs["hop-1"]
+        _ = await client.get_hops_detail_list()
+
+        assert client.names.search("nelson")[0].id == "hop-2"
+        # The first full sync prunes what the list had, not only the replica.
+        assert client.names.search("citra") == []
+        await client.aclose()
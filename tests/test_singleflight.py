@@ -0,0 +1,148 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from conftest import hop_payload, mock_api_client
+
+from brewfather_mcp.categories import HOPS
+from brewfather_mcp.metrics import REGISTRY
+from brewfather_mcp.ratelimit import RateLimitPolicy, count_requests, rate_limit_policy
+from brewfather_mcp.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def fetch() -> object:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return object()
+
+        waiters = [
+            asyncio.create_task(single_flight.do("key", fetch)) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        stats = single_flight.stats()
+        assert (stats.calls, stats.deduplicated, stats.in_flight) == (5, 4, 0)
+        assert stats.dedupe_ratio == pytest.approx(0.8)
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        single_flight = SingleFlight()
+
+        async def fetch() -> int:
+            return 1
+
+        await single_flight.do("key", fetch)
+        await single_flight.do("key", fetch)
+
+        assert single_flight.stats().deduplicated == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self):
+        single_flight = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            single_flight.do("key", fail),
+            single_flight.do("key", fail),
+            return_exceptions=True,
+        )
+
+        assert [type(result) for result in results] == [ValueError, ValueError]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_call(self):
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch() -> str:
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(single_flight.do("key", fetch))
+        second = asyncio.create_task(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        _ = first.cancel()
+        release.set()
+
+        assert await second == "done"
+
+
+class TestClientCoalescing:
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_one_request(self):
+        requests: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=hop_payload("a"))
+
+        client = mock_api_client(handler)
+
+        hops = await asyncio.gather(*[client.get_hop_detail("a") for _ in range(4)])
+
+        assert len(requests) == 1
+        assert all(hop is hops[0] for hop in hops)
+        assert client.single_flight.stats().deduplicated == 3
+        with patch("brewfather_mcp.server.brewfather_client", client):
+            exposition = REGISTRY.render_prometheus()
+        assert 'brewfather_single_flight_dedupe_ratio{tenant=""} 0.75' in exposition
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_waiting_caller_is_not_failed_by_a_fail_fast_one(self):
+        entered, release = asyncio.Event(), asyncio.Event()
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0.05"}),
+            httpx.Response(200, json=[hop_payload("a")]),
+        ]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            entered.set()
+            await release.wait()
+            return responses.pop(0)
+
+        client = mock_api_client(handler)
+
+        async def scheduled() -> int:
+            with (
+                rate_limit_policy(RateLimitPolicy.FAIL_FAST),
+                count_requests() as spent,
+            ):
+                _ = await client.refresh(HOPS)
+            return spent.requests
+
+        async def interactive() -> int:
+            with count_requests() as spent:
+                hops = await client.get_hops_detail_list()
+            assert [hop.id for hop in hops] == ["a"]
+            return spent.requests
+
+        refresh = asyncio.create_task(scheduled())
+        await entered.wait()
+        joined = asyncio.create_task(interactive())
+        while not client.single_flight.stats().deduplicated:
+            await asyncio.sleep(0)
+        release.set()
+
+        # The retry after the 429 waits, counted once, by the caller that
+        # started the sync.
+        assert await refresh == 2
+        assert await joined == 0
+        await client.aclose()
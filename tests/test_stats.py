@@ -0,0 +1,111 @@
+import math
+
+import pytest
+from conftest import hop_payload
+
+from brewfather_mcp.categories import FERMENTABLES, HOPS, MISCS, YEASTS
+from brewfather_mcp.stats import ColumnarSnapshot, category_stats, snapshot_for
+from brewfather_mcp.types import FermentableDetail, HopDetail, MiscDetail, YeastDetail
+
+
+def fermentable(id: str, inventory: float, grain_category: str | None, cost=None):
+    return FermentableDetail.model_validate(
+        hop_payload(
+            id,
+            inventory=inventory,
+            supplier="Weyermann",
+            type="Grain",
+            potential=1.037,
+            grainCategory=grain_category,
+            costPerAmount=cost,
+        )
+    )
+
+
+def hop(id: str, inventory: float, alpha: float, origin: str | None, cost=None):
+    return HopDetail.model_validate(
+        hop_payload(
+            id, inventory=inventory, alpha=alpha, origin=origin, costPerAmount=cost
+        )
+    )
+
+
+def yeast(id: str, inventory: float, laboratory: str):
+    return YeastDetail.model_validate(
+        hop_payload(
+            id, inventory=inventory, laboratory=laboratory, attenuation=80, type="Ale"
+        )
+    )
+
+
+class TestColumnarSnapshot:
+    def test_missing_values_are_left_out_of_aggregates(self):
+        hops = [hop("a", 100, 10, "US", cost=0.1), hop("b", 50, 4, None)]
+        snapshot = ColumnarSnapshot(hops, ("inventory", "cost_per_amount"), ("origin",))
+
+        assert math.isnan(snapshot.numbers["cost_per_amount"][1])
+        assert snapshot.total("inventory") == 150
+        assert snapshot.product_total("inventory", "cost_per_amount") == 10
+        assert snapshot.sum_by("origin", "inventory") == {"US": 100, "Unknown": 50}
+
+    def test_weighted_mean_skips_empty_stock(self):
+        hops = [hop("a", 100, 10, "US"), hop("b", 300, 6, "US"), hop("c", 0, 20, "US")]
+        snapshot = ColumnarSnapshot(hops, ("alpha", "inventory"))
+
+        assert snapshot.weighted_mean("alpha", "inventory") == pytest.approx(7)
+        assert (
+            ColumnarSnapshot([], ("alpha", "inventory")).weighted_mean(
+                "alpha", "inventory"
+            )
+            is None
+        )
+
+    def test_snapshot_is_rebuilt_only_when_the_list_changes(self):
+        hops = [hop("a", 100, 10, "US")]
+
+        snapshots = {}
+        first = snapshot_for(snapshots, HOPS, hops)
+
+        assert snapshot_for(snapshots, HOPS, hops) is first
+        assert snapshot_for(snapshots, HOPS, list(hops)) is not first
+        assert snapshot_for({}, HOPS, hops) is not first
+
+
+class TestCategoryStats:
+    def test_fermentables_split_base_and_specialty_malt(self):
+        malts = [
+            fermentable("pils", 25, "Base", cost=2),
+            fermentable("crystal", 2, "Caramel/Crystal", cost=4),
+            fermentable("choc", 1, "Roasted"),
+            fermentable("sugar", 3, None),
+        ]
+
+        row = category_stats(FERMENTABLES, snapshot_for({}, FERMENTABLES, malts))
+
+        assert row["Total"] == "31 kg"
+        assert row["Base malt"] == "25 kg"
+        assert row["Specialty malt"] == "3 kg"
+        assert row["By grain category"] == (
+            "Base 25 kg, Unknown 3 kg, Caramel/Crystal 2 kg, Roasted 1 kg"
+        )
+        assert row["Value"] == 58
+
+    def test_hops_yeasts_and_miscs(self):
+        hops = [hop("a", 100, 12, "US"), hop("b", 100, 4, "DE")]
+        yeasts = [yeast("y1", 2, "Fermentis"), yeast("y2", 1, "Fermentis")]
+        miscs = [
+            MiscDetail.model_validate(
+                hop_payload("m", inventory=120, unit="g", type="Water Agent")
+            )
+        ]
+
+        hop_row = category_stats(HOPS, snapshot_for({}, HOPS, hops))
+        yeast_row = category_stats(YEASTS, snapshot_for({}, YEASTS, yeasts))
+        misc_row = category_stats(MISCS, snapshot_for({}, MISCS, miscs))
+
+        assert hop_row["By origin"] == "DE 100 g, US 100 g"
+        assert hop_row["By type"] == "Pellet 200 g"
+        assert hop_row["Weighted average alpha acid"] == "8.00%"
+        assert yeast_row["By laboratory"] == "Fermentis 3 pkg"
+        assert misc_row["By unit"] == "120 g"
+        assert misc_row["Value"] == 0
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from conftest import hop_payload, mock_api_client
+
+from brewfather_mcp.store import InventoryStore
+from brewfather_mcp.types import HopDetail, InventoryCategory
+
+
+def hop(id: str, rev: str = "rev-1", **overrides: object) -> HopDetail:
+    return HopDetail.model_validate(
+        hop_payload(id, _rev=rev, bestBeforeDate=1735689600000, **overrides)
+    )
+
+
+class TestInventoryStore:
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path):
+        store = InventoryStore(tmp_path / "cache.db")
+        hops = [hop("b"), hop("a")]
+
+        assert await store.load(InventoryCategory.HOPS, HopDetail) is None
+
+        await store.save(InventoryCategory.HOPS, hops)
+        stored = await store.load(InventoryCategory.HOPS, HopDetail)
+
+        assert stored is not None
+        assert stored.items == sorted(hops, key=lambda item: item.id)
+        assert stored.age < 5
+        assert await store.load(InventoryCategory.YEASTS, HopDetail) is None
+
+    @pytest.mark.asyncio
+    async def test_save_replaces_changed_and_deleted_items(self, tmp_path):
+        store = InventoryStore(tmp_path / "cache.db")
+        await store.save(InventoryCategory.HOPS, [hop("a"), hop("b")])
+
+        await store.save(
+            InventoryCategory.HOPS, [hop("a", rev="rev-2", inventory=5), hop("c")]
+        )
+        stored = await store.load(InventoryCategory.HOPS, HopDetail)
+
+        assert stored is not None
+        assert [(item.id, item.rev, item.inventory) for item in stored.items] == [
+            ("a", "rev-2", 5),
+            ("c", "rev-1", 70),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, tmp_path):
+        await InventoryStore(tmp_path / "cache.db").save(
+            InventoryCategory.HOPS, [hop("a")]
+        )
+
+        stored = await InventoryStore(tmp_path / "cache.db").load(
+            InventoryCategory.HOPS, HopDetail
+        )
+
+        assert stored is not None
+        assert stored.items[0].best_before_date == hop("a").best_before_date
+
+
+class TestStaleWhileRevalidate:
+    @pytest.mark.asyncio
+    async def test_cold_start_is_served_from_disk(self, tmp_path):
+        await InventoryStore(tmp_path / "cache.db").save(
+            InventoryCategory.HOPS, [hop("a")]
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("fresh data must not hit the network")
+
+        client = mock_api_client(handler, store_path=str(tmp_path / "cache.db"))
+
+        result = await client.get_hops_detail_list()
+
+        assert [item.id for item in result] == ["a"]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stale_data_is_returned_and_refreshed(self, tmp_path):
+        store = InventoryStore(tmp_path / "cache.db")
+        await store.save(InventoryCategory.HOPS, [hop("a")])
+        # Backdate the category so it is stale but within max staleness.
+        with store._connect() as connection:
+            _ = connection.execute(
+                "UPDATE categories SET fetched_at = ?", (time.time() - 600,)
+            )
+
+        served = asyncio.Event()
+        refreshed = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await served.wait()
+            refreshed.set()
+            return httpx.Response(200, json=[hop_payload("a"), hop_payload("b")])
+
+        client = mock_api_client(handler, store_path=str(tmp_path / "cache.db"))
+
+        result = await client.get_hops_detail_list()
+        served.set()
+
+        assert [item.id for item in result] == ["a"]
+        await asyncio.wait_for(refreshed.wait(), timeout=1)
+        await asyncio.gather(*client._revalidations.values())
+
+        assert [item.id for item in await client.get_hops_detail_list()] == ["a", "b"]
+        stored = await store.load(InventoryCategory.HOPS, HopDetail)
+        assert stored is not None
+        assert len(stored.items) == 2
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_too_stale_data_is_fetched(self, tmp_path):
+        store = InventoryStore(tmp_path / "cache.db")
+        await store.save(InventoryCategory.HOPS, [hop("a")])
+        with store._connect() as connection:
+            _ = connection.execute(
+                "UPDATE categories SET fetched_at = ?", (time.time() - 7200,)
+            )
+
+        client = mock_api_client(
+            lambda request: httpx.Response(200, json=[hop_payload("b")]),
+            store_path=str(tmp_path / "cache.db"),
+            store_max_staleness=3600,
+        )
+
+        result = await client.get_hops_detail_list()
+
+        assert [item.id for item in result] == ["b"]
+        await client.aclose()
@@ -0,0 +1,172 @@
+import pytest
+from conftest import FakeInventory, hop_payload, mock_api_client
+
+from brewfather_mcp.api import BrewfatherInventoryClient
+from brewfather_mcp.store import InventoryStore
+from brewfather_mcp.sync import SyncMode
+from brewfather_mcp.types import HopDetail, InventoryCategory
+
+HOPS = InventoryCategory.HOPS
+
+
+def sync_client(
+    inventory: FakeInventory, **config: object
+) -> BrewfatherInventoryClient:
+    return mock_api_client(inventory.handler, cache_list_ttl=0, **config)
+
+
+async def sync_hops(client: BrewfatherInventoryClient):
+    return await client.sync.sync(HOPS, HopDetail, client.get_hop_detail)
+
+
+class TestInventorySync:
+    @pytest.mark.asyncio
+    async def test_unchanged_category_costs_one_request(self):
+        inventory = FakeInventory(120)
+        client = sync_client(inventory)
+
+        full = await sync_hops(client)
+        delta = await sync_hops(client)
+
+        assert (full.mode, full.requests, full.changed) == (SyncMode.FULL, 3, 120)
+        assert (delta.mode, delta.requests, delta.changed) == (SyncMode.DELTA, 1, 0)
+        assert inventory.requests[-1].url.params["order_by"] == "_timestamp_ms"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_delta_picks_up_changed_items(self):
+        inventory = FakeInventory(60)
+        client = sync_client(inventory)
+        _ = await sync_hops(client)
+
+        inventory.update("hop-007", inventory=5)
+        inventory.update("hop-060", name="New hop")
+        result = await sync_hops(client)
+        hops = await client.get_hops_detail_list()
+
+        assert (result.mode, result.requests, result.changed) == (
+            SyncMode.DELTA,
+            1,
+            2,
+        )
+        assert len(hops) == 61
+        assert next(hop for hop in hops if hop.id == "hop-007").inventory == 5
+        assert (await client.get_hop_detail("hop-060")).name == "New hop"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_delta_rereads_timestamps_shared_across_pages(self):
+        inventory = FakeInventory(120)
+        client = sync_client(inventory)
+        _ = await sync_hops(client)
+
+        # 48 distinct timestamps, then four documents sharing one that the
+        # first page of 50 cuts in half.
+        for i in range(48):
+            inventory.update(f"hop-{i:03}")
+        for i in range(48, 52):
+            inventory.hops[f"hop-{i:03}"] = hop_payload(
+                f"hop-{i:03}", _rev="tied", _timestamp_ms=1120
+            )
+        result = await sync_hops(client)
+        hops = await client.get_hops_detail_list()
+
+        assert (result.mode, result.requests, result.changed) == (
+            SyncMode.DELTA,
+            2,
+            52,
+        )
+        assert {hop.rev for hop in hops if hop.id in {"hop-048", "hop-051"}} == {"tied"}
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_page_of_one_timestamp_falls_back_to_full_refresh(self):
+        inventory = FakeInventory(120)
+        client = sync_client(inventory)
+        _ = await sync_hops(client)
+
+        for i in range(60):
+            inventory.hops[f"hop-{i:03}"] = hop_payload(
+                f"hop-{i:03}", _rev="tied", _timestamp_ms=2000
+            )
+        result = await sync_hops(client)
+
+        assert (result.mode, result.changed) == (SyncMode.FULL, 120)
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_reconcile_drops_deleted_items(self):
+        inventory = FakeInventory(10)
+        client = sync_client(inventory, sync_reconcile_interval=0)
+        _ = await sync_hops(client)
+
+        del inventory.hops["hop-003"]
+        result = await sync_hops(client)
+        hops = await client.get_hops_detail_list()
+
+        assert (result.mode, result.requests, result.deleted) == (SyncMode.DELTA, 2, 1)
+        assert "hop-003" not in [hop.id for hop in hops]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_drift_triggers_full_refresh(self):
+        inventory = FakeInventory(10)
+        client = sync_client(inventory, sync_reconcile_interval=0)
+        _ = await sync_hops(client)
+
+        # An item the delta can't see, e.g. restored with an old timestamp.
+        inventory.hops["hop-old"] = hop_payload("hop-old", _timestamp_ms=1)
+        result = await sync_hops(client)
+
+        assert result.mode is SyncMode.FULL
+        assert len(await client.get_hops_detail_list()) == 11
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_large_delta_falls_back_to_full_refresh(self):
+        inventory = FakeInventory(120)
+        client = sync_client(inventory, sync_max_delta_pages=2)
+        _ = await sync_hops(client)
+
+        for i in range(110):
+            inventory.update(f"hop-{i:03}", inventory=i)
+        result = await sync_hops(client)
+
+        assert (result.mode, result.changed) == (SyncMode.FULL, 120)
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_store_watermark(self, tmp_path):
+        inventory = FakeInventory(60)
+        client = sync_client(inventory, store_path=str(tmp_path / "cache.db"))
+        _ = await sync_hops(client)
+        await client.aclose()
+
+        inventory.update("hop-001", inventory=1)
+        restarted = sync_client(inventory, store_path=str(tmp_path / "cache.db"))
+        result = await sync_hops(restarted)
+        stored = await InventoryStore(tmp_path / "cache.db").load(HOPS, HopDetail)
+
+        assert (result.mode, result.requests, result.changed) == (
+            SyncMode.DELTA,
+            1,
+            1,
+        )
+        assert stored is not None
+        assert stored.watermark == inventory.clock
+        assert next(hop for hop in stored.items if hop.id == "hop-001").inventory == 1
+        await restarted.aclose()
+
+    @pytest.mark.asyncio
+    async def test_reports_progress_per_page(self):
+        inventory = FakeInventory(120)
+        client = sync_client(inventory)
+        progress: list[tuple[int, int | None]] = []
+
+        async def on_progress(fetched: int, total: int | None) -> None:
+            progress.append((fetched, total))
+
+        _ = await client.get_hops_detail_list(on_progress)
+
+        assert progress == [(50, None), (100, None), (120, None), (120, 120)]
+        await client.aclose()
@@ -0,0 +1,250 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from brewfather_mcp.config import ClientConfig, ServerConfig
+from brewfather_mcp.server import (
+    get_client,
+    http_app,
+    lifespan,
+    mcp,
+    read_server_metrics,
+)
+from brewfather_mcp.tenants import (
+    Credentials,
+    TenantMiddleware,
+    TenantRegistry,
+    current_tenant,
+    load_credentials,
+)
+
+CREDENTIALS = {
+    name: Credentials(f"{name}-user", f"{name}-key", f"{name}-token")
+    for name in ("ale", "lager", "mead")
+}
+
+
+def registry(max_tenants: int = 2, **config: object) -> TenantRegistry:
+    return TenantRegistry(
+        CREDENTIALS,
+        ClientConfig(base_url="http://test/v2", **config),  # type: ignore[arg-type]
+        max_tenants=max_tenants,
+    )
+
+
+class TestTenantRegistry:
+    @pytest.mark.asyncio
+    async def test_tenants_are_isolated(self):
+        tenants = registry(max_connections=10, cache_max_bytes=1000)
+
+        ale, lager = tenants.client("ale"), tenants.client("lager")
+
+        assert tenants.client("ale") is ale
+        assert ale.auth._auth_header != lager.auth._auth_header
+        assert ale.cache is not lager.cache
+        assert ale.rate_limiter is not lager.rate_limiter
+        assert ale.config.max_connections == 5
+        assert ale.config.cache_max_bytes == 500
+        await tenants.aclose()
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_idle_tenant_is_evicted(self):
+        tenants = registry()
+        ale = tenants.client("ale")
+        lager = tenants.client("lager")
+        _ = tenants.client("ale")
+
+        _ = tenants.client("mead")
+
+        assert tenants.stats().evictions == 1
+        assert tenants.client("ale") is ale
+        assert tenants.client("lager") is not lager
+        await tenants.aclose()
+
+    @pytest.mark.asyncio
+    async def test_busy_tenants_are_not_evicted(self):
+        tenants = registry(max_tenants=1)
+        ale = tenants.client("ale")
+        ale.requests_in_flight = 1
+
+        _ = tenants.client("lager")
+
+        assert tenants.stats().active == 2
+        assert tenants.client("ale") is ale
+        ale.requests_in_flight = 0
+        await tenants.aclose()
+
+    @pytest.mark.asyncio
+    async def test_held_tenants_are_closed_once_released(self):
+        tenants = registry(max_tenants=1)
+        with tenants.hold("ale"):
+            ale = tenants.client("ale")
+            ale.aclose = AsyncMock()
+
+            _ = tenants.client("lager")
+
+            assert tenants.clients().keys() == {"ale", "lager"}
+
+        await asyncio.sleep(0)
+        assert tenants.clients().keys() == {"lager"}
+        ale.aclose.assert_awaited_once()
+        await tenants.aclose()
+
+    def test_each_tenant_gets_its_own_store(self, tmp_path):
+        tenants = registry(store_path=str(tmp_path / "inventory.db"))
+
+        client = tenants.client("ale")
+
+        assert client.store is not None
+        assert client.store.path == tmp_path / "inventory-ale.db"
+
+    def test_credentials_are_loaded_from_json(self, tmp_path):
+        path = tmp_path / "tenants.json"
+        ale = {"user_id": "u", "api_key": "k", "token": "t"}
+        _ = path.write_text(json.dumps({"ale": ale}))
+
+        assert load_credentials(path) == {"ale": Credentials("u", "k", "t")}
+
+        del ale["token"]
+        _ = path.write_text(json.dumps({"ale": ale}))
+        with pytest.raises(ValueError, match="no token"):
+            _ = load_credentials(path)
+
+    @pytest.mark.asyncio
+    async def test_get_client_serves_the_current_tenant(self):
+        tenants = registry()
+        with patch("brewfather_mcp.server.get_tenants", return_value=tenants):
+            token = current_tenant.set("lager")
+            try:
+                assert get_client() is tenants.client("lager")
+            finally:
+                current_tenant.reset(token)
+
+        await tenants.aclose()
+
+    @pytest.mark.asyncio
+    async def test_server_metrics_only_show_the_own_client(self):
+        tenants = registry()
+        _ = tenants.client("ale"), tenants.client("lager")
+
+        token = current_tenant.set("ale")
+        try:
+            with patch("brewfather_mcp.server.tenant_registry", tenants):
+                report = await read_server_metrics()
+        finally:
+            current_tenant.reset(token)
+
+        assert "Tenant: ale" in report
+        assert "lager" not in report
+        assert "Tool calls" not in report
+        await tenants.aclose()
+
+    @pytest.mark.asyncio
+    async def test_refresh_scheduler_is_refused(self):
+        with (
+            patch(
+                "brewfather_mcp.server.server_config",
+                ServerConfig(refresh_scheduler=True, tenants_file="tenants.json"),
+            ),
+            pytest.raises(ValueError, match="BREWFATHER_TENANTS_FILE"),
+        ):
+            async with lifespan(mcp):
+                pass
+
+
+class TestTenantMiddleware:
+    @pytest.fixture
+    def http(self):
+        async def whoami(_request: Request) -> PlainTextResponse:
+            return PlainTextResponse(str(current_tenant.get()))
+
+        app = Starlette(
+            routes=[
+                Route("/sse", whoami),
+                Route("/messages/", whoami, methods=["POST"]),
+            ]
+        )
+        app.add_middleware(
+            TenantMiddleware, registry=registry(), exempt_paths=("/messages/",)
+        )
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        )
+
+    @pytest.mark.asyncio
+    async def test_tenant_comes_from_header_or_query(self, http):
+        async with http:
+            by_header = await http.get(
+                "/sse",
+                headers={
+                    "X-Brewfather-Tenant": "ale",
+                    "Authorization": "Bearer ale-token",
+                },
+            )
+            by_query = await http.get(
+                "/sse",
+                params={"tenant": "mead"},
+                headers={"Authorization": "Bearer mead-token"},
+            )
+
+        assert by_header.text == "ale"
+        assert by_query.text == "mead"
+
+    @pytest.mark.asyncio
+    async def test_unknown_or_missing_tenant_is_refused(self, http):
+        async with http:
+            unknown = await http.get("/sse", params={"tenant": "cider"})
+            missing = await http.get("/sse")
+            message = await http.post("/messages/")
+
+        assert unknown.status_code == missing.status_code == 403
+        assert message.text == "None"
+
+    @pytest.mark.asyncio
+    async def test_token_of_another_tenant_is_refused(self, http):
+        async with http:
+            other = await http.get(
+                "/sse",
+                params={"tenant": "ale"},
+                headers={"Authorization": "Bearer mead-token"},
+            )
+            none = await http.get("/sse", params={"tenant": "ale"})
+
+        assert other.status_code == none.status_code == 401
+        assert other.headers["WWW-Authenticate"] == "Bearer"
+
+    @pytest.mark.asyncio
+    async def test_metrics_need_their_own_token(self):
+        with (
+            patch(
+                "brewfather_mcp.server.server_config",
+                ServerConfig(metrics_token="scraper-token"),
+            ),
+            patch("brewfather_mcp.server.tenant_registry", registry()),
+        ):
+            transport = httpx.ASGITransport(app=http_app("sse"))
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as http:
+                anonymous = await http.get("/metrics")
+                tenant = await http.get(
+                    "/metrics",
+                    headers={
+                        "X-Brewfather-Tenant": "ale",
+                        "Authorization": "Bearer ale-token",
+                    },
+                )
+                scraper = await http.get(
+                    "/metrics", headers={"Authorization": "Bearer scraper-token"}
+                )
+
+        assert anonymous.status_code == tenant.status_code == 401
+        assert scraper.status_code == 200
+        assert "# TYPE mcp_handler_seconds histogram" in scraper.text
@@ -0,0 +1,138 @@
+import asyncio
+import json
+from collections.abc import Sequence
+
+import httpx
+import pytest
+from conftest import hop_payload, mock_api_client
+
+from brewfather_mcp.categories import HOPS
+from brewfather_mcp.inventory import get_category_summary
+from brewfather_mcp.tracing import (
+    JsonlExporter,
+    OtlpExporter,
+    Span,
+    Tracer,
+    set_tracer,
+    span,
+)
+
+
+class MemoryExporter:
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+
+def tracer(sample: float = 0.0, rate: float = 1.0) -> tuple[Tracer, MemoryExporter]:
+    exporter = MemoryExporter()
+    return Tracer([exporter], sample_rate=rate, random=lambda: sample), exporter
+
+
+class TestTracer:
+    @pytest.mark.asyncio
+    async def test_children_link_to_their_parent_across_tasks(self):
+        traces, exporter = tracer()
+
+        async def child(i: int) -> None:
+            with traces.span("child", index=i):
+                await asyncio.sleep(0)
+
+        with traces.span("root") as root:
+            _ = await asyncio.gather(child(0), child(1))
+        with pytest.raises(ValueError), traces.span("failing"):
+            raise ValueError("boom")
+        assert traces.flush()
+
+        children = [span for span in exporter.spans if span.name == "child"]
+        assert {span.parent_id for span in children} == {root.span_id}
+        assert {span.trace_id for span in children} == {root.trace_id}
+        assert sorted(span.attributes["index"] for span in children) == [0, 1]
+        failing = exporter.spans[-1]
+        assert failing.parent_id is None
+        assert failing.trace_id != root.trace_id
+        assert failing.error == "ValueError: boom"
+        traces.shutdown()
+
+    def test_unsampled_traces_record_nothing(self):
+        traces, exporter = tracer(sample=0.9, rate=0.5)
+
+        with traces.span("root") as root, traces.span("child") as child:
+            child.set(ignored=True)
+
+        assert traces.flush()
+        assert exporter.spans == []
+        assert not root.sampled and child.attributes == {}
+        traces.shutdown()
+
+    def test_tracer_without_exporters_is_a_no_op(self):
+        traces = Tracer()
+
+        with traces.span("root") as root:
+            assert not root.sampled
+
+        assert traces.processor is None
+
+
+class TestExporters:
+    def test_jsonl_lines(self, tmp_path):
+        path = tmp_path / "traces" / "spans.jsonl"
+        traces = Tracer([JsonlExporter(path)])
+        with traces.span("root", category="hops"), traces.span("child"):
+            pass
+        assert traces.flush()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["name"] for line in lines] == ["child", "root"]
+        assert lines[0]["parent_id"] == lines[1]["span_id"]
+        assert lines[1]["attributes"] == {"category": "hops"}
+        traces.shutdown()
+
+    def test_otlp_json_payload(self):
+        posted: list[dict] = []
+
+        def collector(request: httpx.Request) -> httpx.Response:
+            posted.append(json.loads(request.content))
+            return httpx.Response(200)
+
+        exporter = OtlpExporter("http://collector/v1/traces")
+        exporter._http = httpx.Client(transport=httpx.MockTransport(collector))
+        span = Span("GET hops.list", "a" * 32, "b" * 16, "c" * 16, 1, 2)
+        span.set(attempt=0, ok=True, url="http://test")
+
+        exporter.export([span])
+
+        [otlp_span] = posted[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert otlp_span["parentSpanId"] == "c" * 16
+        assert otlp_span["startTimeUnixNano"] == "1"
+        assert otlp_span["attributes"] == [
+            {"key": "attempt", "value": {"intValue": "0"}},
+            {"key": "ok", "value": {"boolValue": True}},
+            {"key": "url", "value": {"stringValue": "http://test"}},
+        ]
+
+
+class TestPipelineSpans:
+    @pytest.mark.asyncio
+    async def test_category_summary_is_parent_of_its_requests(self):
+        client = mock_api_client(lambda _: httpx.Response(200, json=[hop_payload("a")]))
+        traces, exporter = tracer()
+        previous = set_tracer(traces)
+        try:
+            with span("tool inventory_summary"):
+                _ = await get_category_summary(client, HOPS)
+        finally:
+            _ = set_tracer(previous)
+            await client.aclose()
+        assert traces.flush()
+
+        by_name = {span.name: span for span in exporter.spans}
+        summary = by_name["category summary"]
+        request = by_name["GET hops.list"]
+        assert summary.parent_id == by_name["tool inventory_summary"].span_id
+        assert request.trace_id == summary.trace_id
+        assert request.attributes["status"] == "200"
+        assert summary.attributes == {"category": "hops", "items": 1}
+        traces.shutdown()
@@ -1,10 +1,9 @@
 import asyncio
-from typing import Any, Coroutine
 from unittest.mock import AsyncMock
 
 import pytest
-from brewfather_mcp.utils import get_in_batches
-from pydantic import BaseModel, RootModel
+from brewfather_mcp.utils import as_completed_bounded, gather_bounded
+from pydantic import BaseModel
 
 
 # Mock the models that would be used
@@ -14,28 +13,26 @@ class InventoryItem(BaseModel):
 
 
 @pytest.mark.asyncio
-async def test_get_in_batches_empty_list():
+async def test_gather_bounded_empty_list():
     """Test function with an empty list."""
     mock_async_fn = AsyncMock()
-    empty_list = RootModel[list[InventoryItem]](root=[])
-
-    result = await get_in_batches(10, mock_async_fn, empty_list)
+    result = await gather_bounded(10, mock_async_fn, [])
 
     assert result == []
     mock_async_fn.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_get_in_batches_single_batch():
+async def test_gather_bounded_single_batch():
     """Test function with items that fit within a single batch."""
     batch_size = 5
     items = [InventoryItem(id=f"id_{i}") for i in range(3)]
-    main_iterable = RootModel[list[InventoryItem]](root=items)
+    item_ids = [item.id for item in items]
 
     async def mock_getter(item_id: str) -> InventoryItem:
         return InventoryItem(id=item_id, name=f"Item {item_id}")
 
-    result = await get_in_batches(batch_size, mock_getter, main_iterable)
+    result = await gather_bounded(batch_size, mock_getter, item_ids)
 
     assert len(result) == 3
     assert all(isinstance(item, InventoryItem) for item in result)
@@ -44,11 +41,11 @@ async def test_get_in_batches_single_batch():
 
 
 @pytest.mark.asyncio
-async def test_get_in_batches_multiple_batches():
+async def test_gather_bounded_multiple_batches():
     """Test function with items that require multiple batches."""
     batch_size = 2
     items = [InventoryItem(id=f"id_{i}") for i in range(5)]
-    main_iterable = RootModel[list[InventoryItem]](root=items)
+    item_ids = [item.id for item in items]
 
     call_order = []
 
@@ -60,7 +57,7 @@ async def test_get_in_batches_multiple_batches():
         return InventoryItem(id=item_id, name=f"Item {item_id}")
 
     # Act
-    result = await get_in_batches(batch_size, mock_getter, main_iterable)
+    result = await gather_bounded(batch_size, mock_getter, item_ids)
 
     # Assert
     assert len(result) == 5
@@ -77,11 +74,11 @@ async def test_get_in_batches_multiple_batches():
 
 
 @pytest.mark.asyncio
-async def test_get_in_batches_exact_batch_size():
+async def test_gather_bounded_exact_batch_size():
     """Test function with items that exactly match the batch size."""
     batch_size = 3
     items = [InventoryItem(id=f"id_{i}") for i in range(6)]
-    main_iterable = RootModel[list[InventoryItem]](root=items)
+    item_ids = [item.id for item in items]
 
     processed_batches = []
     currently_processing = set()
@@ -97,7 +94,7 @@ async def test_get_in_batches_exact_batch_size():
         currently_processing.remove(item_id)
         return InventoryItem(id=item_id, name=f"Processed {item_id}")
 
-    result = await get_in_batches(batch_size, mock_getter, main_iterable)
+    result = await gather_bounded(batch_size, mock_getter, item_ids)
 
     assert len(result) == 6
     assert sorted([item.id for item in result]) == [
@@ -113,11 +110,11 @@ async def test_get_in_batches_exact_batch_size():
 
 
 @pytest.mark.asyncio
-async def test_get_in_batches_error_handling():
+async def test_gather_bounded_error_handling():
     """Test how the function handles errors in the async function."""
     batch_size = 3
     items = [InventoryItem(id=f"id_{i}") for i in range(5)]
-    main_iterable = RootModel[list[InventoryItem]](root=items)
+    item_ids = [item.id for item in items]
 
     async def mock_getter(item_id: str) -> InventoryItem:
         if item_id == "id_2":
@@ -125,11 +122,11 @@ async def test_get_in_batches_error_handling():
         return InventoryItem(id=item_id, name=f"Item {item_id}")
 
     with pytest.raises(ValueError, match="Error processing id_2"):
-        await get_in_batches(batch_size, mock_getter, main_iterable)
+        await gather_bounded(batch_size, mock_getter, item_ids)
 
 
 @pytest.mark.asyncio
-async def test_get_in_batches_preserves_order():
+async def test_gather_bounded_preserves_order():
     """Test that the function preserves the order of results based on input order."""
     batch_size = 2
     items = [
@@ -138,7 +135,7 @@ async def test_get_in_batches_preserves_order():
         InventoryItem(id="id_D"),
         InventoryItem(id="id_B"),
     ]
-    main_iterable = RootModel[list[InventoryItem]](root=items)
+    item_ids = [item.id for item in items]
 
     async def mock_getter(item_id: str) -> InventoryItem:
         # Simulate varying processing times
@@ -146,7 +143,99 @@ async def test_get_in_batches_preserves_order():
         await asyncio.sleep(delay)
         return InventoryItem(id=item_id, name=f"Item {item_id}")
 
-    result = await get_in_batches(batch_size, mock_getter, main_iterable)
+    result = await gather_bounded(batch_size, mock_getter, item_ids)
 
     # The order of results should match the order of tasks, which is based on the input order
     assert [item.id for item in result] == ["id_C", "id_A", "id_D", "id_B"]
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_never_exceeds_max_in_flight():
+    """Test that no more than max_in_flight calls run at the same time."""
+    in_flight = 0
+    peak = 0
+
+    async def mock_getter(item_id: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001 * (int(item_id) % 4))
+        in_flight -= 1
+        return item_id
+
+    item_ids = [str(i) for i in range(20)]
+    result = await gather_bounded(3, mock_getter, item_ids)
+
+    assert result == item_ids
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_slow_call_does_not_block_window():
+    """Test that a slow call doesn't hold up the calls queued behind it."""
+    finished: list[str] = []
+
+    async def mock_getter(item_id: str) -> str:
+        await asyncio.sleep(0.1 if item_id == "slow" else 0.001)
+        finished.append(item_id)
+        return item_id
+
+    item_ids = ["slow", "a", "b", "c", "d", "e"]
+    result = await gather_bounded(2, mock_getter, item_ids)
+
+    assert result == item_ids
+    # Everything else completed through the free slot while "slow" was running.
+    assert finished == ["a", "b", "c", "d", "e", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_cancels_in_flight_calls_on_error():
+    """Test that the calls still running are cancelled when one fails."""
+    cancelled: list[str] = []
+
+    async def mock_getter(item_id: str) -> str:
+        if item_id == "fail":
+            raise ValueError("Error processing fail")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(item_id)
+            raise
+        return item_id
+
+    with pytest.raises(ValueError, match="Error processing fail"):
+        await gather_bounded(3, mock_getter, ["a", "b", "fail", "c"])
+
+    assert sorted(cancelled) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_invalid_max_in_flight():
+    with pytest.raises(ValueError):
+        await gather_bounded(0, AsyncMock(), ["a"])
+
+
+@pytest.mark.asyncio
+async def test_as_completed_bounded_yields_in_completion_order():
+    """Test that the streaming variant yields results as soon as they finish."""
+    release = {item_id: asyncio.Event() for item_id in "abcd"}
+
+    async def mock_getter(item_id: str) -> str:
+        await release[item_id].wait()
+        return item_id
+
+    results: list[str] = []
+
+    async def consume() -> None:
+        async for item_id in as_completed_bounded(3, mock_getter, "abcd"):
+            results.append(item_id)
+
+    consumer = asyncio.create_task(consume())
+    for item_id in "bdca":
+        release[item_id].set()
+        # Let the scheduler pick up the finished call before releasing the next.
+        for _ in range(5):
+            await asyncio.sleep(0)
+    await consumer
+
+    assert results == ["b", "d", "c", "a"]